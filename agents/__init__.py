@@ -21,12 +21,16 @@ from .tools import (
     list_matchups_for_champion,
     get_role_analysis,
     get_objective_control_by_outcome,
+    get_session_patterns,
+    get_population_percentiles,
 )
 from .context_manager import (
     set_context,
     get_context,
-    clear_context
+    clear_context,
+    player_context,
 )
+from .response_cache import ResponseCache, get_response_cache
 
 __all__ = [
     'agents',
@@ -49,7 +53,12 @@ __all__ = [
     'list_matchups_for_champion',
     'get_role_analysis',
     'get_objective_control_by_outcome',
+    'get_session_patterns',
+    'get_population_percentiles',
     'set_context',
     'get_context',
-    'clear_context'
+    'clear_context',
+    'player_context',
+    'ResponseCache',
+    'get_response_cache',
 ]
\ No newline at end of file
@@ -0,0 +1,102 @@
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from strands.agent.conversation_manager import SummarizingConversationManager
+
+from agents.agents import initialize_chat_coach
+
+logger = logging.getLogger(__name__)
+
+# Coach agents kept in memory across all sessions; the least recently used one is dropped first
+MAX_POOLED_AGENTS = 64
+
+# Agents unused for this long are dropped even if the pool is not full
+AGENT_IDLE_SECONDS = 30 * 60
+
+# Messages kept verbatim in a coach conversation before older turns are folded into a summary
+MAX_CONVERSATION_MESSAGES = 16
+
+# Most recent messages that are never summarized
+RECENT_MESSAGES_KEPT = 8
+
+
+class RollingSummaryConversationManager(SummarizingConversationManager):
+    """Summarizes older turns as soon as the conversation grows past max_messages.
+
+    The base class only summarizes after a context-window overflow; doing it proactively
+    keeps every coach prompt bounded. If summarization fails the oldest messages are dropped.
+    """
+
+    def __init__(self, max_messages: int = MAX_CONVERSATION_MESSAGES,
+                 preserve_recent_messages: int = RECENT_MESSAGES_KEPT, **kwargs):
+        super().__init__(preserve_recent_messages=preserve_recent_messages, **kwargs)
+        self.max_messages = max_messages
+
+    def apply_management(self, agent, **kwargs):
+        if len(agent.messages) <= self.max_messages:
+            return
+        try:
+            self.reduce_context(agent)
+        except Exception as e:
+            logger.warning("Coach summarization failed, trimming history instead: %s", e)
+            self._trim(agent)
+
+    def _trim(self, agent):
+        start = len(agent.messages) - self.preserve_recent_messages
+        # Never start on a tool result whose tool call would be cut off
+        while start < len(agent.messages) and any(
+            'toolResult' in block for block in agent.messages[start].get('content', [])
+        ):
+            start += 1
+        agent.messages[:] = agent.messages[start:]
+
+
+class AgentPool:
+    """LRU pool of coach agents, one per conversation key, sharing a single model client."""
+
+    def __init__(self, factory, max_agents: int = MAX_POOLED_AGENTS, idle_seconds: float = AGENT_IDLE_SECONDS):
+        self._factory = factory
+        self.max_agents = max_agents
+        self.idle_seconds = idle_seconds
+        self._agents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Agent for this conversation, created on first use."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._agents.pop(key, None)
+            agent = entry[0] if entry else self._factory()
+            self._agents[key] = (agent, now)
+            while len(self._agents) > self.max_agents:
+                self._agents.popitem(last=False)
+            return agent
+
+    def discard(self, key):
+        """Forget a conversation (e.g. when the chat is cleared)."""
+        with self._lock:
+            self._agents.pop(key, None)
+
+    def _evict_idle(self, now: float):
+        while self._agents:
+            _, (_, last_used) = next(iter(self._agents.items()))
+            if now - last_used <= self.idle_seconds:
+                break
+            self._agents.popitem(last=False)
+
+    def __len__(self):
+        return len(self._agents)
+
+
+def _new_coach():
+    return initialize_chat_coach(conversation_manager=RollingSummaryConversationManager())
+
+
+@functools.lru_cache(maxsize=None)
+def get_coach_pool() -> AgentPool:
+    """Process-wide pool of coach agents"""
+    return AgentPool(_new_coach)
@@ -1,9 +1,10 @@
 from strands import Agent
-from strands.models import BedrockModel
+import functools
 import os
-import streamlit as st
 from dotenv import load_dotenv
 
+from agents.model_factory import create_model
+
 from agents.tools import (
     get_player_overview,
     get_detailed_stats,
@@ -22,13 +23,13 @@ from agents.tools import (
     get_role_consistency,         
     get_jungle_performance,       
     get_support_performance,      
+    get_session_patterns,
+    get_population_percentiles,
 )
 
 load_dotenv()
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-AWS_REGION = os.getenv("AWS_REGION", "us-west-2")
-BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "us.anthropic.claude-3-7-sonnet-20250219-v1:0")
 
 
 
@@ -86,6 +87,8 @@ TOOL USAGE:
   * get_role_consistency() - see player's primary and secondary roles with consistency stats
   * get_jungle_performance() - jungle-specific metrics (cs, objectives, invades) if player jungles
   * get_support_performance() - support-specific metrics (vision, healing/shielding) if player supports 
+  * get_session_patterns() - play-session habits (win rate by game number in a session, performance after losses, tilt risk)
+  * get_population_percentiles() - percentile rank vs other players in the same role from the fetched games (use instead of generic benchmarks when available)
 
 When answering questions:
 1. Reference specific stats from player
@@ -132,33 +135,37 @@ COACHING APPROACH:
 """
 
 
-@st.cache_resource
+@functools.lru_cache(maxsize=None)
 def initialize_agent():
-    """Initialize the Strands agent with BedrockModel for analysis only"""
-    bedrock_model = BedrockModel(
-        model_id=BEDROCK_MODEL_ID,
+    """Initialize the Strands agent with the configured model for analysis only"""
+    bedrock_model = create_model(
         temperature=0.7,
         max_tokens=2000,
     )
     
     agent = Agent(
+        name="analyst",
         model=bedrock_model,
         system_prompt=SYSTEM_PROMPT,
     )
     
     return agent
 
-def initialize_chat_coach():
-    """Initialize a separate agent for the interactive coaching chat"""
-    bedrock_model = BedrockModel(
-        model_id=BEDROCK_MODEL_ID,
+@functools.lru_cache(maxsize=None)
+def get_chat_coach_model():
+    """One Bedrock model (and boto client) shared by every coach agent in the process"""
+    return create_model(
         temperature=0.8,  # Slightly higher for more personality
         max_tokens=1500,
     )
-    
+
+def initialize_chat_coach(conversation_manager=None):
+    """Initialize a separate agent for the interactive coaching chat"""
     coach = Agent(
-        model=bedrock_model,
+        name="coach",
+        model=get_chat_coach_model(),
         system_prompt=CHAT_COACH_SYSTEM_PROMPT,
+        conversation_manager=conversation_manager,
         tools=[
             get_player_overview,
             get_detailed_stats,
@@ -177,6 +184,8 @@ def initialize_chat_coach():
             get_role_consistency,         
             get_jungle_performance,       
             get_support_performance,      
+            get_session_patterns,
+            get_population_percentiles,
         ]
     )
     
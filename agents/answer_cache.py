@@ -0,0 +1,213 @@
+import difflib
+import functools
+import os
+import re
+import threading
+
+import numpy as np
+import xxhash
+from cachetools import LRUCache
+from dotenv import load_dotenv
+
+from agents.context_manager import get_context
+from agents.streaming import AgentBusyError, agent_turn_lock, replay_text, stream_agent
+from agents.telemetry import record_cache_lookup
+
+load_dotenv()
+
+# Cosine similarity a new question needs with a cached one to reuse its answer (above 1 disables the cache)
+COACH_ANSWER_CACHE_THRESHOLD = float(os.getenv("COACH_ANSWER_CACHE_THRESHOLD", 0.75))
+
+# Players (user + player data version) with cached coach answers; the least recently asked is dropped first
+ANSWER_CACHE_SCOPES = 256
+
+# Cached answers per player; the oldest is dropped first
+ANSWERS_PER_SCOPE = 64
+
+# Size of the hashed character n-gram space (collisions only ever lower precision slightly)
+NGRAM_DIMENSIONS = 2 ** 15
+NGRAM_SIZES = (3, 4, 5)
+
+_CONTRACTIONS = {
+    "what's": "what is", "how's": "how is", "where's": "where is", "who's": "who is",
+    "i'm": "i am", "don't": "do not", "doesn't": "does not", "can't": "can not",
+    "isn't": "is not", "aren't": "are not", "should've": "should have", "i've": "i have",
+}
+
+# Domain synonyms folded into one word, so e.g. "farming" and "CS" questions match
+_SYNONYMS = {
+    'farm': 'cs', 'farming': 'cs', 'cs': 'cs', 'creeps': 'cs', 'minions': 'cs', 'last-hitting': 'cs',
+    'die': 'death', 'dying': 'death', 'died': 'death', 'deaths': 'death', 'death': 'death',
+    'lose': 'loss', 'losing': 'loss', 'lost': 'loss', 'losses': 'loss', 'loss': 'loss',
+    'win': 'win', 'winning': 'win', 'won': 'win', 'wins': 'win',
+    'improve': 'improve', 'improving': 'improve', 'improvement': 'improve', 'better': 'improve',
+    'warding': 'vision', 'wards': 'vision', 'ward': 'vision', 'vision': 'vision',
+    'champs': 'champion', 'champ': 'champion', 'champions': 'champion',
+}
+
+# Filler words that don't change what is being asked
+_STOPWORDS = {'a', 'an', 'the', 'my', 'me', 'i', 'do', 'does', 'so', 'really', 'please', 'coach', 'you', 'can', 'tell'}
+
+# Question words that may differ between two phrasings of the same question; every other word
+# (stat, champion, win/loss...) has to appear in both for a cached answer to be reused
+_QUESTION_WORDS = {
+    'why', 'what', 'how', 'when', 'where', 'which', 'who', 'is', 'am', 'are', 'was', 'should', 'would',
+    'could', 'will', 'more', 'much', 'many', 'most', 'often', 'less', 'in', 'on', 'at', 'of', 'to', 'for',
+    'with', 'about', 'and', 'or', 'than', 'it', 'there', 'games', 'game', 'keep', 'always', 'overall',
+}
+
+# Spelling similarity at which two content words count as the same word (tolerates typos)
+_SAME_WORD_RATIO = 0.8
+
+# Weight of question words' n-grams relative to content words in a question vector
+_QUESTION_WORD_WEIGHT = 0.3
+
+
+def normalize_question(question: str) -> str:
+    """Lowercased question with contractions expanded, synonyms folded and filler words dropped."""
+    text = question.lower().replace("’", "'")
+    for contraction, expanded in _CONTRACTIONS.items():
+        text = text.replace(contraction, expanded)
+    words = re.findall(r"[a-z0-9@'-]+", text)
+    return ' '.join(_SYNONYMS.get(word, word) for word in words if word not in _STOPWORDS)
+
+
+def content_words(question: str) -> frozenset:
+    """Words of the normalized question that define what is asked (not question words)."""
+    return frozenset(word for word in normalize_question(question).split() if word not in _QUESTION_WORDS)
+
+
+def _same_subject(words, other_words) -> bool:
+    # Every content word of each question appears (allowing typos) in the other
+    def covered(word, candidates):
+        return word in candidates or any(
+            difflib.SequenceMatcher(None, word, other).ratio() >= _SAME_WORD_RATIO for other in candidates
+        )
+    return all(covered(w, other_words) for w in words) and all(covered(w, words) for w in other_words)
+
+
+def question_vector(question: str) -> np.ndarray:
+    """L2-normalized hashed character n-gram counts of the normalized question (words padded with spaces).
+
+    Question words are down-weighted, so "why am I ..." and "why do I ..." phrasings of the
+    same question stay close.
+    """
+    vector = np.zeros(NGRAM_DIMENSIONS, dtype=np.float32)
+    for word in normalize_question(question).split():
+        weight = _QUESTION_WORD_WEIGHT if word in _QUESTION_WORDS else 1.0
+        padded = f" {word} "
+        for n in NGRAM_SIZES:
+            for i in range(max(1, len(padded) - n + 1)):
+                vector[xxhash.xxh32_intdigest(padded[i:i + n]) % NGRAM_DIMENSIONS] += weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class AnswerCache:
+    """In-memory semantic cache of coach answers, scoped per user and player data version.
+
+    A question is answered from the cache when its character n-gram vector is close enough
+    (cosine similarity) to a question already answered for the same scope and both ask about
+    the same things (same content words), so "die more in wins" never gets the "in losses" answer.
+    """
+
+    def __init__(self, threshold: float = COACH_ANSWER_CACHE_THRESHOLD,
+                 max_scopes: int = ANSWER_CACHE_SCOPES, per_scope: int = ANSWERS_PER_SCOPE):
+        self.threshold = threshold
+        self.per_scope = per_scope
+        self._scopes = LRUCache(maxsize=max_scopes)
+        self._lock = threading.Lock()
+
+    def lookup(self, scope, question: str):
+        """(answer, similarity) of the closest cached question in scope, or None below the threshold."""
+        if self.threshold > 1:
+            return None
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None:
+                return None
+            matrix, answers, subjects = entry['matrix'], entry['answers'], entry['subjects']
+        similarities = matrix @ question_vector(question)
+        words = content_words(question)
+        for i in np.argsort(similarities)[::-1]:
+            if similarities[i] < self.threshold:
+                break
+            if _same_subject(words, subjects[i]):
+                return answers[i], float(similarities[i])
+        return None
+
+    def store(self, scope, question: str, answer: str):
+        vector = question_vector(question)
+        with self._lock:
+            entry = self._scopes.get(scope) or {
+                'matrix': np.empty((0, NGRAM_DIMENSIONS), np.float32), 'answers': [], 'subjects': [],
+            }
+            # Entries are replaced rather than modified in place, so lookups never see a half-written one
+            self._scopes[scope] = {
+                'matrix': np.vstack([entry['matrix'], vector])[-self.per_scope:],
+                'answers': (entry['answers'] + [answer])[-self.per_scope:],
+                'subjects': (entry['subjects'] + [content_words(question)])[-self.per_scope:],
+            }
+
+    def clear(self):
+        with self._lock:
+            self._scopes.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def get_answer_cache() -> AnswerCache:
+    """Process-wide coach answer cache (shared by all sessions, scoped per user)."""
+    return AnswerCache()
+
+
+def coach_answer_scope(user_id: str):
+    """Cache scope for the player being viewed (user id + bound player data version), None if untracked."""
+    version = get_context()['version']
+    if version is None:
+        return None
+    return user_id, version
+
+
+def remember_turn(agent, prompt: str, answer: str):
+    """Add a question answered outside the agent to its conversation, so follow-ups have the context."""
+    lock = agent_turn_lock(agent)
+    if not lock.acquire(blocking=False):
+        raise AgentBusyError("The agent is still answering an earlier message")
+    try:
+        agent.messages.append({'role': 'user', 'content': [{'text': prompt}]})
+        agent.messages.append({'role': 'assistant', 'content': [{'text': answer}]})
+    finally:
+        lock.release()
+
+
+def cached_coach_stream(agent, prompt: str, scope, store: bool = True):
+    """
+    Coach event stream that replays the cached answer of a similar earlier question in scope,
+    or streams the agent's answer and caches it once complete.
+
+    Args:
+        agent: The session's coach agent
+        prompt: The player's question
+        scope: Cache scope (see coach_answer_scope); None skips the cache
+        store: Whether the new answer may be cached; only pass True for questions that stand on
+               their own (e.g. the first of a conversation), not follow-ups that depend on history
+
+    Raises AgentBusyError while the agent is still answering an earlier question; one turn runs
+    at a time, so the conversation's tool calls and results never interleave.
+    """
+    if scope is None:
+        yield from stream_agent(agent, prompt, exclusive=True)
+        return
+
+    cache = get_answer_cache()
+    match = cache.lookup(scope, prompt)
+    record_cache_lookup('answer', match is not None)
+    if match is not None:
+        remember_turn(agent, prompt, match[0])
+        yield from replay_text(match[0])
+        return
+
+    for event in stream_agent(agent, prompt, exclusive=True):
+        if event['type'] == 'done' and store and event['text']:
+            cache.store(scope, prompt, event['text'])
+        yield event
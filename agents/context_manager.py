@@ -1,27 +1,72 @@
-_player_context = {
+import itertools
+import threading
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_EMPTY_CONTEXT = {
     'rich_context': None,
     'champ_insights': None,
-    'is_loaded': False
+    'is_loaded': False,
+    'version': None
 }
 
-def set_context(rich_context, champ_insights):
-    #Store player data for tools to access
-    global _player_context
-    _player_context = {
+# (id(rich_context), id(champ_insights)) -> version; an entry is dropped when either object is freed
+_context_versions = {}
+_version_counter = itertools.count(1)
+_versions_lock = threading.Lock()
+
+# Player data for the tools of the current session / invocation. A ContextVar instead of a
+# module global: every Streamlit script thread and every agent run sees only its own value,
+# and agent runs started through agents.streaming inherit the caller's value.
+_player_context = ContextVar('player_context', default=_EMPTY_CONTEXT)
+
+def context_version(rich_context, champ_insights):
+    #Version of this player data: the same objects always get the same version (across reruns,
+    #sessions and agent turns), so results derived from them can be memoized per version.
+    #None when the data can't be tracked (e.g. a plain dict), which disables memoization.
+    if rich_context is None:
+        return None
+    key = (id(rich_context), id(champ_insights))
+    with _versions_lock:
+        version = _context_versions.get(key)
+        if version is None:
+            try:
+                # Forget the version once the data is gone, so a reused id never gets a stale one
+                for obj in (rich_context, champ_insights):
+                    if obj is not None:
+                        weakref.finalize(obj, _context_versions.pop, key, None)
+            except TypeError:
+                return None
+            version = next(_version_counter)
+            _context_versions[key] = version
+    return version
+
+def _loaded_context(rich_context, champ_insights):
+    return {
         'rich_context': rich_context,
         'champ_insights': champ_insights,
-        'is_loaded': True
+        'is_loaded': True,
+        'version': context_version(rich_context, champ_insights)
     }
 
+def set_context(rich_context, champ_insights):
+    #Store player data for tools to access (scoped to the current context)
+    _player_context.set(_loaded_context(rich_context, champ_insights))
+
 def get_context():
     #Retrieve stored player data
-    return _player_context
+    return _player_context.get()
 
 def clear_context():
     #clear set context
-    global _player_context
-    _player_context = {
-        'rich_context': None,
-        'champ_insights': None,
-        'is_loaded': False
-    }
\ No newline at end of file
+    _player_context.set(_EMPTY_CONTEXT)
+
+@contextmanager
+def player_context(rich_context, champ_insights):
+    #Bind player data only for the duration of a block, e.g. one agent invocation
+    token = _player_context.set(_loaded_context(rich_context, champ_insights))
+    try:
+        yield
+    finally:
+        _player_context.reset(token)
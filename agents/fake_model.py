@@ -0,0 +1,133 @@
+import asyncio
+import itertools
+import json
+import os
+import time
+
+from strands.models import Model
+
+from data.prompt_format import CHARS_PER_TOKEN, estimate_tokens
+
+# Delay before the first token of each model call (roughly Bedrock's time to first byte)
+FAKE_MODEL_LATENCY_MS = float(os.getenv("FAKE_MODEL_LATENCY_MS", 400))
+
+# Output speed once the answer starts streaming
+FAKE_MODEL_TOKENS_PER_SECOND = float(os.getenv("FAKE_MODEL_TOKENS_PER_SECOND", 60))
+
+# Tokens sent per streamed chunk (Bedrock sends a few tokens per delta as well)
+FAKE_MODEL_TOKENS_PER_CHUNK = 8
+
+# Final answer when the script doesn't give one
+FAKE_MODEL_RESPONSE = os.getenv(
+    "FAKE_MODEL_RESPONSE",
+    "This is an offline answer from the fake model. Your stats look consistent, so keep focusing on "
+    "your strongest champions and cut down on early deaths to turn more close games into wins.",
+)
+
+_tool_use_ids = itertools.count(1)
+
+
+def load_fake_script(value: str = None):
+    """Script from FAKE_MODEL_SCRIPT: inline JSON or the path of a JSON file (None when unset)."""
+    value = value if value is not None else os.getenv("FAKE_MODEL_SCRIPT")
+    if not value:
+        return None
+    if os.path.isfile(value):
+        with open(value, encoding='utf-8') as f:
+            return json.load(f)
+    return json.loads(value)
+
+
+class FakeModel(Model):
+    """Offline strands model that plays back a script instead of calling Bedrock.
+
+    The script is a list of steps, one per model call in a turn (a turn starts at the user's
+    latest text message):
+        {"tools": [{"name": "get_player_overview", "input": {}}, ...]}  - request these tool calls
+        {"text": "..."}                                                  - answer and end the turn
+    Tool calls the agent doesn't have are skipped; once the script runs out the model answers
+    with its default response. Latency and token rate are simulated with asyncio.sleep, and
+    usage metadata is estimated from the request size so agent metrics stay meaningful.
+    """
+
+    def __init__(self, script=None, latency_ms: float = FAKE_MODEL_LATENCY_MS,
+                 tokens_per_second: float = FAKE_MODEL_TOKENS_PER_SECOND,
+                 response: str = FAKE_MODEL_RESPONSE, **model_config):
+        self.config = {
+            'model_id': 'fake',
+            'script': script if script is not None else load_fake_script(),
+            'latency_ms': latency_ms,
+            'tokens_per_second': tokens_per_second,
+            'response': response,
+            **model_config,
+        }
+
+    def update_config(self, **model_config):
+        self.config.update(model_config)
+
+    def get_config(self):
+        return self.config
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError("FakeModel does not support structured output")
+        yield  # pragma: no cover - makes this an async generator like the real models
+
+    def _current_step(self, messages) -> dict:
+        # Model calls since the user's last text message (tool results are user messages too)
+        step = 0
+        for message in reversed(messages):
+            if message['role'] == 'user' and any('text' in block for block in message['content']):
+                break
+            if message['role'] == 'assistant':
+                step += 1
+        script = self.config['script'] or []
+        return script[step] if step < len(script) else {'text': self.config['response']}
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, *, tool_choice=None, **kwargs):
+        started = time.perf_counter()
+        request = (system_prompt or '') + json.dumps(messages, default=str)
+        if tool_specs:
+            request += json.dumps(tool_specs, default=str)
+
+        step = self._current_step(messages)
+        available = {spec['name'] for spec in tool_specs or []}
+        tool_calls = [call for call in step.get('tools', []) if call['name'] in available]
+
+        await asyncio.sleep(self.config['latency_ms'] / 1000)
+        yield {'messageStart': {'role': 'assistant'}}
+
+        output = ''
+        if tool_calls:
+            for call in tool_calls:
+                tool_input = json.dumps(call.get('input', {}))
+                output += tool_input
+                yield {'contentBlockStart': {'start': {'toolUse': {
+                    'toolUseId': f"fake-tool-{next(_tool_use_ids)}",
+                    'name': call['name'],
+                }}}}
+                yield {'contentBlockDelta': {'delta': {'toolUse': {'input': tool_input}}}}
+                yield {'contentBlockStop': {}}
+            stop_reason = 'tool_use'
+        else:
+            output = step.get('text', self.config['response'])
+            chunk_chars = FAKE_MODEL_TOKENS_PER_CHUNK * CHARS_PER_TOKEN
+            chunk_delay = FAKE_MODEL_TOKENS_PER_CHUNK / self.config['tokens_per_second']
+            yield {'contentBlockStart': {'start': {}}}
+            for i in range(0, len(output), chunk_chars):
+                await asyncio.sleep(chunk_delay)
+                yield {'contentBlockDelta': {'delta': {'text': output[i:i + chunk_chars]}}}
+            yield {'contentBlockStop': {}}
+            stop_reason = 'end_turn'
+
+        yield {'messageStop': {'stopReason': stop_reason}}
+
+        input_tokens = estimate_tokens(request)
+        output_tokens = estimate_tokens(output)
+        yield {'metadata': {
+            'usage': {
+                'inputTokens': input_tokens,
+                'outputTokens': output_tokens,
+                'totalTokens': input_tokens + output_tokens,
+            },
+            'metrics': {'latencyMs': int((time.perf_counter() - started) * 1000)},
+        }}
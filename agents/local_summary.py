@@ -0,0 +1,252 @@
+import inspect
+import os
+
+from dotenv import load_dotenv
+
+from agents.summary_tools import (
+    get_champion_insights_summary,
+    get_advanced_stats_summary,
+    get_early_late_game_summary,
+    get_matchup_analysis_summary,
+    get_performance_trends_summary,
+)
+from agents.playstyle_tools import (
+    get_playstyle_fingerprint,
+    get_behavioral_patterns,
+    get_role_playstyle,
+)
+
+load_dotenv()
+
+# Seconds an AI panel waits for the model before settling on the local answer it already shows
+AI_LATENCY_BUDGET_SECONDS = float(os.getenv("AI_LATENCY_BUDGET_SECONDS", 15))
+
+ROLE_NAMES = {
+    'TOP': 'top',
+    'JUNGLE': 'jungle',
+    'MIDDLE': 'mid',
+    'BOTTOM': 'bot lane',
+    'UTILITY': 'support',
+}
+
+
+def tool_payload(tool) -> dict:
+    """A tool's raw dict payload (the same data the model gets, before compact serialization)."""
+    return inspect.unwrap(tool)()
+
+
+def _champion_insights(page_metrics):
+    data = tool_payload(get_champion_insights_summary)
+    if 'error' in data:
+        return None
+    best = data['best_performer']
+    tiers = data['tier_distribution']
+    weak_picks = [c['Champion'] for c in data['champions_by_tier'].get('D-Tier', [])]
+    text = (
+        f"You've played {data['total_champions']} champions across {data['total_games']} games "
+        f"(diversity ratio {data['diversity_ratio']:.2f}, a {data['diversity_assessment']} pool), and your top 3 "
+        f"champions make up {data['top_3_games_percentage']:.0f}% of your games. "
+        f"{best['champion']} is your best performer with a {best['win_rate']:.0f}% win rate and "
+        f"{best['kda']:.2f} KDA over {best['games']} games. "
+        f"Your pool has {tiers.get('A-Tier', 0)} A-tier, {tiers.get('B-Tier', 0)} B-tier, "
+        f"{tiers.get('C-Tier', 0)} C-tier and {tiers.get('D-Tier', 0)} D-tier picks. "
+    )
+    if weak_picks:
+        text += f"Drop your D-tier picks ({', '.join(weak_picks[:3])}) and queue up your A/B-tier champions instead."
+    elif data['diversity_assessment'] == 'high':
+        text += f"Narrow your pool to your 3-5 best champions, starting with {best['champion']}."
+    else:
+        text += f"Keep the pool focused and lean on {best['champion']} when you need a win."
+    return text
+
+
+def _advanced_stats(page_metrics):
+    data = tool_payload(get_advanced_stats_summary)
+    if 'error' in data:
+        return None
+    role = data['role_info']
+    metrics = page_metrics or {}
+    text = (
+        f"You play mostly {ROLE_NAMES.get(role['primary_role'], role['primary_role'])} "
+        f"({role['primary_percentage']:.0f}% of games). "
+    )
+    if metrics:
+        text += (
+            f"Your aggression score is {metrics.get('aggression_score', 0):.1f}, safety score "
+            f"{metrics.get('safety_score', 0):.1f} and objective score {metrics.get('objective_score', 0):.1f}, "
+            f"with a KDA standard deviation of {metrics.get('kda_std_dev', 0):.2f}. "
+            f"Your KDA is {metrics.get('win_loss_kda_gap', 0):.2f} higher in wins than in losses. "
+        )
+    laner = data.get('laner_metrics')
+    jungle = data.get('jungle_metrics')
+    support = data.get('support_metrics')
+    if role['primary_role'] == 'JUNGLE' and jungle:
+        text += (
+            f"As a jungler you average {jungle['avg_jungle_cs_before_10']:.0f} jungle CS before 10 minutes and "
+            f"{jungle['avg_scuttle_crabs']:.1f} scuttle crabs per game. "
+            "Tighten your first clear and contest both scuttles to build early tempo."
+        )
+    elif role['primary_role'] == 'UTILITY' and support:
+        text += (
+            f"As a support you place {support['avg_control_wards']:.1f} control wards per game at "
+            f"{support['avg_vision_score_per_min']:.2f} vision score per minute. "
+            "Buy a control ward every back to push your vision score past 2 per minute."
+        )
+    elif laner:
+        text += (
+            f"In lane you average {laner['avg_cs_at_10']:.0f} CS@10 and {laner['avg_cs_per_minute']:.1f} CS per minute "
+            f"against the 60+ CS@10 benchmark. "
+            "Focus on last-hitting under pressure to close the gap to 60 CS@10."
+        )
+    else:
+        text += "Play more games in one role to get role-specific benchmarks."
+    return text
+
+
+def _early_late(page_metrics):
+    data = tool_payload(get_early_late_game_summary)
+    if 'error' in data:
+        return None
+    if 'laner_early_game' in data:
+        early = data['laner_early_game']
+        return (
+            f"In wins you average {early['wins']['cs_at_10']:.0f} CS@10 and {early['wins']['gold_per_min']:.0f} gold/min "
+            f"at 10 minutes, versus {early['losses']['cs_at_10']:.0f} CS@10 and "
+            f"{early['losses']['gold_per_min']:.0f} gold/min in losses, a {early['cs_diff']:.1f} CS gap. "
+            "The benchmark for laners is 60+ CS@10. "
+            "Prioritize clean last hits in the first 10 minutes of your losses to keep your lane even."
+        )
+    if 'jungle_early_game' in data:
+        early = data['jungle_early_game']
+        return (
+            f"In wins you average {early['wins']['jungle_cs_10']:.0f} jungle CS@10 and "
+            f"{early['wins']['early_kills']:.1f} early takedowns, versus {early['losses']['jungle_cs_10']:.0f} "
+            f"jungle CS@10 and {early['losses']['early_kills']:.1f} early takedowns in losses. "
+            "Early tempo decides your games. "
+            "Path toward your strongest lane and secure your first clear before looking for ganks."
+        )
+    if 'support_early_game' in data:
+        early = data['support_early_game']
+        return (
+            f"In wins you place {early['wins']['wards_at_10']:.1f} wards by 10 minutes with "
+            f"{early['wins']['early_assists']:.1f} early assists, versus {early['losses']['wards_at_10']:.1f} wards "
+            f"and {early['losses']['early_assists']:.1f} early assists in losses ({early['ward_diff']:+.1f} wards). "
+            "Early vision is where your wins start. "
+            "Finish your support quest quickly and ward the enemy jungle entrances before 10 minutes."
+        )
+    return None
+
+
+def _matchup_analysis(page_metrics):
+    data = tool_payload(get_matchup_analysis_summary)
+    if 'error' in data:
+        return None
+    text = (
+        f"You have {data['total_matchups_tracked']} matchups with 2+ games, averaging a "
+        f"{data['avg_win_rate_across_all_matchups']:.0f}% win rate across them. "
+    )
+    if data['best_matchups']:
+        best = data['best_matchups'][0]
+        text += (
+            f"Your best is {best['my_champion']} vs {best['opponent']} at {best['win_rate']:.0f}% over "
+            f"{best['games']} games ({best['avg_kda']:.2f} KDA). "
+        )
+    if data['worst_matchups']:
+        worst = data['worst_matchups'][-1]
+        text += (
+            f"Your worst is {worst['my_champion']} vs {worst['opponent']} at {worst['win_rate']:.0f}% over "
+            f"{worst['games']} games ({worst['avg_cs_diff_at_10']:+.1f} CS diff@10). "
+            f"Consider banning {worst['opponent']} or picking a different champion into it."
+        )
+    else:
+        text += "None of your matchups fall below a 40% win rate, so keep drafting the way you are."
+    return text
+
+
+def _performance_trends(page_metrics):
+    data = tool_payload(get_performance_trends_summary)
+    if 'error' in data:
+        return None
+    overall = data['overall_performance']
+    kda = data['kda_breakdown']
+    comparison = data['win_vs_loss_comparison']
+    trends = data.get('rolling_trends') or {}
+    text = (
+        f"You're at a {overall['win_rate']:.0f}% win rate over {overall['total_games']} games with an average "
+        f"{kda['avg_kills']:.1f}/{kda['avg_deaths']:.1f}/{kda['avg_assists']:.1f} K/D/A. "
+        f"You average {comparison['cs_difference']:+.0f} CS and {comparison['damage_difference']:+,.0f} damage "
+        "in wins compared to losses. "
+    )
+    if trends.get('has_trend_data'):
+        text += (
+            f"Your 10-game win rate is {trends['rolling_win_rate']['current']:.0f}% "
+            f"({trends['rolling_win_rate']['change']:+.0f} points), and your form is {trends['direction']}. "
+        )
+    if data['top_performing_champions']:
+        top = data['top_performing_champions'][:2]
+        text += "Your top champions are " + " and ".join(
+            f"{c['champion']} ({c['win_rate']:.0f}% over {c['games']} games)" for c in top
+        ) + ". "
+    if page_metrics and page_metrics.get('death_gap', 0) > 1:
+        text += f"You die {page_metrics['death_gap']:.1f} more times in losses, so play safer when behind."
+    else:
+        text += "Keep your CS up in losses, since it's your biggest gap between wins and losses."
+    return text
+
+
+PAGE_TEMPLATES = {
+    'champion_insights': _champion_insights,
+    'advanced_stats': _advanced_stats,
+    'early_late': _early_late,
+    'matchup_analysis': _matchup_analysis,
+    'performance_trends': _performance_trends,
+}
+
+
+def local_page_summary(page_name: str, page_metrics: dict = None) -> str:
+    """Template summary of a page built from its tool payloads (no model call, a few ms)."""
+    template = PAGE_TEMPLATES.get(page_name)
+    try:
+        text = template(page_metrics) if template else None
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        text = None
+    return text or "Not enough data on this page for a summary yet."
+
+
+def local_playstyle() -> tuple:
+    """Rule-based (style_label, description) from the playstyle tool payloads."""
+    try:
+        fingerprint = tool_payload(get_playstyle_fingerprint)
+        patterns = tool_payload(get_behavioral_patterns)
+        role = tool_payload(get_role_playstyle)
+    except (AttributeError, KeyError, TypeError, ValueError, ZeroDivisionError):
+        return '⚖️ Balanced Player', "Not enough data yet to describe your playstyle."
+    if 'error' in fingerprint:
+        return '⚖️ Balanced Player', "Not enough data yet to describe your playstyle."
+
+    aggression = fingerprint['aggression_profile']
+    consistency = fingerprint['consistency_profile']
+    win_conditions = fingerprint['win_conditions']
+    if aggression['style'] == 'aggressive' and consistency['style'] != 'volatile':
+        style = '🔥 Aggressive Carry'
+    elif aggression['style'] == 'aggressive':
+        style = '🎲 High-Risk Playmaker'
+    elif aggression['style'] == 'passive' and aggression['kill_participation'] >= 50:
+        style = '🤝 Team Enabler'
+    elif consistency['style'] == 'consistent':
+        style = '🎯 Steady Performer'
+    else:
+        style = '⚖️ Balanced Player'
+
+    role_name = ROLE_NAMES.get(role.get('primary_role'), 'flex')
+    article = 'an' if aggression['style'][0] in 'aeiou' else 'a'
+    description = (
+        f"You play {article} {aggression['style']} {role_name} game, averaging "
+        f"{aggression['avg_kills']:.1f}/{aggression['avg_deaths']:.1f}/{aggression['avg_assists']:.1f} with "
+        f"{aggression['kill_participation']:.0f}% kill participation. "
+        f"Your performance is {consistency['style']} from game to game, and you tend to win through "
+        f"{win_conditions['wins_through'].replace('_', ' ')} while losses come down to "
+        f"{win_conditions['loses_through'].replace('_', ' ')}. "
+        f"The biggest difference between your wins and losses is {patterns.get('biggest_difference', 'deaths')}."
+    )
+    return style, description
@@ -0,0 +1,141 @@
+import asyncio
+import functools
+import os
+import threading
+import time
+
+import boto3
+from botocore.config import Config
+from dotenv import load_dotenv
+from strands.models import BedrockModel
+from strands.types.exceptions import ModelThrottledException
+
+from agents.fake_model import FakeModel
+from agents.telemetry import record_queue_wait
+
+load_dotenv()
+
+AWS_REGION = os.getenv("AWS_REGION", "us-west-2")
+BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "us.anthropic.claude-3-7-sonnet-20250219-v1:0")
+
+# "bedrock" (default) or "fake" for the offline FakeModel (no AWS credentials needed)
+AGENT_MODEL_BACKEND = os.getenv("AGENT_MODEL_BACKEND", "bedrock").lower()
+
+# Model identity used in response cache keys, so offline answers never mix with Bedrock ones
+AGENT_MODEL_ID = BEDROCK_MODEL_ID if AGENT_MODEL_BACKEND == "bedrock" else f"{AGENT_MODEL_BACKEND}:{BEDROCK_MODEL_ID}"
+
+# HTTP connections the shared Bedrock client keeps open (botocore's default of 10 runs out under concurrent sessions)
+BEDROCK_MAX_POOL_CONNECTIONS = int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", 50))
+
+BEDROCK_CONNECT_TIMEOUT_SECONDS = float(os.getenv("BEDROCK_CONNECT_TIMEOUT_SECONDS", 5))
+
+# Time allowed between streamed chunks before a call is treated as failed
+BEDROCK_READ_TIMEOUT_SECONDS = float(os.getenv("BEDROCK_READ_TIMEOUT_SECONDS", 120))
+
+# Retries per call after the first attempt (botocore's adaptive mode also rate-limits the client itself when Bedrock throttles)
+BEDROCK_MAX_ATTEMPTS = int(os.getenv("BEDROCK_MAX_ATTEMPTS", 4))
+
+# Model calls in flight at once across all sessions; further calls wait for a free slot
+BEDROCK_MAX_CONCURRENCY = int(os.getenv("BEDROCK_MAX_CONCURRENCY", 8))
+
+# A call waiting longer than this for a slot is reported as throttled (strands then backs off and retries)
+BEDROCK_QUEUE_TIMEOUT_SECONDS = float(os.getenv("BEDROCK_QUEUE_TIMEOUT_SECONDS", 30))
+
+_model_call_slots = threading.BoundedSemaphore(BEDROCK_MAX_CONCURRENCY)
+
+
+@functools.lru_cache(maxsize=None)
+def get_boto_session() -> boto3.Session:
+    """Process-wide boto3 session, so credentials and service models are resolved once."""
+    return boto3.Session(region_name=AWS_REGION)
+
+
+@functools.lru_cache(maxsize=None)
+def get_bedrock_client():
+    """Process-wide bedrock-runtime client (boto3 clients are thread-safe; one pool for every agent)."""
+    config = Config(
+        max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS,
+        connect_timeout=BEDROCK_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=BEDROCK_READ_TIMEOUT_SECONDS,
+        retries={'mode': 'adaptive', 'max_attempts': BEDROCK_MAX_ATTEMPTS},
+        user_agent_extra="strands-agents",
+    )
+    return get_boto_session().client("bedrock-runtime", config=config)
+
+
+class _SlotRequest:
+    """One wait for a model call slot on a worker thread, which the awaiting task may abandon.
+
+    Cancelling the awaiting task doesn't stop the worker thread, so a slot it still acquires
+    (or has acquired but not yet handed over) is released instead of leaking.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._acquired = False
+        self._abandoned = False
+
+    def acquire(self, timeout: float) -> bool:
+        acquired = _model_call_slots.acquire(timeout=timeout)
+        with self._lock:
+            if acquired and self._abandoned:
+                _model_call_slots.release()
+                return False
+            self._acquired = acquired
+            return acquired
+
+    def abandon(self):
+        with self._lock:
+            self._abandoned = True
+            if self._acquired:
+                self._acquired = False
+                _model_call_slots.release()
+
+
+class ConcurrencyLimitedModel:
+    """Mixin that holds one of the process-wide model call slots while a response streams."""
+
+    async def stream(self, *args, **kwargs):
+        queued_at = time.perf_counter()
+        request = _SlotRequest()
+        try:
+            acquired = await asyncio.to_thread(request.acquire, BEDROCK_QUEUE_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            # e.g. a race_with_fallback deadline or a disconnected API client
+            request.abandon()
+            raise
+        record_queue_wait((time.perf_counter() - queued_at) * 1000)
+        if not acquired:
+            raise ModelThrottledException("Too many model calls in flight")
+        try:
+            async for event in super().stream(*args, **kwargs):
+                yield event
+        finally:
+            _model_call_slots.release()
+
+
+class SharedBedrockModel(ConcurrencyLimitedModel, BedrockModel):
+    """BedrockModel that uses the shared, tuned client instead of keeping its own connection pool."""
+
+    def __init__(self, **model_config):
+        # The client BedrockModel builds from the shared session is cheap and replaced right away
+        super().__init__(boto_session=get_boto_session(), **model_config)
+        self.client = get_bedrock_client()
+
+
+class LimitedFakeModel(ConcurrencyLimitedModel, FakeModel):
+    """FakeModel behind the same concurrency limit, so offline benchmarks queue like Bedrock calls."""
+
+
+def create_model(temperature: float, max_tokens: int, backend: str = None):
+    """Model for an agent on the configured backend (AGENT_MODEL_BACKEND unless overridden)."""
+    backend = (backend or AGENT_MODEL_BACKEND).lower()
+    if backend == "fake":
+        return LimitedFakeModel(temperature=temperature, max_tokens=max_tokens)
+    if backend != "bedrock":
+        raise ValueError(f"Unknown AGENT_MODEL_BACKEND: {backend!r} (expected 'bedrock' or 'fake')")
+    return SharedBedrockModel(
+        model_id=BEDROCK_MODEL_ID,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
@@ -1,24 +1,31 @@
 from strands import Agent
-from strands.models import BedrockModel
-import os
-import streamlit as st
+import functools
 from dotenv import load_dotenv
 
+from agents.model_factory import AGENT_MODEL_ID, create_model
+
 from agents.playstyle_tools import (
     get_playstyle_fingerprint,
     get_behavioral_patterns,
     get_role_playstyle,
 )
+from agents.response_cache import cached_stream, fingerprint
+from agents.streaming import stream_agent, collect_stream, race_with_fallback
+from agents.local_summary import AI_LATENCY_BUDGET_SECONDS, local_playstyle
+from agents.tool_payloads import prefetch_tool_data
 
 load_dotenv()
 
-AWS_REGION = os.getenv("AWS_REGION", "us-west-2")
-BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "us.anthropic.claude-3-7-sonnet-20250219-v1:0")
+PLAYSTYLE_TOOLS = [
+    get_playstyle_fingerprint,
+    get_behavioral_patterns,
+    get_role_playstyle,
+]
 
 PLAYSTYLE_SYSTEM_PROMPT = """You are a League of Legends behavioral analyst who describes HOW players play, not just WHAT their stats are.
 
 Your job is to:
-1. Call the tools to get the player's complete behavioral fingerprint
+1. Read the player's complete behavioral fingerprint provided with the request
 2. Synthesize this into a 4-5 sentence narrative that captures their UNIQUE playstyle
 3. Focus on patterns, tendencies, and decision-making style - not raw numbers
 4. Generate an appropriate playstyle label with emoji
@@ -93,52 +100,73 @@ DO NOT:
 """
 
 
-@st.cache_resource
-def initialize_playstyle_agent():
-    """Initialize the playstyle analysis agent"""
-    bedrock_model = BedrockModel(
-        model_id=BEDROCK_MODEL_ID,
+@functools.lru_cache(maxsize=None)
+def get_playstyle_model():
+    """Bedrock model (and boto client) shared by all playstyle agents in the process"""
+    return create_model(
         temperature=0.7,  # Balance between creativity and consistency
         max_tokens=800,   # Enough for detailed but concise analysis
     )
-    
+
+def initialize_playstyle_agent():
+    """Initialize the playstyle analysis agent (no tools: player data is injected into the prompt).
+    A fresh, stateless agent per call so concurrent sessions never share conversation state."""
     agent = Agent(
-        model=bedrock_model,
+        name="playstyle",
+        model=get_playstyle_model(),
         system_prompt=PLAYSTYLE_SYSTEM_PROMPT,
-        tools=[
-            get_playstyle_fingerprint,
-            get_behavioral_patterns,
-            get_role_playstyle,
-        ]
     )
     
     return agent
 
-def generate_playstyle_description() -> tuple:
+def generate_playstyle_description(on_event=None, latency_budget: float = AI_LATENCY_BUDGET_SECONDS) -> tuple:
     """
     Generate a dynamic, insightful playstyle description.
     
+    Args:
+        on_event: Optional callback receiving each streamed event (e.g. to show progress)
+        latency_budget: Seconds to wait for the model before using the rule-based
+                        playstyle from agents.local_summary (None: no limit)
+    
     Returns:
         tuple: (style_label, description) - e.g., ("🔥 Aggressive Carry", "You're an aggressive...")
     """
     prompt = """Analyze this player's complete behavioral fingerprint and describe their playstyle.
 
-Use get_playstyle_fingerprint() to understand their overall patterns, get_behavioral_patterns() to see win/loss tendencies, 
+Use get_playstyle_fingerprint() below to understand their overall patterns, get_behavioral_patterns() to see win/loss tendencies, 
 and get_role_playstyle() to understand their role context.
 
 Return ONLY a JSON object with "style" (emoji + label) and "description" (narrative).
 No preamble, no explanation - just the JSON."""
     
     try:
-        agent = initialize_playstyle_agent()
-        response = agent(prompt)
+        # Tool data is computed locally and sent with the request, so the model answers in one call
+        player_data = prefetch_tool_data(PLAYSTYLE_TOOLS)
+        prompt += f"\n\nPlayer data:\n{player_data}"
+        # Cached per model + prompt + fingerprint of the tool data, so unchanged players cost no Bedrock call
+        context_fingerprint = fingerprint(player_data)
+        events = cached_stream(
+            AGENT_MODEL_ID,
+            PLAYSTYLE_SYSTEM_PROMPT,
+            prompt,
+            context_fingerprint,
+            lambda: stream_agent(initialize_playstyle_agent(), prompt),
+        )
         
-        # Parse JSON response
         import json
         import re
         
+        if latency_budget is not None:
+            # Settle on the rule-based playstyle if the model is slow (same JSON shape as its answer)
+            style, description = local_playstyle()
+            events = race_with_fallback(
+                events, json.dumps({'style': style, 'description': description}), latency_budget
+            )
+        response_text = collect_stream(events, on_event)
+        
+        # Parse JSON response
+        
         # Extract JSON from response (in case there's any wrapper text)
-        response_text = str(response)
         json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
         
         if json_match:
@@ -148,5 +176,5 @@ No preamble, no explanation - just the JSON."""
             # Fallback if no JSON found
             return '⚖️ Balanced Player', response_text
             
-    except Exception as e:
-        return '⚖️ Balanced Player', f"Unable to generate playstyle analysis: {str(e)}"
\ No newline at end of file
+    except Exception:
+        return local_playstyle()
\ No newline at end of file
@@ -1,8 +1,13 @@
 from strands import tool
 from agents.context_manager import get_context
+from agents.tool_payloads import compact_tool_result, paginated_tool_result
+from agents.tool_cache import memoize_tool
 
 
 @tool
+@memoize_tool
+@compact_tool_result
+@paginated_tool_result
 def get_playstyle_fingerprint() -> dict:
     """
     Get the player's complete behavioral fingerprint - the patterns that define how they play.
@@ -91,6 +96,9 @@ def get_playstyle_fingerprint() -> dict:
 
 
 @tool
+@memoize_tool
+@compact_tool_result
+@paginated_tool_result
 def get_behavioral_patterns() -> dict:
     """
     Get specific behavioral patterns that distinguish wins from losses.
@@ -174,6 +182,9 @@ def get_behavioral_patterns() -> dict:
 
 
 @tool
+@memoize_tool
+@compact_tool_result
+@paginated_tool_result
 def get_role_playstyle() -> dict:
     """
     Get role-specific playstyle patterns. Different roles have different win conditions and patterns.
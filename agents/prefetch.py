@@ -0,0 +1,79 @@
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from agents.context_manager import player_context
+from agents.local_summary import AI_LATENCY_BUDGET_SECONDS
+from agents.playstyle_agent import generate_playstyle_description
+from agents.summary_agent import generate_page_summary
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Generate every page summary and the playstyle in the background as soon as the data loads
+AI_PREFETCH_ENABLED = os.getenv("AI_PREFETCH_ENABLED", "false").lower() == "true"
+
+# Prefetch jobs run at once across all sessions; model calls are further capped by BEDROCK_MAX_CONCURRENCY,
+# so interactive requests still get slots while prefetch is busy
+AI_PREFETCH_WORKERS = int(os.getenv("AI_PREFETCH_WORKERS", 4))
+
+PLAYSTYLE_JOB = 'playstyle'
+
+
+@functools.lru_cache(maxsize=None)
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool for prefetch jobs"""
+    return ThreadPoolExecutor(max_workers=AI_PREFETCH_WORKERS, thread_name_prefix='ai-prefetch')
+
+
+def _run_with_context(rich_context, champ_insights, generate, *args):
+    # Worker threads don't inherit the session's context, so bind the player data explicitly
+    with player_context(rich_context, champ_insights):
+        return generate(*args)
+
+
+def submit_ai_prefetch(rich_context, champ_insights, page_metrics_by_page: dict) -> dict:
+    """
+    Start the playstyle and every page summary concurrently.
+
+    Each job goes through the response cache, so a summary button clicked after its job
+    finished replays the answer instantly. Jobs wait for the model without a latency budget,
+    since nobody is looking at them yet.
+
+    Args:
+        rich_context: Filtered player context the tools read
+        champ_insights: Champion insights for the same filter
+        page_metrics_by_page: page_name -> page metrics (or None) for every summary to prefetch;
+                              must match what the page passes to its summary button
+
+    Returns:
+        dict: job name ('playstyle' or a page_name) -> Future
+    """
+    executor = get_prefetch_executor()
+    jobs = {PLAYSTYLE_JOB: submit_playstyle_job(rich_context, champ_insights)}
+    for page_name, page_metrics in page_metrics_by_page.items():
+        jobs[page_name] = executor.submit(
+            _run_with_context, rich_context, champ_insights,
+            functools.partial(generate_page_summary, latency_budget=None), page_name, page_metrics,
+        )
+    return jobs
+
+
+def submit_playstyle_job(rich_context, champ_insights):
+    """Generate the playstyle on the prefetch pool (waits for the model without a latency budget)"""
+    return get_prefetch_executor().submit(
+        _run_with_context, rich_context, champ_insights,
+        functools.partial(generate_playstyle_description, latency_budget=None),
+    )
+
+
+def wait_for_prefetch(job, fallback, timeout: float = AI_LATENCY_BUDGET_SECONDS):
+    """A prefetch job's result, or fallback() if it isn't ready within the latency budget"""
+    try:
+        return job.result(timeout=timeout)
+    except TimeoutError:
+        return fallback()
@@ -0,0 +1,90 @@
+import functools
+import os
+
+import xxhash
+from dotenv import load_dotenv
+
+from agents.streaming import replay_text
+from agents.telemetry import record_cache_lookup
+from utils.cache_backends import CacheNamespace
+
+load_dotenv()
+
+# A cached answer is reused for this long (player data changes are caught by the context fingerprint)
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+
+
+def fingerprint(*parts) -> str:
+    """Stable hash of prompt/context pieces (same input -> same key across processes)."""
+    hasher = xxhash.xxh3_128()
+    for part in parts:
+        hasher.update(str(part).encode('utf-8'))
+        hasher.update(b'\x1f')
+    return hasher.hexdigest()
+
+
+class ResponseCache:
+    """Zstd-compressed LLM response cache with TTL, stored on the shared cache backend.
+
+    With CACHE_BACKEND=sqlite or redis every process and replica pointing at the same store
+    reuses the others' answers; eviction is the backend's (size-bounded LRU).
+    """
+
+    def __init__(self, ttl_seconds: int = RESPONSE_CACHE_TTL_SECONDS, backend=None):
+        self.ttl_seconds = ttl_seconds
+        self._namespace = CacheNamespace("llm", ttl_seconds, backend=backend, raw=True)
+
+    @staticmethod
+    def make_key(model_id: str, system_prompt: str, prompt: str, context_fingerprint: str) -> str:
+        """Cache key: model, system prompt version (its hash), prompt text and context slice hash."""
+        return fingerprint(model_id, fingerprint(system_prompt), prompt, context_fingerprint)
+
+    def get(self, key: str):
+        """Cached response text, or None on a miss / expired entry."""
+        return self._namespace.get(key)
+
+    def set(self, key: str, response: str):
+        self._namespace.set(key, response)
+
+    def clear(self):
+        self._namespace.clear()
+
+    def stats(self) -> dict:
+        return self._namespace.stats()
+
+
+@functools.lru_cache(maxsize=None)
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache (shares the process' cache backend with every session)."""
+    return ResponseCache()
+
+
+def cached_generate(model_id: str, system_prompt: str, prompt: str, context_fingerprint: str, generate) -> str:
+    """Return the cached response for this key, or call generate() and store its result."""
+    cache = get_response_cache()
+    key = cache.make_key(model_id, system_prompt, prompt, context_fingerprint)
+    response = cache.get(key)
+    record_cache_lookup('response', response is not None, span_outside_trace=True)
+    if response is None:
+        response = generate()
+        cache.set(key, response)
+    return response
+
+
+def cached_stream(model_id: str, system_prompt: str, prompt: str, context_fingerprint: str, stream):
+    """
+    Streaming variant of cached_generate: replays a cached answer, or passes through the
+    events of stream() and stores the final text once the stream completes.
+    """
+    cache = get_response_cache()
+    key = cache.make_key(model_id, system_prompt, prompt, context_fingerprint)
+    response = cache.get(key)
+    record_cache_lookup('response', response is not None, span_outside_trace=True)
+    if response is not None:
+        yield from replay_text(response)
+        return
+
+    for event in stream():
+        if event['type'] == 'done':
+            cache.set(key, event['text'])
+        yield event
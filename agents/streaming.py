@@ -0,0 +1,164 @@
+import asyncio
+import contextvars
+import queue
+import threading
+import time
+import weakref
+
+# Seconds between checks that the streaming worker is still alive
+_POLL_SECONDS = 0.1
+
+_DONE = object()
+
+_turn_locks = weakref.WeakKeyDictionary()
+_turn_locks_guard = threading.Lock()
+
+
+class AgentBusyError(RuntimeError):
+    """The agent is still running an earlier turn of the same conversation."""
+
+
+def agent_turn_lock(agent) -> threading.Lock:
+    """Lock held while one turn of this agent runs (a pooled agent outlives the script run that started it)."""
+    with _turn_locks_guard:
+        lock = _turn_locks.get(agent)
+        if lock is None:
+            lock = _turn_locks[agent] = threading.Lock()
+        return lock
+
+
+def stream_agent(agent, prompt: str, exclusive: bool = False):
+    """
+    Run agent.stream_async(prompt) on a worker thread and yield its events as they arrive.
+
+    With exclusive=True the worker holds the agent's turn lock until the turn ends (even if the
+    caller stops reading), and AgentBusyError is raised if another turn is still running.
+
+    Yields dicts:
+        {'type': 'text', 'data': str}   - next chunk of the model's answer
+        {'type': 'tool', 'name': str}   - the model started a tool call
+        {'type': 'done', 'text': str}   - final answer text (always last)
+    Exceptions raised by the agent are re-raised in the caller.
+    """
+    events = queue.Queue()
+
+    async def consume():
+        seen_tools = set()
+        async for event in agent.stream_async(prompt):
+            if 'data' in event and event['data']:
+                events.put({'type': 'text', 'data': event['data']})
+            tool_use = event.get('current_tool_use')
+            if tool_use and tool_use.get('toolUseId') not in seen_tools:
+                seen_tools.add(tool_use.get('toolUseId'))
+                events.put({'type': 'tool', 'name': tool_use.get('name', 'tool')})
+            if 'result' in event:
+                events.put({'type': 'done', 'text': str(event['result'])})
+
+    def run():
+        lock = agent_turn_lock(agent) if exclusive else None
+        if lock is not None and not lock.acquire(blocking=False):
+            events.put(AgentBusyError("The agent is still answering an earlier message"))
+            events.put(_DONE)
+            return
+        try:
+            asyncio.run(consume())
+        except Exception as e:
+            events.put(e)
+        finally:
+            if lock is not None:
+                lock.release()
+            events.put(_DONE)
+
+    # Copy the caller's context so tools see the same context variables as the UI thread
+    worker = threading.Thread(target=contextvars.copy_context().run, args=(run,), daemon=True)
+    worker.start()
+
+    text = []
+    finished = False
+    while True:
+        try:
+            event = events.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            if not worker.is_alive() and events.empty():
+                break
+            continue
+        if event is _DONE:
+            break
+        if isinstance(event, Exception):
+            raise event
+        if event['type'] == 'text':
+            text.append(event['data'])
+        elif event['type'] == 'done':
+            # The result string can differ from the streamed chunks (e.g. text before tool calls)
+            event = {'type': 'done', 'text': event['text'] or ''.join(text)}
+            finished = True
+        yield event
+
+    if not finished:
+        yield {'type': 'done', 'text': ''.join(text)}
+
+
+def race_with_fallback(events, fallback_text: str, budget_seconds: float):
+    """
+    Show an instant fallback answer, then pass a slower event stream through while it keeps
+    within budget_seconds; if it fails or hasn't finished by then, settle on the fallback.
+
+    Yields {'type': 'fallback', 'text': str} first, then the stream's events. The final 'done'
+    event carries 'fallback': True when the fallback answer was used. The stream keeps running
+    on its worker thread after the deadline, so e.g. the response cache still stores the answer.
+    """
+    deadline = time.monotonic() + budget_seconds
+    yield {'type': 'fallback', 'text': fallback_text}
+
+    pending = queue.Queue()
+
+    def pump():
+        try:
+            for event in events:
+                pending.put(event)
+        except Exception as e:
+            pending.put(e)
+        finally:
+            pending.put(_DONE)
+
+    worker = threading.Thread(target=contextvars.copy_context().run, args=(pump,), daemon=True)
+    worker.start()
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            event = pending.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if event is _DONE or isinstance(event, Exception):
+            break
+        if event['type'] == 'done':
+            if event['text']:
+                yield event
+                return
+            break
+        yield event
+
+    yield {'type': 'done', 'text': fallback_text, 'fallback': True}
+
+
+def replay_text(text: str):
+    """Event stream for an answer that is already known (e.g. a cache hit)."""
+    yield {'type': 'text', 'data': text}
+    yield {'type': 'done', 'text': text}
+
+
+def collect_stream(events, on_event=None) -> str:
+    """Drain an event stream and return the final text, optionally reporting each event."""
+    final_text = ''
+    chunks = []
+    for event in events:
+        if on_event is not None:
+            on_event(event)
+        if event['type'] == 'text':
+            chunks.append(event['data'])
+        elif event['type'] == 'done':
+            final_text = event['text']
+    return final_text or ''.join(chunks)
@@ -1,9 +1,14 @@
 from strands import Agent
-from strands.models import BedrockModel
-import os
-import streamlit as st
+import functools
 from dotenv import load_dotenv
 
+from agents.model_factory import AGENT_MODEL_ID, create_model
+
+from data.prompt_format import serialize_for_prompt
+from agents.response_cache import cached_stream, fingerprint
+from agents.streaming import stream_agent, collect_stream, race_with_fallback
+from agents.local_summary import AI_LATENCY_BUDGET_SECONDS, local_page_summary
+from agents.tool_payloads import prefetch_tool_data
 from agents.summary_tools import (
     get_champion_insights_summary,
     get_advanced_stats_summary,
@@ -14,19 +19,36 @@ from agents.summary_tools import (
 
 load_dotenv()
 
-AWS_REGION = os.getenv("AWS_REGION", "us-west-2")
-BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "us.anthropic.claude-3-7-sonnet-20250219-v1:0")
+# Page metrics appended to the summary prompt are trimmed to this many tokens
+PAGE_METRICS_TOKEN_BUDGET = 800
+
+SUMMARY_TOOLS = [
+    get_champion_insights_summary,
+    get_advanced_stats_summary,
+    get_early_late_game_summary,
+    get_matchup_analysis_summary,
+    get_performance_trends_summary,
+]
+
+# Tools whose output a page summary is based on; they run locally and their payload is sent with the prompt
+PAGE_SUMMARY_TOOLS = {
+    'champion_insights': [get_champion_insights_summary],
+    'advanced_stats': [get_advanced_stats_summary],
+    'early_late': [get_early_late_game_summary],
+    'matchup_analysis': [get_matchup_analysis_summary],
+    'performance_trends': [get_performance_trends_summary],
+}
 
 SUMMARY_SYSTEM_PROMPT = """You are a League of Legends statistics analyst providing concise, data-driven summaries.
 
 Your job is to:
-1. Call the appropriate tool to get the EXACT stats shown on the current page
+1. Read the page data provided with the request - these are the EXACT stats shown on the current page
 2. Reference specific numbers from those stats in your summary
 3. Explain what those specific metrics mean in practical terms
 4. Provide actionable next steps based on the data
 
 CRITICAL RULES:
-- Always start by using the tool to fetch the page's data
+- Only use the page data provided with the request (there are no tools to call)
 - Reference SPECIFIC numbers (e.g., "Your 3 A-tier champions have 65%+ win rates" NOT "You have some good champions")
 - Explain what the metrics mean (e.g., "CS@10 of 55 is below the 60+ benchmark for laners")
 - Keep it SHORT (4-6 sentences max)
@@ -62,78 +84,109 @@ DO NOT:
 """
 
 
-@st.cache_resource
-def initialize_summary_agent():
-    """Initialize the summary agent with specialized tools"""
-    bedrock_model = BedrockModel(
-        model_id=BEDROCK_MODEL_ID,
+@functools.lru_cache(maxsize=None)
+def get_summary_model():
+    """Bedrock model (and boto client) shared by all summary agents in the process"""
+    return create_model(
         temperature=0.3,  # Lower temperature for more consistent, factual summaries
         max_tokens=500,   # Short responses
     )
-    
+
+def initialize_summary_agent():
+    """Initialize the summary agent (no tools: page data is injected into the prompt).
+    A fresh, stateless agent per call so concurrent sessions never share conversation state."""
     agent = Agent(
-        model=bedrock_model,
+        name="page_summary",
+        model=get_summary_model(),
         system_prompt=SUMMARY_SYSTEM_PROMPT,
-        tools=[
-            get_champion_insights_summary,
-            get_advanced_stats_summary,
-            get_early_late_game_summary,
-            get_matchup_analysis_summary,
-            get_performance_trends_summary,
-        ]
     )
     
     return agent
 
 
-def generate_page_summary(page_name: str, page_metrics: dict = None) -> str:
-    """
-    Generate a summary for a specific page with optional page-specific metrics.
-    
-    Args:
-        page_name: One of 'champion_insights', 'advanced_stats', 'early_late', 
-                   'matchup_analysis', 'performance_trends'
-        page_metrics: Optional dict of metrics calculated in main.py for this specific page
-    
-    Returns:
-        str: AI-generated summary
-    """
+def build_summary_prompt(page_name: str, page_metrics: dict = None, page_data: str = None) -> str:
+    """Prompt for a page summary, with the page's tool data and metrics appended when given"""
     prompts = {
-        'champion_insights': """Analyze my champion pool using get_champion_insights_summary(). 
+        'champion_insights': """Analyze my champion pool from the get_champion_insights_summary() page data. 
         Focus on: tier distribution, diversity ratio, top performers, and whether my pool is too wide or well-focused. 
         Reference specific champions, their KDAs, win rates, and game counts.""",
         
-        'advanced_stats': """Analyze my advanced performance metrics using the available tools. 
+        'advanced_stats': """Analyze my advanced performance metrics from the page data. 
         Focus on: KDA std dev, aggression score, early game dominance score, objective score, performance volatility, 
         safety score, persistence score and the 4 performance scores (Aggression, Safety, Consistency, Impact). 
         Explain what each key metric means and whether it's good or needs work.""",
         
-        'early_late': """Analyze my early game performance using get_early_late_game_summary(). 
+        'early_late': """Analyze my early game performance from the get_early_late_game_summary() page data. 
         Focus on the 3 metrics shown. For laners its: CS@10, Gold/Min, and Early Kills - comparing wins vs losses.
         For junglers its: Jungle CS@10, Gold/Min, and Early Takedowns - comparing wins vs losses.
         For supports/utility its: Wards@10, Quest Completion and Early Assists - comparing wins and losses
         Explain what the differences mean (e.g., CS@10 benchmark is 60+ for laners) and whether my early game is winning or losing me games.""",
         
-        'matchup_analysis': """Analyze my matchup performance using get_matchup_analysis_summary(). 
+        'matchup_analysis': """Analyze my matchup performance from the get_matchup_analysis_summary() page data. 
         Focus on: best matchups (60%+ WR), worst matchups (<40% WR), specific champion combinations, 
         and CS diff@10 in these matchups. List specific champion vs champion matchups with win rates.""",
         
-        'performance_trends': """Analyze my performance trends using get_performance_trends_summary(). 
+        'performance_trends': """Analyze my performance trends from the get_performance_trends_summary() page data. 
         Focus on: overall win rate, average K/D/A shown in the charts, the wins vs losses comparison 
         (especially deaths gap, CS difference, damage difference), recent form (last 5 games), 
+        the rolling trends (10-game win rate, EWMA KDA, CS/min, deaths, vision - are they improving or declining?), 
+        session patterns (does win rate drop later in a session or after losses?), 
         and TOP PERFORMING CHAMPIONS (list the top 2-3 champions by name with their win rates and games played). 
         Identify the biggest performance gap between wins and losses and which champions are carrying your climb."""
     }
     
     prompt = prompts.get(page_name, "Provide a brief summary of the player's statistics.")
     
+    # Page data is computed locally and sent with the request, so the model answers in one call
+    if page_data:
+        prompt += f"\n\nPage data:\n{page_data}"
+    
     # Add page-specific metrics if provided
     if page_metrics:
-        prompt += f"\n\nAdditional page metrics: {page_metrics}"
+        page_metrics_text, _ = serialize_for_prompt(page_metrics, PAGE_METRICS_TOKEN_BUDGET, priorities=[])
+        prompt += f"\n\nAdditional page metrics: {page_metrics_text}"
+    
+    return prompt
+
+
+def stream_page_summary(page_name: str, page_metrics: dict = None, latency_budget: float = AI_LATENCY_BUDGET_SECONDS):
+    """
+    Stream a page summary as agent events (see agents.streaming.stream_agent).
+    A cached answer for the same model, prompt and page data is replayed without calling Bedrock.
+    With a latency_budget (seconds) a local template summary is sent first and kept if the model
+    hasn't finished in time (see agents.streaming.race_with_fallback); None waits for the model.
+    """
+    page_data = prefetch_tool_data(PAGE_SUMMARY_TOOLS.get(page_name, SUMMARY_TOOLS))
+    prompt = build_summary_prompt(page_name, page_metrics, page_data)
+    context_fingerprint = fingerprint(page_data)
+    events = cached_stream(
+        AGENT_MODEL_ID,
+        SUMMARY_SYSTEM_PROMPT,
+        prompt,
+        context_fingerprint,
+        lambda: stream_agent(initialize_summary_agent(), prompt),
+    )
+    if latency_budget is None:
+        return events
+    return race_with_fallback(events, local_page_summary(page_name, page_metrics), latency_budget)
+
+
+def generate_page_summary(page_name: str, page_metrics: dict = None, on_event=None,
+                          latency_budget: float = AI_LATENCY_BUDGET_SECONDS) -> str:
+    """
+    Generate a summary for a specific page with optional page-specific metrics.
+    
+    Args:
+        page_name: One of 'champion_insights', 'advanced_stats', 'early_late', 
+                   'matchup_analysis', 'performance_trends'
+        page_metrics: Optional dict of metrics calculated in main.py for this specific page
+        on_event: Optional callback receiving each streamed event (text chunks)
+        latency_budget: Seconds to wait for the model before using the local summary (None: no limit)
     
+    Returns:
+        str: AI-generated summary (or the local template summary if the model is slow or fails)
+    """
     try:
-        agent = initialize_summary_agent()
-        response = agent(prompt)
-        return str(response)
-    except Exception as e:
-        return f"Unable to generate summary: {str(e)}"
\ No newline at end of file
+        return collect_stream(stream_page_summary(page_name, page_metrics, latency_budget), on_event)
+    except Exception:
+        return local_page_summary(page_name, page_metrics)
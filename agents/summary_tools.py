@@ -1,8 +1,13 @@
 from strands import tool
 from agents.context_manager import get_context
+from agents.tool_payloads import compact_tool_result, paginated_tool_result
+from agents.tool_cache import memoize_tool
 
 
 @tool
+@memoize_tool
+@compact_tool_result
+@paginated_tool_result
 def get_champion_insights_summary() -> dict:
     """
     Get comprehensive champion pool data matching what's displayed on the page.
@@ -58,6 +63,9 @@ def get_champion_insights_summary() -> dict:
 
 
 @tool
+@memoize_tool
+@compact_tool_result
+@paginated_tool_result
 def get_advanced_stats_summary() -> dict:
     """
     Get ALL advanced statistics exactly as displayed on the Advanced Stats page.
@@ -96,6 +104,9 @@ def get_advanced_stats_summary() -> dict:
 
 
 @tool
+@memoize_tool
+@compact_tool_result
+@paginated_tool_result
 def get_page_specific_metrics(page_data: dict) -> dict:
     """
     Generic tool to receive page-specific metrics that are calculated in main.py.
@@ -105,6 +116,9 @@ def get_page_specific_metrics(page_data: dict) -> dict:
 
 
 @tool
+@memoize_tool
+@compact_tool_result
+@paginated_tool_result
 def get_early_late_game_summary() -> dict:
     """
     Get comprehensive early vs late game data for ALL roles the player plays.
@@ -192,6 +206,9 @@ def get_early_late_game_summary() -> dict:
     return result
 
 @tool
+@memoize_tool
+@compact_tool_result
+@paginated_tool_result
 def get_matchup_analysis_summary() -> dict:
     """
     Get complete matchup analysis exactly as displayed on page.
@@ -337,11 +354,15 @@ def get_matchup_analysis_summary() -> dict:
 
 
 @tool
+@memoize_tool
+@compact_tool_result
+@paginated_tool_result
 def get_performance_trends_summary() -> dict:
     """
     Get comprehensive performance trends exactly as shown on Performance Analysis page.
     Returns KDA trends, win rate, K/D/A averages, wins vs losses comparison, recent form,
-    and top performing champions.
+    rolling win rate / EWMA KDA / CS per min / deaths / vision trends, play-session patterns
+    (win rate by game number, results after losses), and top performing champions.
     """
     ctx = get_context()
     
@@ -452,6 +473,8 @@ def get_performance_trends_summary() -> dict:
             'recent_win_rate': (recent_wins / len(recent_matches) * 100) if recent_matches else 0,
         },
         'top_performing_champions': top_champions,
+        'rolling_trends': rich_ctx.get('performance_trends', {}),
+        'session_patterns': rich_ctx.get('session_analysis', {}),
         'key_patterns': {
             'biggest_stat_difference': 'CS' if abs(cs_difference) > abs(damage_difference/1000) else 'Damage',
             'cs_gap_severity': 'large' if abs(cs_difference) > 30 else 'moderate' if abs(cs_difference) > 15 else 'small',
@@ -0,0 +1,216 @@
+import functools
+import os
+import threading
+from collections import Counter, OrderedDict, deque
+
+from dotenv import load_dotenv
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+
+load_dotenv()
+
+# Where agent traces go: "off" (default), "memory" (debug panel only), "console" or "file"
+AGENT_TELEMETRY_EXPORTER = os.getenv("AGENT_TELEMETRY_EXPORTER", "off").lower()
+
+# JSON-lines span file used by the "file" exporter
+AGENT_TELEMETRY_FILE = os.getenv("AGENT_TELEMETRY_FILE", os.path.join(".cache", "agent_traces.jsonl"))
+
+# Finished agent invocations kept in memory for the debug panel
+AGENT_TELEMETRY_RECENT = int(os.getenv("AGENT_TELEMETRY_RECENT", 100))
+
+# Traces whose agent span has not ended yet (caps memory if an invocation never finishes)
+MAX_PENDING_TRACES = 256
+
+SERVICE_NAME = "rift-metrics"
+
+# Span attributes added on top of the ones strands records
+TOOL_CACHE_HIT = "rift.tool.cache_hit"
+TOOL_PAYLOAD_CHARS = "rift.tool.payload_chars"
+MODEL_QUEUE_WAIT_MS = "rift.model.queue_wait_ms"
+
+_tracer = trace.get_tracer(__name__)
+
+
+def _ms(span) -> float:
+    return (span.end_time - span.start_time) / 1e6
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends each finished span to a file as one JSON object per line."""
+
+    def __init__(self, path: str = AGENT_TELEMETRY_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans):
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+class InvocationSummaryProcessor(SpanProcessor):
+    """Folds the model and tool spans of each agent invocation into one summary record.
+
+    strands opens an "invoke_agent" span per agent call, with "chat" spans (one per model
+    round trip, carrying token usage) and "execute_tool" spans below it; a record is
+    emitted when the agent span ends.
+    """
+
+    def __init__(self, max_recent: int = AGENT_TELEMETRY_RECENT):
+        self._recent = deque(maxlen=max_recent)
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _children(self, trace_id):
+        children = self._pending.pop(trace_id, None)
+        if children is None:
+            children = {'models': [], 'tools': []}
+            while len(self._pending) >= MAX_PENDING_TRACES:
+                self._pending.popitem(last=False)
+        self._pending[trace_id] = children
+        return children
+
+    def on_end(self, span):
+        attributes = span.attributes or {}
+        operation = attributes.get('gen_ai.operation.name')
+        trace_id = span.context.trace_id
+        with self._lock:
+            if operation == 'chat':
+                self._children(trace_id)['models'].append({
+                    'duration_ms': _ms(span),
+                    'queue_wait_ms': attributes.get(MODEL_QUEUE_WAIT_MS, 0.0),
+                    'input_tokens': attributes.get('gen_ai.usage.input_tokens', 0),
+                    'output_tokens': attributes.get('gen_ai.usage.output_tokens', 0),
+                })
+            elif operation == 'execute_tool':
+                self._children(trace_id)['tools'].append({
+                    'name': attributes.get('gen_ai.tool.name', span.name),
+                    'duration_ms': _ms(span),
+                    'payload_chars': attributes.get(TOOL_PAYLOAD_CHARS, 0),
+                    'cache_hit': attributes.get(TOOL_CACHE_HIT, False),
+                    'status': attributes.get('gen_ai.tool.status', ''),
+                })
+            elif operation == 'invoke_agent':
+                children = self._pending.pop(trace_id, {'models': [], 'tools': []})
+                models = children['models']
+                self._recent.append({
+                    'agent': attributes.get('gen_ai.agent.name', span.name),
+                    'started_at': span.start_time / 1e9,
+                    'duration_ms': _ms(span),
+                    'model_calls': len(models),
+                    'model_ms': sum(m['duration_ms'] for m in models),
+                    'queue_wait_ms': sum(m['queue_wait_ms'] for m in models),
+                    'input_tokens': sum(m['input_tokens'] for m in models),
+                    'output_tokens': sum(m['output_tokens'] for m in models),
+                    'tools': children['tools'],
+                    'error': not span.status.is_ok,
+                })
+
+    def recent(self) -> list:
+        with self._lock:
+            return list(self._recent)
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+            self._pending.clear()
+
+
+_summary = InvocationSummaryProcessor()
+_cache_lookups = Counter()
+_cache_lock = threading.Lock()
+
+
+def telemetry_enabled() -> bool:
+    return AGENT_TELEMETRY_EXPORTER != "off"
+
+
+@functools.lru_cache(maxsize=None)
+def configure_telemetry() -> bool:
+    """Install the OpenTelemetry pipeline once per process; strands' agent spans flow into it.
+
+    Returns False when telemetry is off. An SDK tracer provider installed by someone else
+    (e.g. OTEL auto-instrumentation) is reused rather than replaced.
+    """
+    if not telemetry_enabled():
+        return False
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+        trace.set_tracer_provider(provider)
+    provider.add_span_processor(_summary)
+    if AGENT_TELEMETRY_EXPORTER == "console":
+        provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    elif AGENT_TELEMETRY_EXPORTER == "file":
+        provider.add_span_processor(BatchSpanProcessor(JsonLinesSpanExporter()))
+    elif AGENT_TELEMETRY_EXPORTER != "memory":
+        raise ValueError(
+            f"Unknown AGENT_TELEMETRY_EXPORTER: {AGENT_TELEMETRY_EXPORTER!r} "
+            "(expected 'off', 'memory', 'console' or 'file')"
+        )
+    return True
+
+
+def record_cache_lookup(cache_name: str, hit: bool, span_outside_trace: bool = False):
+    """Count a cache lookup and mark it on the current span.
+
+    With span_outside_trace, a hit made outside any trace gets a span of its own, for caches
+    (like the response cache) whose hits never reach an agent and would otherwise not be exported.
+    """
+    with _cache_lock:
+        _cache_lookups[(cache_name, hit)] += 1
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attribute(f"rift.{cache_name}.cache_hit", hit)
+    elif hit and span_outside_trace:
+        with _tracer.start_as_current_span(f"cache_hit {cache_name}") as span:
+            span.set_attribute(f"rift.{cache_name}.cache_hit", True)
+
+
+def record_tool_payload(payload):
+    """Attach the size of a tool's result to the running tool span."""
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attribute(TOOL_PAYLOAD_CHARS, len(payload) if isinstance(payload, str) else len(str(payload)))
+
+
+def record_queue_wait(wait_ms: float):
+    """Time a model call spent waiting for a concurrency slot, on the running model span."""
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attribute(MODEL_QUEUE_WAIT_MS, wait_ms)
+
+
+def recent_invocations() -> list:
+    """Summary records of the latest agent invocations, oldest first."""
+    return _summary.recent()
+
+
+def cache_lookup_stats() -> dict:
+    """cache name -> {'hits': n, 'misses': n} since the process started (or the last clear)."""
+    with _cache_lock:
+        names = {name for name, _ in _cache_lookups}
+        return {
+            name: {'hits': _cache_lookups[(name, True)], 'misses': _cache_lookups[(name, False)]}
+            for name in sorted(names)
+        }
+
+
+def clear_telemetry():
+    _summary.clear()
+    with _cache_lock:
+        _cache_lookups.clear()
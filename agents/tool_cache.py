@@ -0,0 +1,68 @@
+import functools
+import threading
+
+from cachetools import LRUCache
+
+from agents.context_manager import get_context
+from agents.telemetry import record_cache_lookup, record_tool_payload
+
+# Memoized tool results kept for all sessions (each is a compact JSON payload of a few KB at most)
+TOOL_RESULT_CACHE_SIZE = 4096
+
+# Lookup indexes kept for all sessions (one per index name and player context version)
+TOOL_INDEX_CACHE_SIZE = 256
+
+_results = LRUCache(maxsize=TOOL_RESULT_CACHE_SIZE)
+_indexes = LRUCache(maxsize=TOOL_INDEX_CACHE_SIZE)
+_lock = threading.Lock()
+_MISSING = object()
+
+
+def memoize_tool(func):
+    """Reuse a tool's result for the same arguments and player context version.
+
+    The version changes whenever different player data is bound, so a result is never
+    served for another player or queue filter; without loaded data nothing is cached.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        version = get_context()['version']
+        if version is None:
+            result = func(*args, **kwargs)
+            record_tool_payload(result)
+            return result
+        key = (func.__module__, func.__qualname__, version, args, tuple(sorted(kwargs.items())))
+        with _lock:
+            result = _results.get(key, _MISSING)
+        record_cache_lookup('tool', result is not _MISSING)
+        if result is _MISSING:
+            result = func(*args, **kwargs)
+            with _lock:
+                _results[key] = result
+        record_tool_payload(result)
+        return result
+    return wrapper
+
+
+def context_index(name: str, build):
+    """Lookup table derived from the current player context, built once per context version.
+
+    build receives the context dict (see agents.context_manager.get_context) and returns the index.
+    """
+    ctx = get_context()
+    if ctx['version'] is None:
+        return build(ctx)
+    key = (name, ctx['version'])
+    with _lock:
+        index = _indexes.get(key)
+    if index is None:
+        index = build(ctx)
+        with _lock:
+            _indexes[key] = index
+    return index
+
+
+def clear_tool_cache():
+    with _lock:
+        _results.clear()
+        _indexes.clear()
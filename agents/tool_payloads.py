@@ -0,0 +1,109 @@
+import functools
+import inspect
+
+from data.prompt_format import serialize_for_prompt
+
+# Upper bound for a single tool result handed back to the model
+TOOL_TOKEN_BUDGET = 1500
+
+# Items per list (or per collection of records) a tool returns unless the model asks for more
+DEFAULT_TOOL_PAGE_SIZE = 10
+MAX_TOOL_PAGE_SIZE = 50
+
+PAGINATION_DOC = """
+
+Args:
+    limit: Max items returned per list (default 10, max 50)
+    offset: Items to skip in each list, for the next page
+    fields: Comma-separated top-level fields to return (default: all)"""
+
+
+def compact_tool_result(func):
+    """Serialize a tool's dict result as budgeted compact JSON instead of a verbose repr."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        if not isinstance(result, dict):
+            return result
+        text, _ = serialize_for_prompt(result, TOOL_TOKEN_BUDGET, priorities=[])
+        return text
+    return wrapper
+
+
+def _is_record_collection(value) -> bool:
+    # A dict of records keyed by name (e.g. champion -> stats), paged like a list
+    return isinstance(value, dict) and len(value) > 0 and all(isinstance(v, dict) for v in value.values())
+
+
+def paginate_payload(result, limit: int = DEFAULT_TOOL_PAGE_SIZE, offset: int = 0, fields: str = ''):
+    """
+    One page of a tool result: keep only the requested top-level fields and slice every list and
+    collection of records to [offset, offset + limit). When anything was cut, a '_page' header
+    comes first with each cut collection's total size and the offset of its next page.
+    """
+    if isinstance(result, list):
+        result = {'items': result}
+    if not isinstance(result, dict) or 'error' in result:
+        return result
+
+    limit = max(1, min(int(limit), MAX_TOOL_PAGE_SIZE))
+    offset = max(0, int(offset))
+    more = {}
+
+    def page(value, path, depth):
+        if isinstance(value, list) or (depth > 0 and _is_record_collection(value)):
+            items = value if isinstance(value, list) else list(value.items())
+            if len(items) > limit or offset:
+                remaining = len(items) - offset - limit
+                if remaining > 0:
+                    more[path] = {'total': len(items), 'next_offset': offset + limit}
+                items = items[offset:offset + limit]
+            value = items if isinstance(value, list) else dict(items)
+        if isinstance(value, dict) and depth < 3:
+            return {k: page(v, f"{path}.{k}" if path else str(k), depth + 1) for k, v in value.items()}
+        if isinstance(value, list) and depth < 3:
+            return [page(v, path, depth + 1) if isinstance(v, dict) else v for v in value]
+        return value
+
+    header = {}
+    if fields:
+        wanted = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [f for f in wanted if f not in result]
+        result = {k: v for k, v in result.items() if k in wanted}
+        header['fields'] = list(result.keys())
+        if unknown:
+            header['unknown_fields'] = unknown
+
+    result = page(result, '', 0)
+    if more:
+        header.update({
+            'offset': offset,
+            'limit': limit,
+            'more_available': more,
+            'hint': f"Call again with offset={offset + limit} for the next page",
+        })
+    return {'_page': header, **result} if header else result
+
+
+def paginated_tool_result(func):
+    """Give a tool limit/offset/fields parameters and return one page of its result."""
+    @functools.wraps(func)
+    def wrapper(*args, limit: int = DEFAULT_TOOL_PAGE_SIZE, offset: int = 0, fields: str = '', **kwargs):
+        return paginate_payload(func(*args, **kwargs), limit, offset, fields)
+
+    # Advertise the extra parameters in the tool spec (strands reads the signature and docstring)
+    signature = inspect.signature(func)
+    wrapper.__signature__ = signature.replace(parameters=[
+        *signature.parameters.values(),
+        inspect.Parameter('limit', inspect.Parameter.KEYWORD_ONLY, default=DEFAULT_TOOL_PAGE_SIZE, annotation=int),
+        inspect.Parameter('offset', inspect.Parameter.KEYWORD_ONLY, default=0, annotation=int),
+        inspect.Parameter('fields', inspect.Parameter.KEYWORD_ONLY, default='', annotation=str),
+    ])
+    wrapper.__annotations__ = {**func.__annotations__, 'limit': int, 'offset': int, 'fields': str}
+    wrapper.__doc__ = inspect.cleandoc(func.__doc__ or func.__name__) + PAGINATION_DOC
+    return wrapper
+
+
+def prefetch_tool_data(tools) -> str:
+    """Run tools locally and format their payloads as a prompt section, one line per tool."""
+    return "\n".join(f"{tool.tool_name}(): {tool()}" for tool in tools)
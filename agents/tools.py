@@ -1,7 +1,11 @@
 from strands import tool
 from agents.context_manager import get_context
+from agents.tool_payloads import compact_tool_result, paginated_tool_result
+from agents.tool_cache import memoize_tool, context_index
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_player_overview() -> dict:
     """Get high-level player stats (win rate, KDA, games played)"""
     ctx = get_context()
@@ -12,6 +16,8 @@ def get_player_overview() -> dict:
     return ctx['rich_context'].get("overview", {})
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_detailed_stats(category: str) -> dict:
     """Get detailed stats for a category. Categories: 'combat', 'farming', 'vision', 'champion_pool'"""
     ctx = get_context()
@@ -33,6 +39,8 @@ def get_detailed_stats(category: str) -> dict:
     return ctx['rich_context'].get(key, {})
 
 @tool
+@memoize_tool
+@compact_tool_result
 def compare_win_loss(stat_type: str) -> dict:
     """Compare stats between wins and losses. Types: 'cs', 'damage', 'vision'"""
     ctx = get_context()
@@ -54,6 +62,8 @@ def compare_win_loss(stat_type: str) -> dict:
     }
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_champion_stats(champion_name: str) -> dict:
     """Get performance stats for a specific champion"""
     ctx = get_context()
@@ -61,16 +71,24 @@ def get_champion_stats(champion_name: str) -> dict:
     if not ctx['is_loaded'] or ctx['champ_insights'] is None:
         return {"error": "No champion data loaded"}
     
-    champ_insights = ctx['champ_insights']
-    champ_row = champ_insights[champ_insights['Champion'].str.lower() == champion_name.lower()]
+    champ_stats = context_index('champion_stats_by_name', _champion_stats_by_name).get(champion_name.lower())
     
-    if len(champ_row) == 0:
-        available = ', '.join(champ_insights['Champion'].tolist()[:5])
+    if champ_stats is None:
+        available = ', '.join(ctx['champ_insights']['Champion'].tolist()[:5])
         return {"error": f"Champion '{champion_name}' not found. Available: {available}..."}
     
-    return champ_row.iloc[0].to_dict()
+    return champ_stats
+
+def _champion_stats_by_name(ctx):
+    #lowercase champion name -> stats row (first row wins, like the old DataFrame scan)
+    index = {}
+    for row in ctx['champ_insights'].to_dict('records'):
+        index.setdefault(str(row['Champion']).lower(), row)
+    return index
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_champion_comparison(champion1: str, champion2: str) -> dict:
     """Compare detailed stats between two champions"""
     ctx = get_context()
@@ -113,6 +131,8 @@ def get_champion_comparison(champion1: str, champion2: str) -> dict:
     }
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_early_game_stats() -> dict:
     """Get detailed early game (0-10 minutes) performance"""
     ctx = get_context()
@@ -123,6 +143,8 @@ def get_early_game_stats() -> dict:
     return ctx['rich_context'].get('early_game_analysis', {})
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_damage_profile() -> dict:
     """Get player's damage composition and efficiency metrics"""
     ctx = get_context()
@@ -133,6 +155,8 @@ def get_damage_profile() -> dict:
     return ctx['rich_context'].get('damage_profile', {})
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_objective_control_stats() -> dict:
     """Get overall statistics about objective control (dragons, barons, heralds, turrets)"""
     ctx = get_context()
@@ -147,6 +171,9 @@ def get_objective_control_stats() -> dict:
     }
 
 @tool
+@memoize_tool
+@compact_tool_result
+@paginated_tool_result
 def list_champions() -> list:
     """Get list of all champions the player has played"""
     ctx = get_context()
@@ -158,6 +185,8 @@ def list_champions() -> list:
     return list(champ_details.keys())
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_matchup_stats(my_champion: str, opponent_champion: str) -> dict:
     """Get head-to-head stats for a specific champion matchup (e.g., Lucian vs Jinx)"""
     ctx = get_context()
@@ -175,6 +204,8 @@ def get_matchup_stats(my_champion: str, opponent_champion: str) -> dict:
 
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_stats_vs_opponent(opponent_champion: str) -> dict:
     """Get overall stats against a specific opponent across all your champions"""
     ctx = get_context()
@@ -191,6 +222,9 @@ def get_stats_vs_opponent(opponent_champion: str) -> dict:
 
 
 @tool
+@memoize_tool
+@compact_tool_result
+@paginated_tool_result
 def list_matchups_for_champion(champion: str) -> list:
     """List all matchups played with a specific champion"""
     ctx = get_context()
@@ -198,19 +232,22 @@ def list_matchups_for_champion(champion: str) -> list:
     if not ctx['is_loaded']:
         return []
     
-    matchups = ctx['rich_context'].get('matchup_data', {})
-    
-    return [
-        {
+    return context_index('matchups_by_champion', _matchups_by_champion).get(champion, [])
+
+def _matchups_by_champion(ctx):
+    #my champion -> its matchups (opponent, games, win rate), in matchup_data order
+    index = {}
+    for data in ctx['rich_context'].get('matchup_data', {}).values():
+        index.setdefault(data['my_champion'], []).append({
             'opponent': data['opponent'],
             'games': data['games'],
             'win_rate': data['win_rate']
-        }
-        for key, data in matchups.items()
-        if data['my_champion'] == champion
-    ]
+        })
+    return index
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_role_analysis() -> dict:
     """Get player's role distribution and performance by role (TOP, JUNGLE, MIDDLE, BOTTOM, UTILITY)"""
     ctx = get_context()
@@ -222,6 +259,8 @@ def get_role_analysis() -> dict:
 
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_objective_control_by_outcome() -> dict:
     """Compare objective control (dragons, barons, heralds, turrets) between wins and losses"""
     ctx = get_context()
@@ -232,6 +271,8 @@ def get_objective_control_by_outcome() -> dict:
     return ctx['rich_context'].get('objective_control_by_outcome', {})
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_role_consistency() -> dict:
     """Get player's primary and secondary roles with consistency metrics"""
     ctx = get_context()
@@ -243,6 +284,8 @@ def get_role_consistency() -> dict:
 
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_jungle_performance() -> dict:
     """Get jungle-specific performance metrics (only available if player plays jungle)"""
     ctx = get_context()
@@ -259,6 +302,8 @@ def get_jungle_performance() -> dict:
 
 
 @tool
+@memoize_tool
+@compact_tool_result
 def get_support_performance() -> dict:
     """Get support-specific performance metrics (only available if player plays support)"""
     ctx = get_context()
@@ -271,4 +316,40 @@ def get_support_performance() -> dict:
     if not support_perf.get('has_support_data', False):
         return {"error": "Player has not played support in recent matches"}
     
-    return support_perf
\ No newline at end of file
+    return support_perf
+
+
+@tool
+@memoize_tool
+@compact_tool_result
+def get_session_patterns() -> dict:
+    """Get play-session patterns: win rate by game number in a session, results after wins vs losses, and tilt risk"""
+    ctx = get_context()
+    
+    if not ctx['is_loaded']:
+        return {"error": "No data loaded"}
+    
+    sessions = ctx['rich_context'].get('session_analysis', {})
+    
+    if not sessions.get('has_session_data', False):
+        return {"error": "No match timestamps available to detect play sessions"}
+    
+    return sessions
+
+
+@tool
+@memoize_tool
+@compact_tool_result
+def get_population_percentiles() -> dict:
+    """Get the player's percentile rank (0-100) against every other player in their main role from fetched matches (gold/min, CS@10, KDA, kill participation, damage/min, vision/min)"""
+    ctx = get_context()
+    
+    if not ctx['is_loaded']:
+        return {"error": "No data loaded"}
+    
+    percentiles = ctx['rich_context'].get('population_percentiles', {})
+    
+    if not percentiles.get('has_population_data', False):
+        return {"error": "Not enough population data yet to compute percentiles"}
+    
+    return percentiles
\ No newline at end of file
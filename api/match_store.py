@@ -0,0 +1,44 @@
+import os
+
+from dotenv import load_dotenv
+
+from utils.cache_backends import CacheNamespace
+
+load_dotenv()
+
+# Finished matches never change, so their details are kept until the backend needs the space
+MATCH_STORE_TTL_SECONDS = int(os.getenv("MATCH_STORE_TTL_SECONDS", 30 * 24 * 3600))
+
+# Riot ID -> account lookups are reused this long (a renamed player is picked up after it expires)
+ACCOUNT_LOOKUP_TTL_SECONDS = int(os.getenv("ACCOUNT_LOOKUP_TTL_SECONDS", 24 * 3600))
+
+#Raw match-v5 responses keyed by match id, shared by every process on the cache backend
+match_store = CacheNamespace("match", MATCH_STORE_TTL_SECONDS)
+
+#account-v1 responses keyed by lowercased Riot ID
+account_lookups = CacheNamespace("account", ACCOUNT_LOOKUP_TTL_SECONDS)
+
+
+def get_stored_matches(match_ids) -> dict:
+    #match id -> stored match details, for the ids already fetched by any replica
+    return match_store.get_many(match_ids)
+
+
+def store_matches(matches: dict):
+    #Save freshly fetched match details (match id -> details)
+    match_store.set_many(matches)
+
+
+def _riot_id_key(game_name: str, tag_line: str) -> str:
+    return f"{game_name}#{tag_line}".strip().lower()
+
+
+def get_stored_account(game_name: str, tag_line: str):
+    #Stored account lookup for a Riot ID, or None
+    return account_lookups.get(_riot_id_key(game_name, tag_line))
+
+
+def store_account(game_name: str, tag_line: str, account: dict):
+    #Save a successful account lookup
+    if isinstance(account, dict) and 'puuid' in account:
+        account_lookups.set(_riot_id_key(game_name, tag_line), account)
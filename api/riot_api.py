@@ -1,10 +1,11 @@
 import requests
 import time
-import streamlit as st
 import os
 import httpx, asyncio
 from dotenv import load_dotenv
 
+from api.match_store import get_stored_account, get_stored_matches, store_account, store_matches
+
 try:
     from utils.secrets import get_riot_api_key
     RIOT_API_KEY  = get_riot_api_key()
@@ -14,6 +15,9 @@ except Exception as e:
 
 
 def get_account_puuid_by_riot_id(game_name: str, tag_line: str) -> dict:
+    stored = get_stored_account(game_name, tag_line)
+    if stored is not None:
+        return stored
     base_url = "https://asia.api.riotgames.com"
     endpoint = f"/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
     headers = {"X-Riot-Token": RIOT_API_KEY}
@@ -21,7 +25,9 @@ def get_account_puuid_by_riot_id(game_name: str, tag_line: str) -> dict:
     try:
         response = requests.get(base_url + endpoint, headers=headers)
         response.raise_for_status()
-        return response.json()
+        account = response.json()
+        store_account(game_name, tag_line, account)
+        return account
     except requests.exceptions.RequestException as e:
         return {"error": str(e)}
     
@@ -39,6 +45,9 @@ def get_match_ids_by_puuid(region: str, puuid: str, count: int = 40) -> dict:
         return {"error": str(e)}
 
 def get_match_details_by_matchId(region: str, match_id: str) -> dict:
+    stored = get_stored_matches([match_id])
+    if match_id in stored:
+        return stored[match_id]
     routing_region = get_routing_region(region)
     base_url = f"https://{routing_region}.api.riotgames.com"
     endpoint = f"/lol/match/v5/matches/{match_id}"
@@ -47,7 +56,9 @@ def get_match_details_by_matchId(region: str, match_id: str) -> dict:
     try:
         response = requests.get(base_url + endpoint, headers=headers)
         response.raise_for_status()
-        return response.json()
+        match_details = response.json()
+        store_matches({match_id: match_details})
+        return match_details
     except requests.exceptions.RequestException as e:
         return {"error": str(e)}
 
@@ -94,6 +105,9 @@ def get_routing_region_summoner(shard: str) -> str:
 
 def fetch_all_match_data_direct(game_name: str, tag_line: str, region: str, max_matches: int):
     #handles partial fetches and visual rate-limit retries
+    #(Streamlit UI only; headless callers use fetch_match_history_async)
+    import streamlit as st
+
     RIOT_BURST_LIMIT = 20
     match_fetching_semaphore = asyncio.Semaphore(RIOT_BURST_LIMIT)
     
@@ -285,13 +299,30 @@ async def fetch_all_match_data_async(
     # using httpx.AsyncClient for connection pooling
     async with httpx.AsyncClient(timeout=30.0) as client:
 
-        #fetch match data CONCURRENTLY ---
+        #matches already in the shared match store are not fetched again
+        stored_matches = get_stored_matches([match_id.strip() for match_id in match_ids_to_process])
+
+        #fetch the remaining match data CONCURRENTLY ---
         tasks = [
             fetch_match_details_async(region, match_id.strip(), client, semaphore)
             for match_id in match_ids_to_process
+            if match_id.strip() not in stored_matches
         ]
         
-        match_details_results = await asyncio.gather(*tasks, return_exceptions=True)
+        fetched_results = iter(await asyncio.gather(*tasks, return_exceptions=True))
+        match_details_results = [
+            stored_matches[match_id.strip()] if match_id.strip() in stored_matches else next(fetched_results)
+            for match_id in match_ids_to_process
+        ]
+        
+        #save new successes before participant details get attached to them below
+        store_matches({
+            match_id.strip(): match_details
+            for match_id, match_details in zip(match_ids_to_process, match_details_results)
+            if match_id.strip() not in stored_matches
+            and isinstance(match_details, dict)
+            and not {'error', 'long_wait_signal'} & match_details.keys()
+        })
         
         for i, match_details in enumerate(match_details_results):
             match_id = match_ids_to_process[i]
@@ -312,6 +343,8 @@ async def fetch_all_match_data_async(
                     participant_details['queue_type'] = 'Solo/Duo' if queue_id == 420 else 'Flex' if queue_id == 440 else 'Unknown'
                     participant_details['participants'] = match_details['info']['participants']
                     participant_details['matchId'] = match_details['metadata']['matchId']
+                    participant_details['gameStartTimestamp'] = match_details['info'].get('gameStartTimestamp', 0)
+                    participant_details['gameEndTimestamp'] = match_details['info'].get('gameEndTimestamp', 0)
                     all_matches_successful.append(participant_details)
             else:
                 matches_to_retry.append(match_id)
@@ -442,12 +475,64 @@ async def fetch_match_details_async(region: str, match_id: str, client: httpx.As
 
 # async version using quick url helper func
 async def get_account_puuid_by_riot_id_async(game_name: str, tag_line: str, client: httpx.AsyncClient):
+    #unless a replica already looked this Riot ID up
+    stored = get_stored_account(game_name, tag_line)
+    if stored is not None:
+        return stored
     base_url = "https://asia.api.riotgames.com"
     url = f"{base_url}/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
-    return await fetch_url_quick(url, client)
+    account = await fetch_url_quick(url, client)
+    store_account(game_name, tag_line, account)
+    return account
 
 async def get_match_ids_by_puuid_async(region: str, puuid: str, count: int, client: httpx.AsyncClient):
     routing_region = get_routing_region(region)
     base_url = f"https://{routing_region}.api.riotgames.com"
     url = f"{base_url}/lol/match/v5/matches/by-puuid/{puuid}/ids?type=ranked&start=0&count={count}"
-    return await fetch_url_quick(url, client)
\ No newline at end of file
+    return await fetch_url_quick(url, client)
+
+# Rate-limit waits a headless fetch sits out before giving up
+MAX_RATE_LIMIT_WAITS = 3
+
+async def fetch_match_history_async(region: str, puuid: str, max_matches: int, client: httpx.AsyncClient):
+    #Headless counterpart of fetch_all_match_data_direct (no UI): returns the participant dicts of
+    #the player's recent ranked matches, sleeping through Riot rate limits instead of showing them
+    RIOT_BURST_LIMIT = 20
+    match_fetching_semaphore = asyncio.Semaphore(RIOT_BURST_LIMIT)
+
+    match_ids = None
+    for retry_attempt in range(MAX_RATE_LIMIT_WAITS + 1):
+        match_ids = await get_match_ids_by_puuid_async(region, puuid, max_matches, client)
+        if isinstance(match_ids, dict) and 'retry_after' in match_ids and retry_attempt < MAX_RATE_LIMIT_WAITS:
+            await asyncio.sleep(match_ids['retry_after'])
+            continue
+        break
+    if isinstance(match_ids, dict):
+        raise Exception(f"Failed to get match IDs: {match_ids.get('error', 'rate limited')}")
+
+    match_ids_to_process = match_ids[:max_matches]
+    final_all_matches = []
+    rate_limit_waits = 0
+    failed_rounds = 0
+    while match_ids_to_process:
+        all_matches_successful, matches_to_retry, long_wait_signal = await fetch_all_match_data_async(
+            None, None, region, match_ids_to_process, puuid, match_fetching_semaphore, max_matches
+        )
+        final_all_matches.extend(all_matches_successful)
+
+        if long_wait_signal:
+            rate_limit_waits += 1
+            if rate_limit_waits > MAX_RATE_LIMIT_WAITS:
+                raise Exception(f"Riot API rate limit: {len(matches_to_retry)} matches left unfetched")
+            await asyncio.sleep(long_wait_signal)
+        elif matches_to_retry:
+            # non-rate limit errors: retry the failed ones once more, then keep what we have
+            failed_rounds += 1
+            if failed_rounds > 1:
+                break
+        match_ids_to_process = matches_to_retry
+
+    # Keep Riot's newest-first order (the retried matches were appended at the end)
+    order = {match_id: i for i, match_id in enumerate(match_ids)}
+    final_all_matches.sort(key=lambda m: order.get(m['matchId'], len(order)))
+    return final_all_matches
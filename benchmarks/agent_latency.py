@@ -0,0 +1,173 @@
+"""Offline latency benchmark for the agent paths (coach turn, page summaries, playstyle).
+
+Runs every agent on the fake model backend (agents/fake_model.py), so no AWS credentials are
+needed, and reports end-to-end turn latency, time to first token, tool calls and prompt size.
+
+    python -m benchmarks.agent_latency --matches matches.json --runs 10 --concurrency 4
+
+--matches is a JSON list of match participant dicts (the shape kept in st.session_state.raw_matches).
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import statistics
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+# Tool calls the fake coach makes before answering (skipped for agents without tools)
+COACH_SCRIPT = [
+    {"tools": [
+        {"name": "get_player_overview", "input": {}},
+        {"name": "compare_win_loss", "input": {"stat_type": "cs"}},
+    ]},
+    {"tools": [{"name": "get_session_patterns", "input": {}}]},
+]
+
+COACH_QUESTION = "Why do I keep losing games where I'm ahead early?"
+
+SUMMARY_PAGES = ['champion_insights', 'advanced_stats', 'early_late', 'matchup_analysis', 'performance_trends']
+
+
+def load_player_data(matches_path):
+    # Build the filtered 'all queues' context exactly like the app does (Streamlit runs in bare mode)
+    import streamlit as st
+    from utils.helpers import filter_matches_by_queue
+    from utils.queue_filters import prepare_all_filtered_data
+
+    with open(matches_path, encoding='utf-8') as f:
+        matches = json.load(f)
+    st.session_state.raw_matches = matches
+    st.session_state.solo_matches = filter_matches_by_queue(matches, 'solo')
+    st.session_state.flex_matches = filter_matches_by_queue(matches, 'flex')
+    st.session_state.current_user_id = 'benchmark'
+    data_package = prepare_all_filtered_data('all')
+    return data_package['rich_context'], data_package['champ_insights']
+
+
+def run_turn(agent, prompt, rich_context, champ_insights):
+    # One streamed agent turn; returns the measurements for it
+    from agents.context_manager import player_context
+    from agents.streaming import stream_agent
+
+    started = time.perf_counter()
+    first_token = None
+    tool_calls = 0
+    with player_context(rich_context, champ_insights):
+        for event in stream_agent(agent, prompt):
+            if event['type'] == 'text' and first_token is None:
+                first_token = time.perf_counter() - started
+            elif event['type'] == 'tool':
+                tool_calls += 1
+    usage = agent.event_loop_metrics.accumulated_usage
+    return {
+        'latency': time.perf_counter() - started,
+        'first_token': first_token if first_token is not None else time.perf_counter() - started,
+        'tool_calls': tool_calls,
+        'model_calls': agent.event_loop_metrics.cycle_count,
+        'prompt_chars': len(prompt),
+        'input_tokens': usage['inputTokens'],
+    }
+
+
+def coach_turn(rich_context, champ_insights):
+    from agents.agents import initialize_chat_coach
+    return run_turn(initialize_chat_coach(), COACH_QUESTION, rich_context, champ_insights)
+
+
+def summary_turn(page_name, rich_context, champ_insights):
+    # Bypasses the response cache so every run reaches the model
+    from agents.context_manager import player_context
+    from agents.summary_agent import PAGE_SUMMARY_TOOLS, build_summary_prompt, initialize_summary_agent
+    from agents.tool_payloads import prefetch_tool_data
+
+    with player_context(rich_context, champ_insights):
+        prompt = build_summary_prompt(page_name, None, prefetch_tool_data(PAGE_SUMMARY_TOOLS[page_name]))
+    return run_turn(initialize_summary_agent(), prompt, rich_context, champ_insights)
+
+
+def playstyle_turn(rich_context, champ_insights):
+    from agents.context_manager import player_context
+    from agents.playstyle_agent import PLAYSTYLE_TOOLS, initialize_playstyle_agent
+    from agents.tool_payloads import prefetch_tool_data
+
+    with player_context(rich_context, champ_insights):
+        prompt = f"Describe this player's playstyle as JSON.\n\nPlayer data:\n{prefetch_tool_data(PLAYSTYLE_TOOLS)}"
+    return run_turn(initialize_playstyle_agent(), prompt, rich_context, champ_insights)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(name, samples, wall_seconds):
+    latencies = [s['latency'] for s in samples]
+    return {
+        'scenario': name,
+        'runs': len(samples),
+        'p50_ms': round(statistics.median(latencies) * 1000),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000),
+        'first_token_p50_ms': round(statistics.median(s['first_token'] for s in samples) * 1000),
+        'tool_calls': round(statistics.mean(s['tool_calls'] for s in samples), 1),
+        'model_calls': round(statistics.mean(s['model_calls'] for s in samples), 1),
+        'prompt_chars': round(statistics.mean(s['prompt_chars'] for s in samples)),
+        'input_tokens': round(statistics.mean(s['input_tokens'] for s in samples)),
+        'turns_per_s': round(len(samples) / wall_seconds, 2),
+    }
+
+
+def benchmark(scenario, turn, runs, concurrency):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(lambda _: turn(), range(runs)))
+    return summarize(scenario, samples, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--matches', required=True, help="JSON file with the player's match participant dicts")
+    parser.add_argument('--runs', type=int, default=5, help="turns per scenario")
+    parser.add_argument('--concurrency', type=int, default=1, help="turns running at once")
+    parser.add_argument('--latency-ms', type=float, default=400, help="fake time to first token per model call")
+    parser.add_argument('--tokens-per-second', type=float, default=60, help="fake output speed")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args()
+
+    # Must be set before the agent modules are imported (they read the backend on import)
+    os.environ['AGENT_MODEL_BACKEND'] = 'fake'
+    os.environ['FAKE_MODEL_LATENCY_MS'] = str(args.latency_ms)
+    os.environ['FAKE_MODEL_TOKENS_PER_SECOND'] = str(args.tokens_per_second)
+    os.environ['FAKE_MODEL_SCRIPT'] = json.dumps(COACH_SCRIPT)
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.WARNING)
+
+    rich_context, champ_insights = load_player_data(args.matches)
+
+    scenarios = [('coach_turn', lambda: coach_turn(rich_context, champ_insights))]
+    scenarios += [
+        (f"summary:{page}", lambda page=page: summary_turn(page, rich_context, champ_insights))
+        for page in SUMMARY_PAGES
+    ]
+    scenarios.append(('playstyle', lambda: playstyle_turn(rich_context, champ_insights)))
+
+    # Agents echo their answers to stdout through the default callback handler; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = [benchmark(name, turn, args.runs, args.concurrency) for name, turn in scenarios]
+
+    columns = list(results[0].keys())
+    widths = [max(len(column), *(len(str(row[column])) for row in results)) for column in columns]
+    print("  ".join(f"{column:>{width}}" for column, width in zip(columns, widths)))
+    for row in results:
+        print("  ".join(f"{str(row[column]):>{width}}" for column, width in zip(columns, widths)))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
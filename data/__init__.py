@@ -15,6 +15,38 @@ from .context_builder import (
     analyze_objective_control_by_outcome,
     format_context_for_prompt,
 )
+from .trends import (
+    calculate_trend_series,
+    summarize_trends,
+)
+from .sessions import (
+    segment_sessions,
+    tag_sessions,
+    calculate_session_stats,
+)
+from .population import (
+    TDigest,
+    PopulationStats,
+    population_baseline,
+    calculate_population_percentiles,
+)
+from .metric_graph import MetricGraph
+from .lazy_context import LazyContext
+from .prompt_format import (
+    serialize_for_prompt,
+    compact_payload,
+    estimate_tokens,
+)
+from .match_model import (
+    MatchRecord,
+    LaneOpponent,
+    build_match_records,
+)
+from .playstyle_rules import (
+    PLAYSTYLE_TAG_RULES,
+    build_tag_features,
+    evaluate_tag_rules,
+)
 
 __all__ = [
     'calculate_advanced_metrics',
@@ -29,5 +61,25 @@ __all__ = [
     'build_opponent_analysis',
     'analyze_role_distribution',
     'analyze_objective_control_by_outcome',
-    'format_context_for_prompt'
+    'format_context_for_prompt',
+    'calculate_trend_series',
+    'summarize_trends',
+    'segment_sessions',
+    'tag_sessions',
+    'calculate_session_stats',
+    'TDigest',
+    'PopulationStats',
+    'population_baseline',
+    'calculate_population_percentiles',
+    'MetricGraph',
+    'LazyContext',
+    'serialize_for_prompt',
+    'compact_payload',
+    'estimate_tokens',
+    'MatchRecord',
+    'LaneOpponent',
+    'build_match_records',
+    'PLAYSTYLE_TAG_RULES',
+    'build_tag_features',
+    'evaluate_tag_rules',
 ]
\ No newline at end of file
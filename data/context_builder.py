@@ -1,208 +1,198 @@
-import json
 import pandas as pd
+from data.lazy_context import LazyContext
+from data.prompt_format import DEFAULT_CONTEXT_TOKEN_BUDGET, serialize_for_prompt
 from data.metrics import (
     calculate_jungle_early_game_stats,
     calculate_support_early_game_stats
 )
 
 
-def build_rich_player_context(raw_matches: list, metrics: dict, champ_insights: pd.DataFrame) -> dict:
-    #rich context
-    #structured context for raw data for the AI - returns dict (converted into json and injected into prompts)
-    if not raw_matches or len(raw_matches) == 0:
-        return {}
-    
-    # Extract detailed stats from raw matches
+def _detailed_matches(records: list) -> list:
+    # Extract detailed stats from the match records
     detailed_matches = []
     
-    for match in raw_matches:
-        detailed_match = {
+    for match in records:
+        detailed_matches.append({
             # Basic info
-            "champion": match.get('championName', 'Unknown'),
-            "win": match.get('win', False),
+            "champion": match.champion_name,
+            "win": match.win,
             
             # KDA
-            "kills": match.get('kills', 0),
-            "deaths": match.get('deaths', 0),
-            "assists": match.get('assists', 0),
+            "kills": match.kills,
+            "deaths": match.deaths,
+            "assists": match.assists,
             
             # Farm & Economy
-            "totalMinionsKilled": match.get('totalMinionsKilled', 0),
-            "neutralMinionsKilled": match.get('neutralMinionsKilled', 0),
-            "goldEarned": match.get('goldEarned', 0),
+            "totalMinionsKilled": match.total_minions_killed,
+            "neutralMinionsKilled": match.neutral_minions_killed,
+            "goldEarned": match.gold_earned,
             
             # Healing and Damage Dealt/Taken
-            "totalDamageDealtToChampions": match.get('totalDamageDealtToChampions', 0),
-            "totalDamageTaken": match.get('totalDamageTaken', 0),
-            "damagePerMinute": match.get('challenges', {}).get('damagePerMinute', 0),
-            "damageTakenOnTeamPercentage": match.get('challenges', {}).get('damageTakenOnTeamPercentage', 0),
-            "totalDamageShieldedOnTeammates": match.get('challenges', {}).get('totalDamageShieldedOnTeammates', 0),
-            "effectiveHealAndShielding" : match.get('challenges', {}).get('effectiveHealAndShielding', 0),
+            "totalDamageDealtToChampions": match.total_damage_dealt_to_champions,
+            "totalDamageTaken": match.total_damage_taken,
+            "damagePerMinute": match.damage_per_minute,
+            "damageTakenOnTeamPercentage": match.damage_taken_on_team_percentage,
+            "totalDamageShieldedOnTeammates": match.total_damage_shielded_on_teammates,
+            "effectiveHealAndShielding" : match.effective_heal_and_shielding,
             
             # Vision
-            "visionScore": match.get('visionScore', 0),
-            "wardsPlaced": match.get('wardsPlaced', 0),
-            "wardsKilled": match.get('wardTakedowns', 0),
+            "visionScore": match.vision_score,
+            "wardsPlaced": match.wards_placed,
+            "wardsKilled": match.ward_takedowns,
             
             # Game details
-            "gameDuration": match.get('challenges', {}).get('gameLength', 0),
-            "position": match.get('teamPosition', 'UNKNOWN'),
+            "gameDuration": match.game_length,
+            "position": match.team_position,
             
             # Performance indicators (from challenges)
-            "isLaner": match.get('teamPosition', 'UNKNOWN') in ['TOP', 'MID', 'BOTTOM'],
-            "killParticipation": match.get('challenges', {}).get('killParticipation', 0),
-            "laneMinionsFirst10Minutes": match.get('challenges', {}).get('laneMinionsFirst10Minutes', 0),
-            "maxCsAdvantageOnLaneOpponent": match.get('challenges', {}).get('maxCsAdvantageOnLaneOpponent', 0),
-            "soloKills": match.get('challenges', {}).get('soloKills', 0),
-            "turretPlatesTaken": match.get('challenges', {}).get('turretPlatesTaken', 0),
+            "isLaner": match.team_position in ['TOP', 'MID', 'BOTTOM'],
+            "killParticipation": match.kill_participation,
+            "laneMinionsFirst10Minutes": match.lane_minions_first_10_minutes,
+            "maxCsAdvantageOnLaneOpponent": match.max_cs_advantage_on_lane_opponent,
+            "soloKills": match.solo_kills,
+            "turretPlatesTaken": match.turret_plates_taken,
 
             # Jungle-specific stats (only relevant if position is JUNGLE)
-            "isJungler": match.get('teamPosition', 'UNKNOWN') == 'JUNGLE',
-            "jungleCsBefore10Minutes": match.get('challenges', {}).get('jungleCsBefore10Minutes', 0),
-            "scuttleCrabKills": match.get('challenges', {}).get('scuttleCrabKills', 0),
-            "voidMonsterKill": match.get('challenges', {}).get('voidMonsterKill', 0),
-            "dragonKills": match.get('challenges', {}).get('dragonKills', 0),
-            "dragonTakedowns": match.get('challenges', {}).get('dragonTakedowns', 0),
-            "teamRiftHeraldKills" : match.get('challenges', {}).get('teamRiftHeraldKills', 0),
-            "teamElderDragonKills" : match.get('challenges', {}).get('teamElderDragonKills', 0),
-            "teamBaronKills" : match.get('challenges', {}).get('teamBaronKills', 0),
-            "moreEnemyJungleThanOpponent": match.get('challenges', {}).get('moreEnemyJungleThanOpponent', False),
-            "enemyJungleMonsterKills": match.get('challenges', {}).get('enemyJungleMonsterKills', 0),
-            "epicMonsterSteals": match.get('challenges', {}).get('epicMonsterSteals', 0),
-            "buffsStolen": match.get('challenges', {}).get('buffsStolen', 0),
+            "isJungler": match.team_position == 'JUNGLE',
+            "jungleCsBefore10Minutes": match.jungle_cs_before_10_minutes,
+            "scuttleCrabKills": match.scuttle_crab_kills,
+            "voidMonsterKill": match.void_monster_kill,
+            "dragonKills": match.dragon_kills,
+            "dragonTakedowns": match.dragon_takedowns,
+            "teamRiftHeraldKills" : match.team_rift_herald_kills,
+            "teamElderDragonKills" : match.team_elder_dragon_kills,
+            "teamBaronKills" : match.team_baron_kills,
+            "moreEnemyJungleThanOpponent": match.more_enemy_jungle_than_opponent,
+            "enemyJungleMonsterKills": match.enemy_jungle_monster_kills,
+            "epicMonsterSteals": match.epic_monster_steals,
+            "buffsStolen": match.buffs_stolen,
 
             #Support-specific stats (only relevant if position is UTILITY)
-            "isSupport": match.get('teamPosition', 'UNKNOWN') == 'UTILITY',
-            "controlWardsPlaced": match.get('challenges', {}).get('controlWardsPlaced', 0),
-            "stealthWardsPlaced": match.get('challenges', {}).get('stealthWardsPlaced', 0),
-            "visionScoreAdvantageLaneOpponent": match.get('challenges', {}).get('visionScoreAdvantageLaneOpponent', 0),
-            "visionScorePerMinute": match.get('challenges', {}).get('visionScorePerMinute', 0),
-            "fasterSupportQuestCompletion": match.get('challenges', {}).get('fasterSupportQuestCompletion', 0),
-            "wardTakedownsBefore20M": match.get('challenges', {}).get('wardTakedownsBefore20M', 0),
-            "wardsGuarded": match.get('challenges', {}).get('wardsGuarded', 0),
-        }
-        detailed_matches.append(detailed_match)
-    
-    # Aggregate statistics
-    wins = [m for m in detailed_matches if m['win']]
-    losses = [m for m in detailed_matches if not m['win']]
-    
-    # Calculate advanced metrics
-    context = {
-        "overview": {
-            "total_games": len(detailed_matches),
-            "wins": len(wins),
-            "losses": len(losses),
-            "win_rate": (len(wins) / len(detailed_matches)) * 100 if detailed_matches else 0,
-        },
-        
-        "combat_stats": {
-            "avg_kills": metrics['avg_kills'],
-            "avg_deaths": metrics['avg_deaths'],
-            "avg_assists": metrics['avg_assists'],
-            "avg_kda": metrics['avg_kda'],
-            "avg_damage_to_champs": sum(m['totalDamageDealtToChampions'] for m in detailed_matches) / len(detailed_matches),
-            "avg_damage_taken": sum(m['totalDamageTaken'] for m in detailed_matches) / len(detailed_matches),
-            "avg_damage_taken_percent": sum(m.get('challenges', {}).get('damageTakenOnTeamPercentage', 0) for m in detailed_matches) / len(detailed_matches) * 100,
-            "avg_damage_shielded": sum(m.get('challenges', {}).get('totalDamageShieldedOnTeammates', 0) for m in detailed_matches) / len(detailed_matches),
-            "avg_effective_heal_shield": sum(m.get('challenges', {}).get('effectiveHealAndShielding', 0) for m in detailed_matches) / len(detailed_matches),
-        },
+            "isSupport": match.team_position == 'UTILITY',
+            "controlWardsPlaced": match.control_wards_placed,
+            "stealthWardsPlaced": match.stealth_wards_placed,
+            "visionScoreAdvantageLaneOpponent": match.vision_score_advantage_lane_opponent,
+            "visionScorePerMinute": match.vision_score_per_minute,
+            "fasterSupportQuestCompletion": match.faster_support_quest_completion,
+            "wardTakedownsBefore20M": match.ward_takedowns_before_20m,
+            "wardsGuarded": match.wards_guarded,
+        })
+    return detailed_matches
 
-        "damage_efficiency": {
-            "avg_damage_per_minute": sum(m['damagePerMinute'] for m in detailed_matches) / len(detailed_matches),
-        },
-        "laner_performance": analyze_laner_stats(detailed_matches),
-        "jungle_performance": analyze_jungle_stats(detailed_matches),
-        "support_performance": analyze_support_stats(detailed_matches),
-        
-        "farming_economy": {
-            "avg_cs": sum(m['totalMinionsKilled'] for m in detailed_matches) / len(detailed_matches),
-            "avg_jungle_cs": sum(m['neutralMinionsKilled'] for m in detailed_matches) / len(detailed_matches),
-            "avg_gold": sum(m['goldEarned'] for m in detailed_matches) / len(detailed_matches),
-            "avg_cs_at_10": sum(m['laneMinionsFirst10Minutes'] for m in detailed_matches) / len(detailed_matches) if detailed_matches else 0,
-        },
-        
-        "vision_control": {
-            "avg_vision_score": sum(m['visionScore'] for m in detailed_matches) / len(detailed_matches),
-            "avg_wards_placed": sum(m['wardsPlaced'] for m in detailed_matches) / len(detailed_matches),
-            "avg_wards_killed": sum(m['wardsKilled'] for m in detailed_matches) / len(detailed_matches),
-        },
-        
-        "win_loss_comparison": {
-            "win_avg_cs": sum(m['totalMinionsKilled'] for m in wins) / len(wins) if wins else 0,
-            "loss_avg_cs": sum(m['totalMinionsKilled'] for m in losses) / len(losses) if losses else 0,
-            "win_avg_damage": sum(m['totalDamageDealtToChampions'] for m in wins) / len(wins) if wins else 0,
-            "loss_avg_damage": sum(m['totalDamageDealtToChampions'] for m in losses) / len(losses) if losses else 0,
-            "win_avg_vision": sum(m['visionScore'] for m in wins) / len(wins) if wins else 0,
-            "loss_avg_vision": sum(m['visionScore'] for m in losses) / len(losses) if losses else 0,
-        },
-        
-        "champion_pool": {
-            "unique_champions": metrics['unique_champions'],
-            "most_played": champ_insights.iloc[0]['Champion'] if len(champ_insights) > 0 else "Unknown",
-            "best_performer": {
-                "champion": champ_insights.iloc[0]['Champion'] if len(champ_insights) > 0 else "Unknown",
-                "kda": float(champ_insights.iloc[0]['Avg_KDA']) if len(champ_insights) > 0 else 0,
-                "win_rate": float(champ_insights.iloc[0]['Win_Rate']) if len(champ_insights) > 0 else 0,
-                "games": int(champ_insights.iloc[0]['Games']) if len(champ_insights) > 0 else 0,
-            }
-        },
-        
-        # Include last 5 matches with full detail for recency
-        "recent_matches": detailed_matches[-5:] if len(detailed_matches) >= 5 else detailed_matches,
-        
-        # All matches in simplified form (for pattern recognition)
-        "match_history": [{
-            "champion": m['champion'],
-            "win": m['win'],
-            "kda": f"{m['kills']}/{m['deaths']}/{m['assists']}",
-            "cs": m['totalMinionsKilled'],
-            "damage": m['totalDamageDealtToChampions'],
-            "vision": m['visionScore']
-        } for m in detailed_matches]
+
+def _overview(detailed_matches, wins, losses):
+    return {
+        "total_games": len(detailed_matches),
+        "wins": len(wins),
+        "losses": len(losses),
+        "win_rate": (len(wins) / len(detailed_matches)) * 100 if detailed_matches else 0,
     }
 
-    context.update({
-        'champion_details': build_champion_specific_context(raw_matches),
-        'early_game_analysis': analyze_early_game_patterns(raw_matches),
-        'early_game_jungle_analysis': calculate_jungle_early_game_stats(raw_matches),
-        'early_game_support_analysis': calculate_support_early_game_stats(raw_matches),
-        'damage_profile': analyze_damage_profile(raw_matches),
-        
-        'matchup_data': build_matchup_data(raw_matches),
-        'opponent_stats': build_opponent_analysis(raw_matches),
 
-        'role_analysis': analyze_role_distribution(raw_matches),
+def _combat_stats(records, metrics):
+    return {
+        "avg_kills": metrics['avg_kills'],
+        "avg_deaths": metrics['avg_deaths'],
+        "avg_assists": metrics['avg_assists'],
+        "avg_kda": metrics['avg_kda'],
+        "avg_damage_to_champs": sum(m.total_damage_dealt_to_champions for m in records) / len(records),
+        "avg_damage_taken": sum(m.total_damage_taken for m in records) / len(records),
+        "avg_damage_taken_percent": sum(m.damage_taken_on_team_percentage for m in records) / len(records) * 100,
+        "avg_damage_shielded": sum(m.total_damage_shielded_on_teammates for m in records) / len(records),
+        "avg_effective_heal_shield": sum(m.effective_heal_and_shielding for m in records) / len(records),
+    }
 
-        'role_consistency': calculate_role_consistency(raw_matches),
 
-        'objective_control_by_outcome': analyze_objective_control_by_outcome(raw_matches),
+def _farming_economy(detailed_matches):
+    return {
+        "avg_cs": sum(m['totalMinionsKilled'] for m in detailed_matches) / len(detailed_matches),
+        "avg_jungle_cs": sum(m['neutralMinionsKilled'] for m in detailed_matches) / len(detailed_matches),
+        "avg_gold": sum(m['goldEarned'] for m in detailed_matches) / len(detailed_matches),
+        "avg_cs_at_10": sum(m['laneMinionsFirst10Minutes'] for m in detailed_matches) / len(detailed_matches) if detailed_matches else 0,
+    }
 
-        # Objective control
-        'objective_control': {
-            'avg_dragon_participation': sum(m.get('challenges', {}).get('dragonTakedowns', 0) for m in raw_matches) / len(raw_matches),
-            'avg_baron_participation': sum(m.get('challenges', {}).get('baronTakedowns', 0) for m in raw_matches) / len(raw_matches),
-            'avg_herald_participation': sum(m.get('challenges', {}).get('riftHeraldTakedowns', 0) for m in raw_matches) / len(raw_matches),
-            'avg_turret_plates': sum(m.get('challenges', {}).get('turretPlatesTaken', 0) for m in raw_matches) / len(raw_matches),
-        },
-        
-        # Advanced combat metrics
-        'combat_efficiency': {
-            'avg_kill_participation': sum(m.get('challenges', {}).get('killParticipation', 0) for m in raw_matches) / len(raw_matches) * 100,
-            'avg_solo_kills': sum(m.get('challenges', {}).get('soloKills', 0) for m in raw_matches) / len(raw_matches),
-            'avg_damage_per_death': sum(m.get('totalDamageDealtToChampions', 0) / max(m.get('deaths', 1), 1) for m in raw_matches) / len(raw_matches),
-            'multi_kill_rate': sum(m.get('doubleKills', 0) + m.get('tripleKills', 0) + m.get('quadraKills', 0) + m.get('pentaKills', 0) for m in raw_matches) / len(raw_matches),
+
+def _vision_control(detailed_matches):
+    return {
+        "avg_vision_score": sum(m['visionScore'] for m in detailed_matches) / len(detailed_matches),
+        "avg_wards_placed": sum(m['wardsPlaced'] for m in detailed_matches) / len(detailed_matches),
+        "avg_wards_killed": sum(m['wardsKilled'] for m in detailed_matches) / len(detailed_matches),
+    }
+
+
+def _win_loss_comparison(wins, losses):
+    return {
+        "win_avg_cs": sum(m['totalMinionsKilled'] for m in wins) / len(wins) if wins else 0,
+        "loss_avg_cs": sum(m['totalMinionsKilled'] for m in losses) / len(losses) if losses else 0,
+        "win_avg_damage": sum(m['totalDamageDealtToChampions'] for m in wins) / len(wins) if wins else 0,
+        "loss_avg_damage": sum(m['totalDamageDealtToChampions'] for m in losses) / len(losses) if losses else 0,
+        "win_avg_vision": sum(m['visionScore'] for m in wins) / len(wins) if wins else 0,
+        "loss_avg_vision": sum(m['visionScore'] for m in losses) / len(losses) if losses else 0,
+    }
+
+
+def _champion_pool(metrics, champ_insights):
+    return {
+        "unique_champions": metrics['unique_champions'],
+        "most_played": champ_insights.iloc[0]['Champion'] if len(champ_insights) > 0 else "Unknown",
+        "best_performer": {
+            "champion": champ_insights.iloc[0]['Champion'] if len(champ_insights) > 0 else "Unknown",
+            "kda": float(champ_insights.iloc[0]['Avg_KDA']) if len(champ_insights) > 0 else 0,
+            "win_rate": float(champ_insights.iloc[0]['Win_Rate']) if len(champ_insights) > 0 else 0,
+            "games": int(champ_insights.iloc[0]['Games']) if len(champ_insights) > 0 else 0,
         }
-    })
+    }
+
 
+def _match_history(detailed_matches):
+    # All matches in simplified form (for pattern recognition)
+    return [{
+        "champion": m['champion'],
+        "win": m['win'],
+        "kda": f"{m['kills']}/{m['deaths']}/{m['assists']}",
+        "cs": m['totalMinionsKilled'],
+        "damage": m['totalDamageDealtToChampions'],
+        "vision": m['visionScore']
+    } for m in detailed_matches]
+
+
+def _objective_control(records):
+    return {
+        'avg_dragon_participation': sum(m.dragon_takedowns for m in records) / len(records),
+        'avg_baron_participation': sum(m.baron_takedowns for m in records) / len(records),
+        'avg_herald_participation': sum(m.rift_herald_takedowns for m in records) / len(records),
+        'avg_turret_plates': sum(m.turret_plates_taken for m in records) / len(records),
+    }
+
+
+def _combat_efficiency(records):
+    # Advanced combat metrics
+    return {
+        'avg_kill_participation': sum(m.kill_participation for m in records) / len(records) * 100,
+        'avg_solo_kills': sum(m.solo_kills for m in records) / len(records),
+        'avg_damage_per_death': sum(m.total_damage_dealt_to_champions / max(m.deaths, 1) for m in records) / len(records),
+        'multi_kill_rate': sum(m.double_kills + m.triple_kills + m.quadra_kills + m.penta_kills for m in records) / len(records),
+    }
+
+
+def build_rich_player_context(records: list, metrics: dict, champ_insights: pd.DataFrame) -> LazyContext:
+    #rich context
+    #structured context for raw data for the AI - a lazy mapping of sections (converted into json and injected into prompts)
+    #Nothing is computed here; each section is built and memoized the first time a tool, tab or prompt reads it
+    if not records or len(records) == 0:
+        return {}
 
-    return context
+    return LazyContext(RICH_CONTEXT_SECTIONS, {
+        '_records': records,
+        '_metrics': metrics,
+        '_champ_insights': champ_insights,
+    })
 
-def build_champion_specific_context(raw_matches: list) -> dict:
+def build_champion_specific_context(records: list) -> dict:
     champion_data = {}
     
-    for match in raw_matches:
-        champ = match.get('championName', 'Unknown')
+    for match in records:
+        champ = match.champion_name
         
         if champ not in champion_data:
             champion_data[champ] = {
@@ -222,19 +212,19 @@ def build_champion_specific_context(raw_matches: list) -> dict:
         
         cd = champion_data[champ]
         cd['games'] += 1
-        cd['wins'] += 1 if match.get('win') else 0
-        cd['total_damage'] += match.get('totalDamageDealtToChampions', 0)
-        cd['total_damage_taken'] += match.get('totalDamageTaken', 0)
-        cd['total_cs'] += match.get('totalMinionsKilled', 0)
-        cd['total_gold'] += match.get('goldEarned', 0)
-        cd['total_vision_score'] += match.get('visionScore', 0)
-        cd['cs_at_10_list'].append(match.get('challenges', {}).get('laneMinionsFirst10Minutes', 0))
-        cd['damage_to_objectives'] += match.get('damageDealtToObjectives', 0)
-        cd['epic_monster_kills'] += (match.get('dragonKills', 0) + match.get('baronKills', 0))
-        cd['epic_monster_participation'] += (match.get('dragonParticipation', 0) + match.get('dragonParticipation', 0))
+        cd['wins'] += 1 if match.win else 0
+        cd['total_damage'] += match.total_damage_dealt_to_champions
+        cd['total_damage_taken'] += match.total_damage_taken
+        cd['total_cs'] += match.total_minions_killed
+        cd['total_gold'] += match.gold_earned
+        cd['total_vision_score'] += match.vision_score
+        cd['cs_at_10_list'].append(match.lane_minions_first_10_minutes)
+        cd['damage_to_objectives'] += match.damage_dealt_to_objectives
+        cd['epic_monster_kills'] += (match.dragon_kills + match.baron_kills)
+        cd['epic_monster_participation'] += (match.dragon_takedowns + match.baron_takedowns)
         
         # Count early kills (approximate from takedownsFirstXMinutes)
-        cd['early_kills'] += match.get('challenges', {}).get('takedownsFirstXMinutes', 0)
+        cd['early_kills'] += match.takedowns_first_x_minutes
     
     # Calculate averages
     for champ, data in champion_data.items():
@@ -251,18 +241,18 @@ def build_champion_specific_context(raw_matches: list) -> dict:
     
     return champion_data
 
-def analyze_early_game_patterns(raw_matches: list) -> dict:
-    early_wins = [m for m in raw_matches if m.get('win')]
-    early_losses = [m for m in raw_matches if not m.get('win')]
+def analyze_early_game_patterns(records: list) -> dict:
+    early_wins = [m for m in records if m.win]
+    early_losses = [m for m in records if not m.win]
     
     def get_early_stats(matches):
         if not matches:
             return {}
         return {
-            'avg_cs_at_10': sum(m.get('challenges', {}).get('laneMinionsFirst10Minutes', 0) for m in matches) / len(matches),
-            'avg_gold_at_10': sum(m.get('challenges', {}).get('goldPerMinute', 0) * 10 for m in matches) / len(matches),
-            'first_blood_rate': sum(1 for m in matches if m.get('firstBloodKill') or m.get('firstBloodAssist')) / len(matches) * 100,
-            'early_deaths': sum(m.get('challenges', {}).get('deathsByEnemyChamps', 0) for m in matches if m.get('challenges', {}).get('gameLength', 999) < 600) / len(matches),
+            'avg_cs_at_10': sum(m.lane_minions_first_10_minutes for m in matches) / len(matches),
+            'avg_gold_at_10': sum(m.gold_per_minute * 10 for m in matches) / len(matches),
+            'first_blood_rate': sum(1 for m in matches if m.first_blood_kill or m.first_blood_assist) / len(matches) * 100,
+            'early_deaths': sum(m.deaths_by_enemy_champs for m in matches if (m.game_length or 999) < 600) / len(matches),
         }
     
     return {
@@ -270,46 +260,40 @@ def analyze_early_game_patterns(raw_matches: list) -> dict:
         'losses': get_early_stats(early_losses),
     }
 
-def analyze_damage_profile(raw_matches: list) -> dict:
-    total_physical = sum(m.get('physicalDamageDealtToChampions', 0) for m in raw_matches)
-    total_magic = sum(m.get('magicDamageDealtToChampions', 0) for m in raw_matches)
-    total_true = sum(m.get('trueDamageDealtToChampions', 0) for m in raw_matches)
+def analyze_damage_profile(records: list) -> dict:
+    total_physical = sum(m.physical_damage_dealt_to_champions for m in records)
+    total_magic = sum(m.magic_damage_dealt_to_champions for m in records)
+    total_true = sum(m.true_damage_dealt_to_champions for m in records)
     total_damage = total_physical + total_magic + total_true
     
     return {
         'physical_percent': (total_physical / total_damage * 100) if total_damage > 0 else 0,
         'magic_percent': (total_magic / total_damage * 100) if total_damage > 0 else 0,
         'true_percent': (total_true / total_damage * 100) if total_damage > 0 else 0,
-        'avg_damage_per_gold': total_damage / sum(m.get('goldEarned', 1) for m in raw_matches),
-        'avg_damage_share': sum(m.get('challenges', {}).get('teamDamagePercentage', 0) for m in raw_matches) / len(raw_matches) * 100,
+        'avg_damage_per_gold': total_damage / sum(m.gold_earned for m in records),
+        'avg_damage_share': sum(m.team_damage_percentage for m in records) / len(records) * 100,
     }
 
-def build_matchup_data(raw_matches: list) -> dict:
+def build_matchup_data(records: list) -> dict:
     matchups = {}
     
-    for match in raw_matches:
-        my_champion = match.get('championName', 'Unknown')
-        my_position = match.get('teamPosition', 'UNKNOWN')
-        my_team_id = match.get('teamId')
-        
-        # Find lane opponent (same position, different team)
-        participants = match.get('participants', [])  # You'll need to pass full match data
+    for match in records:
+        my_champion = match.champion_name
+        my_position = match.team_position
+        my_team_id = match.team_id
         
-        opponent = None
-        for p in participants:
-            if p.get('teamPosition') == my_position and p.get('teamId') != my_team_id:
-                opponent = p
-                break
+        # Lane opponent (same position, different team) is resolved when the record is built
+        opponent = match.opponent
         
         if not opponent:
             continue
         
-        matchup_key = f"{my_champion}_vs_{opponent.get('championName')}"
+        matchup_key = f"{my_champion}_vs_{opponent.champion_name}"
         
         if matchup_key not in matchups:
             matchups[matchup_key] = {
                 'my_champion': my_champion,
-                'opponent': opponent.get('championName'),
+                'opponent': opponent.champion_name,
                 'role': my_position,  
                 'games': 0,
                 'wins': 0,
@@ -331,39 +315,39 @@ def build_matchup_data(raw_matches: list) -> dict:
         
         m = matchups[matchup_key]
         m['games'] += 1
-        m['wins'] += 1 if match.get('win') else 0
-        m['total_kills'] += match.get('kills', 0)
-        m['total_deaths'] += match.get('deaths', 0)
-        m['total_assists'] += match.get('assists', 0)
-        m['total_cs'] += match.get('totalMinionsKilled', 0)
-        m['total_damage'] += match.get('totalDamageDealtToChampions', 0)
-        m['total_dpm'] += match.get('challenges', {}).get('damagePerMinute', 0)  # NEW
+        m['wins'] += 1 if match.win else 0
+        m['total_kills'] += match.kills
+        m['total_deaths'] += match.deaths
+        m['total_assists'] += match.assists
+        m['total_cs'] += match.total_minions_killed
+        m['total_damage'] += match.total_damage_dealt_to_champions
+        m['total_dpm'] += match.damage_per_minute  # NEW
         
         # Laner stats
         cs_adv_at_10 = (
-            match.get('challenges', {}).get('laneMinionsFirst10Minutes', 0) -
-            opponent.get('challenges', {}).get('laneMinionsFirst10Minutes', 0)
+            match.lane_minions_first_10_minutes -
+            opponent.lane_minions_first_10_minutes
         )
         m['cs_diff_at_10'].append(cs_adv_at_10)
         
         # Jungle-specific stats
         if my_position == 'JUNGLE':
-            my_jungle_cs = match.get('challenges', {}).get('jungleCsBefore10Minutes', 0)
-            opp_jungle_cs = opponent.get('challenges', {}).get('jungleCsBefore10Minutes', 0)
+            my_jungle_cs = match.jungle_cs_before_10_minutes
+            opp_jungle_cs = opponent.jungle_cs_before_10_minutes
             m['jungle_cs_at_10'].append(my_jungle_cs - opp_jungle_cs)
             
-            m['total_epic_monsters'] += (match.get('challenges', {}).get('dragonTakedowns', 0) + 
-                                         match.get('challenges', {}).get('baronTakedowns', 0))
-            m['total_scuttles'] += match.get('challenges', {}).get('scuttleCrabKills', 0)
+            m['total_epic_monsters'] += (match.dragon_takedowns + 
+                                         match.baron_takedowns)
+            m['total_scuttles'] += match.scuttle_crab_kills
         
         # Support-specific stats
         if my_position == 'UTILITY':
-            my_vision = match.get('visionScore', 0)
-            game_length_min = match.get('challenges', {}).get('gameLength', 1800) / 60
+            my_vision = match.vision_score
+            game_length_min = (match.game_length or 1800) / 60
             vision_at_10 = (my_vision / game_length_min) * 10 if game_length_min > 0 else 0
             m['vision_score_at_10'].append(vision_at_10)
             
-            m['total_heal_shield'] += match.get('challenges', {}).get('effectiveHealAndShielding', 0)
+            m['total_heal_shield'] += match.effective_heal_and_shielding
     
     # Calculate averages
     for key, data in matchups.items():
@@ -395,23 +379,13 @@ def build_matchup_data(raw_matches: list) -> dict:
     
     return matchups
 
-def build_opponent_analysis(raw_matches: list) -> dict:
+def build_opponent_analysis(records: list) -> dict:
     opponent_stats = {}
     
-    for match in raw_matches:
-        my_position = match.get('teamPosition', 'UNKNOWN')
-        my_team_id = match.get('teamId')
-        
-        participants = match.get('participants', [])
-        
-        opponent = None
-        for p in participants:
-            if p.get('teamPosition') == my_position and p.get('teamId') != my_team_id:
-                opponent = p.get('championName')
-                break
-        
-        if not opponent:
+    for match in records:
+        if not match.opponent:
             continue
+        opponent = match.opponent.champion_name
         
         if opponent not in opponent_stats:
             opponent_stats[opponent] = {
@@ -422,8 +396,8 @@ def build_opponent_analysis(raw_matches: list) -> dict:
         
         opp = opponent_stats[opponent]
         opp['games'] += 1
-        opp['wins'] += 1 if match.get('win') else 0
-        kda = (match.get('kills', 0) + match.get('assists', 0)) / max(match.get('deaths', 1), 1)
+        opp['wins'] += 1 if match.win else 0
+        kda = (match.kills + match.assists) / max(match.deaths, 1)
         opp['total_kda'] += kda
     
     # Calculate averages
@@ -433,11 +407,11 @@ def build_opponent_analysis(raw_matches: list) -> dict:
     
     return opponent_stats
 
-def analyze_role_distribution(raw_matches: list) -> dict:
+def analyze_role_distribution(records: list) -> dict:
     role_stats = {}
     
-    for match in raw_matches:
-        role = match.get('teamPosition', 'UNKNOWN')
+    for match in records:
+        role = match.team_position
         
         if role not in role_stats:
             role_stats[role] = {
@@ -450,12 +424,12 @@ def analyze_role_distribution(raw_matches: list) -> dict:
         
         rs = role_stats[role]
         rs['games'] += 1
-        rs['wins'] += 1 if match.get('win') else 0
+        rs['wins'] += 1 if match.win else 0
         
-        kda = (match.get('kills', 0) + match.get('assists', 0)) / max(match.get('deaths', 1), 1)
+        kda = (match.kills + match.assists) / max(match.deaths, 1)
         rs['total_kda_sum'] += kda
-        rs['total_cs'] += match.get('totalMinionsKilled', 0)
-        rs['total_damage'] += match.get('totalDamageDealtToChampions', 0)
+        rs['total_cs'] += match.total_minions_killed
+        rs['total_damage'] += match.total_damage_dealt_to_champions
     
     # Calculate averages and determine primary role
     primary_role = None
@@ -467,7 +441,7 @@ def analyze_role_distribution(raw_matches: list) -> dict:
         data['avg_kda'] = data['total_kda_sum'] / games
         data['avg_cs'] = data['total_cs'] / games
         data['avg_damage'] = data['total_damage'] / games
-        data['play_rate'] = (games / len(raw_matches)) * 100
+        data['play_rate'] = (games / len(records)) * 100
         
         if games > max_games:
             max_games = games
@@ -477,22 +451,22 @@ def analyze_role_distribution(raw_matches: list) -> dict:
         'role_breakdown': role_stats,
         'primary_role': primary_role,
         'primary_role_games': max_games,
-        'total_games': len(raw_matches),
+        'total_games': len(records),
     }
 
-def calculate_role_consistency(raw_matches: list) -> dict:
+def calculate_role_consistency(records: list) -> dict:
     #Calculate player's most played roles and consistency in sticking to them.
     
     role_counts = {}
     
-    for match in raw_matches:
-        role = match.get('teamPosition', 'UNKNOWN')
+    for match in records:
+        role = match.team_position
         role_counts[role] = role_counts.get(role, 0) + 1
     
     # Sort by frequency
     sorted_roles = sorted(role_counts.items(), key=lambda x: x[1], reverse=True)
     
-    total_games = len(raw_matches)
+    total_games = len(records)
     
     # Get top 2 roles
     primary_role = sorted_roles[0] if len(sorted_roles) > 0 else ('UNKNOWN', 0)
@@ -519,8 +493,8 @@ def calculate_role_consistency(raw_matches: list) -> dict:
         'role_diversity': len([r for r in role_counts.values() if r > 0]),
     }
 
-def analyze_laner_stats(detailed_matches:list) -> dict:
-    laner_matches = [m for m in detailed_matches if m.get('isLaner', False)]
+def analyze_laner_stats(records: list) -> dict:
+    laner_matches = [m for m in records if m.is_laner]
 
     if not laner_matches:
         return {
@@ -530,61 +504,43 @@ def analyze_laner_stats(detailed_matches:list) -> dict:
     
     num_laner_games = len(laner_matches)
 
-    # Calculate CS diff at 10 for each laner match
-    cs_diffs_at_10 = []
-    for match in laner_matches:
-        # Getting opponent
-        my_position = match.get('position')  # Using 'position' from detailed_matches
-        my_team_id = match.get('teamId')
-        participants = match.get('participants', [])
-        
-        opponent = None
-        for p in participants:
-            if p.get('teamPosition') == my_position and p.get('teamId') != my_team_id:
-                opponent = p
-                break
-        
-        if not opponent:
-            continue
-        
-        # Getting CS diff at 10
-        cs_diff_at_10 = (
-            match.get('laneMinionsFirst10Minutes', 0) -
-            opponent.get('challenges', {}).get('laneMinionsFirst10Minutes', 0)
-        )
-        cs_diffs_at_10.append(cs_diff_at_10)
+    # CS diff at 10 against the lane opponent resolved when the record was built
+    cs_diffs_at_10 = [
+        m.lane_minions_first_10_minutes - m.opponent.lane_minions_first_10_minutes
+        for m in laner_matches if m.opponent
+    ]
 
     return {
         'total_laner_games': num_laner_games,
         'has_laner_data': True,
         
         # Early laning phase (first 10 minutes)
-        'avg_cs_at_10': sum(m['laneMinionsFirst10Minutes'] for m in laner_matches) / num_laner_games,
+        'avg_cs_at_10': sum(m.lane_minions_first_10_minutes for m in laner_matches) / num_laner_games,
         'avg_cs_diff_at_10': sum(cs_diffs_at_10) / len(cs_diffs_at_10) if cs_diffs_at_10 else 0,
         
         # Lane dominance
-        'avg_max_cs_advantage': sum(m['maxCsAdvantageOnLaneOpponent'] for m in laner_matches) / num_laner_games,
-        'avg_solo_kills': sum(m['soloKills'] for m in laner_matches) / num_laner_games,
-        'avg_turret_plates': sum(m['turretPlatesTaken'] for m in laner_matches) / num_laner_games,
+        'avg_max_cs_advantage': sum(m.max_cs_advantage_on_lane_opponent for m in laner_matches) / num_laner_games,
+        'avg_solo_kills': sum(m.solo_kills for m in laner_matches) / num_laner_games,
+        'avg_turret_plates': sum(m.turret_plates_taken for m in laner_matches) / num_laner_games,
         
         # Overall farming efficiency
-        'avg_total_cs': sum(m['totalMinionsKilled'] for m in laner_matches) / num_laner_games,
-        'avg_cs_per_minute': sum(m['totalMinionsKilled'] / max(m['gameDuration'] / 60, 1) for m in laner_matches) / num_laner_games,
+        'avg_total_cs': sum(m.total_minions_killed for m in laner_matches) / num_laner_games,
+        'avg_cs_per_minute': sum(m.total_minions_killed / max(m.game_length / 60, 1) for m in laner_matches) / num_laner_games,
         
         # Combat effectiveness
-        'avg_kill_participation': sum(m['killParticipation'] for m in laner_matches) / num_laner_games * 100,
-        'avg_damage_per_minute': sum(m['damagePerMinute'] for m in laner_matches) / num_laner_games,
-        'avg_damage_to_champions': sum(m['totalDamageDealtToChampions'] for m in laner_matches) / num_laner_games,
+        'avg_kill_participation': sum(m.kill_participation for m in laner_matches) / num_laner_games * 100,
+        'avg_damage_per_minute': sum(m.damage_per_minute for m in laner_matches) / num_laner_games,
+        'avg_damage_to_champions': sum(m.total_damage_dealt_to_champions for m in laner_matches) / num_laner_games,
         
         # Tanking/Durability
-        'avg_damage_taken': sum(m['totalDamageTaken'] for m in laner_matches) / num_laner_games,
-        'avg_damage_taken_percent': sum(m['damageTakenOnTeamPercentage'] for m in laner_matches) / num_laner_games * 100,
+        'avg_damage_taken': sum(m.total_damage_taken for m in laner_matches) / num_laner_games,
+        'avg_damage_taken_percent': sum(m.damage_taken_on_team_percentage for m in laner_matches) / num_laner_games * 100,
         
         # Position breakdown
         'position_distribution': {
-            'TOP': sum(1 for m in laner_matches if m['position'] == 'TOP'),
-            'MIDDLE': sum(1 for m in laner_matches if m['position'] == 'MID'),
-            'BOTTOM': sum(1 for m in laner_matches if m['position'] == 'BOTTOM'),
+            'TOP': sum(1 for m in laner_matches if m.team_position == 'TOP'),
+            'MIDDLE': sum(1 for m in laner_matches if m.team_position == 'MIDDLE'),
+            'BOTTOM': sum(1 for m in laner_matches if m.team_position == 'BOTTOM'),
         },
     }
 
@@ -663,24 +619,24 @@ def analyze_support_stats(detailed_matches: list) -> dict:
         'avg_heal_and_shielding': sum(m['effectiveHealAndShielding'] for m in support_matches) / num_support_games,
     }
 
-def analyze_objective_control_by_outcome(raw_matches: list) -> dict:
+def analyze_objective_control_by_outcome(records: list) -> dict:
     #objective control in wins vs losses
-    wins = [m for m in raw_matches if m.get('win')]
-    losses = [m for m in raw_matches if not m.get('win')]
+    wins = [m for m in records if m.win]
+    losses = [m for m in records if not m.win]
     
     def get_objective_stats(matches):
         if not matches:
             return {}
         
         return {
-            'avg_dragon_participation': sum(m.get('challenges', {}).get('dragonTakedowns', 0) for m in matches) / len(matches),
-            'avg_baron_participation': sum(m.get('challenges', {}).get('baronTakedowns', 0) for m in matches) / len(matches),
-            'avg_heralds': sum(m.get('challenges', {}).get('riftHeraldTakedowns', 0) for m in matches) / len(matches),
-            'avg_turret_plates': sum(m.get('challenges', {}).get('turretPlatesTaken', 0) for m in matches) / len(matches),
-            'avg_turret_kills': sum(m.get('turretKills', 0) for m in matches) / len(matches),
-            'avg_turret_takedowns': sum(m.get('turretTakedowns', 0) for m in matches) / len(matches),
-            'avg_damage_to_objectives': sum(m.get('damageDealtToObjectives', 0) for m in matches) / len(matches),
-            'first_turret_rate': sum(1 for m in matches if m.get('firstTowerKill') or m.get('firstTowerAssist')) / len(matches) * 100,
+            'avg_dragon_participation': sum(m.dragon_takedowns for m in matches) / len(matches),
+            'avg_baron_participation': sum(m.baron_takedowns for m in matches) / len(matches),
+            'avg_heralds': sum(m.rift_herald_takedowns for m in matches) / len(matches),
+            'avg_turret_plates': sum(m.turret_plates_taken for m in matches) / len(matches),
+            'avg_turret_kills': sum(m.turret_kills for m in matches) / len(matches),
+            'avg_turret_takedowns': sum(m.turret_takedowns for m in matches) / len(matches),
+            'avg_damage_to_objectives': sum(m.damage_dealt_to_objectives for m in matches) / len(matches),
+            'first_turret_rate': sum(1 for m in matches if m.first_tower_kill or m.first_tower_assist) / len(matches) * 100,
         }
     
     win_stats = get_objective_stats(wins)
@@ -700,6 +656,50 @@ def analyze_objective_control_by_outcome(raw_matches: list) -> dict:
         'loss_games_count': len(losses),
     }
 
-def format_context_for_prompt(context: dict) -> str:
-    #Converts the rich context dict into a clean, readable format for AI prompts
-    return json.dumps(context, indent=2)
\ No newline at end of file
+
+# section name -> (dependencies, function). '_' names are shared intermediates / inputs and
+# are not part of the context itself. Sections are only built when something reads them.
+RICH_CONTEXT_SECTIONS = {
+    '_detailed_matches': (('_records',), _detailed_matches),
+    '_wins': (('_detailed_matches',), lambda detailed: [m for m in detailed if m['win']]),
+    '_losses': (('_detailed_matches',), lambda detailed: [m for m in detailed if not m['win']]),
+
+    'overview': (('_detailed_matches', '_wins', '_losses'), _overview),
+    'combat_stats': (('_records', '_metrics'), _combat_stats),
+    'damage_efficiency': (
+        ('_detailed_matches',),
+        lambda detailed: {"avg_damage_per_minute": sum(m['damagePerMinute'] for m in detailed) / len(detailed)},
+    ),
+    'laner_performance': (('_records',), analyze_laner_stats),
+    'jungle_performance': (('_detailed_matches',), analyze_jungle_stats),
+    'support_performance': (('_detailed_matches',), analyze_support_stats),
+    'farming_economy': (('_detailed_matches',), _farming_economy),
+    'vision_control': (('_detailed_matches',), _vision_control),
+    'win_loss_comparison': (('_wins', '_losses'), _win_loss_comparison),
+    'performance_trends': (('_metrics',), lambda metrics: metrics.get('trend_summary', {})),
+    'session_analysis': (('_metrics',), lambda metrics: metrics.get('session_summary', {})),
+    'champion_pool': (('_metrics', '_champ_insights'), _champion_pool),
+    # Last 5 matches with full detail for recency
+    'recent_matches': (('_detailed_matches',), lambda detailed: detailed[-5:]),
+    'match_history': (('_detailed_matches',), _match_history),
+
+    'champion_details': (('_records',), build_champion_specific_context),
+    'early_game_analysis': (('_records',), analyze_early_game_patterns),
+    'early_game_jungle_analysis': (('_records',), calculate_jungle_early_game_stats),
+    'early_game_support_analysis': (('_records',), calculate_support_early_game_stats),
+    'damage_profile': (('_records',), analyze_damage_profile),
+    'matchup_data': (('_records',), build_matchup_data),
+    'opponent_stats': (('_records',), build_opponent_analysis),
+    'role_analysis': (('_records',), analyze_role_distribution),
+    'role_consistency': (('_records',), calculate_role_consistency),
+    'objective_control_by_outcome': (('_records',), analyze_objective_control_by_outcome),
+    'objective_control': (('_records',), _objective_control),
+    'combat_efficiency': (('_records',), _combat_efficiency),
+}
+
+
+def format_context_for_prompt(context: dict, token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET) -> str:
+    #Converts the rich context into compact JSON for AI prompts, kept within token_budget
+    #(most relevant sections first; lazy sections past the budget are never built)
+    text, _ = serialize_for_prompt(context, token_budget)
+    return text
\ No newline at end of file
@@ -0,0 +1,36 @@
+from data.metric_graph import MetricGraph
+
+
+class LazyContext(MetricGraph):
+    #Rich context as a read-mostly mapping of sections, each built on first access.
+    #Nodes and inputs whose name starts with '_' are intermediate values: they are shared
+    #between sections but never listed, so iteration/JSON only shows real context sections.
+    #Sections can also be assigned directly (e.g. population percentiles added afterwards).
+    #Like MetricGraph it can be read from several threads (tools, prefetch jobs, other sessions).
+
+    def __init__(self, nodes: dict, inputs: dict = None):
+        super().__init__(nodes, inputs)
+        self._extra = []
+
+    def __setitem__(self, name, value):
+        with self._lock:
+            if name not in self._nodes and name not in self._extra:
+                self._extra.append(name)
+            self._values[name] = value
+
+    def __contains__(self, name):
+        return not str(name).startswith('_') and (name in self._nodes or name in self._extra)
+
+    def __iter__(self):
+        # Section order follows the node table, so dumps look like the old eager dict
+        for name in self._nodes:
+            if not name.startswith('_'):
+                yield name
+        yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> dict:
+        #Materialize every section (used when the whole context is serialized)
+        return {name: self[name] for name in self}
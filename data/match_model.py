@@ -0,0 +1,229 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+LANER_ROLES = ('TOP', 'MIDDLE', 'BOTTOM')
+
+
+@dataclass(slots=True)
+class LaneOpponent:
+    #The enemy player in the same position, resolved once when the record is built
+    champion_name: str = 'Unknown'
+    lane_minions_first_10_minutes: float = 0
+    jungle_cs_before_10_minutes: float = 0
+
+
+@dataclass(slots=True)
+class MatchRecord:
+    #Flat, typed view of one participant's stats in one match.
+    #Built once per match from the Riot participant dict; every default (including a missing
+    #'challenges' block) is resolved here so hot loops read plain attributes.
+
+    # Identity
+    match_id: str = ''
+    puuid: str = ''
+    queue_id: int = 0
+    champion_name: str = 'Unknown'
+    team_position: str = 'UNKNOWN'
+    team_id: int = 0
+    win: bool = False
+    game_start_timestamp: int = 0
+    game_end_timestamp: int = 0
+
+    # KDA
+    kills: int = 0
+    deaths: int = 0
+    assists: int = 0
+    double_kills: int = 0
+    triple_kills: int = 0
+    quadra_kills: int = 0
+    penta_kills: int = 0
+    first_blood_kill: bool = False
+    first_blood_assist: bool = False
+
+    # Farm & economy
+    total_minions_killed: int = 0
+    neutral_minions_killed: int = 0
+    gold_earned: int = 0
+
+    # Damage dealt / taken
+    total_damage_dealt_to_champions: int = 0
+    physical_damage_dealt_to_champions: int = 0
+    magic_damage_dealt_to_champions: int = 0
+    true_damage_dealt_to_champions: int = 0
+    total_damage_taken: int = 0
+    damage_dealt_to_objectives: int = 0
+
+    # Vision
+    vision_score: int = 0
+    wards_placed: int = 0
+    ward_takedowns: int = 0
+
+    # Objectives (top level)
+    dragon_kills: int = 0
+    baron_kills: int = 0
+    turret_kills: int = 0
+    turret_takedowns: int = 0
+    first_tower_kill: bool = False
+    first_tower_assist: bool = False
+
+    # challenges
+    game_length: float = 0
+    kda: float = 0
+    gold_per_minute: float = 0
+    damage_per_minute: float = 0
+    team_damage_percentage: float = 0
+    damage_taken_on_team_percentage: float = 0
+    total_damage_shielded_on_teammates: float = 0
+    effective_heal_and_shielding: float = 0
+    kill_participation: float = 0
+    takedowns_first_x_minutes: float = 0
+    deaths_by_enemy_champs: float = 0
+    solo_kills: float = 0
+    lane_minions_first_10_minutes: float = 0
+    max_cs_advantage_on_lane_opponent: float = 0
+    turret_plates_taken: float = 0
+    jungle_cs_before_10_minutes: float = 0
+    scuttle_crab_kills: float = 0
+    void_monster_kill: float = 0
+    dragon_takedowns: float = 0
+    baron_takedowns: float = 0
+    rift_herald_takedowns: float = 0
+    team_rift_herald_kills: float = 0
+    team_elder_dragon_kills: float = 0
+    team_baron_kills: float = 0
+    enemy_jungle_monster_kills: float = 0
+    buffs_stolen: float = 0
+    epic_monster_steals: float = 0
+    more_enemy_jungle_than_opponent: bool = False
+    control_wards_placed: float = 0
+    stealth_wards_placed: float = 0
+    vision_score_per_minute: float = 0
+    vision_score_advantage_lane_opponent: float = 0
+    ward_takedowns_before_20m: float = 0
+    wards_guarded: float = 0
+    faster_support_quest_completion: float = 0
+
+    # Lane opponent (None if no enemy shares the position)
+    opponent: Optional[LaneOpponent] = None
+
+    @property
+    def is_laner(self) -> bool:
+        return self.team_position in LANER_ROLES
+
+    @classmethod
+    def from_participant(cls, m: dict) -> 'MatchRecord':
+        c = m.get('challenges') or {}
+        team_position = m.get('teamPosition', 'UNKNOWN')
+        team_id = m.get('teamId')
+
+        opponent = None
+        for p in m.get('participants', []):
+            if p.get('teamPosition') == team_position and p.get('teamId') != team_id:
+                opp_c = p.get('challenges') or {}
+                opponent = LaneOpponent(
+                    champion_name=p.get('championName', 'Unknown'),
+                    lane_minions_first_10_minutes=opp_c.get('laneMinionsFirst10Minutes', 0),
+                    jungle_cs_before_10_minutes=opp_c.get('jungleCsBefore10Minutes', 0),
+                )
+                break
+
+        return cls(
+            match_id=m.get('matchId', ''),
+            puuid=m.get('puuid', ''),
+            queue_id=m.get('queueId', 0),
+            champion_name=m.get('championName', 'Unknown'),
+            team_position=team_position,
+            team_id=team_id or 0,
+            win=bool(m.get('win', False)),
+            game_start_timestamp=m.get('gameStartTimestamp', 0),
+            game_end_timestamp=m.get('gameEndTimestamp', 0),
+
+            kills=m.get('kills', 0),
+            deaths=m.get('deaths', 0),
+            assists=m.get('assists', 0),
+            double_kills=m.get('doubleKills', 0),
+            triple_kills=m.get('tripleKills', 0),
+            quadra_kills=m.get('quadraKills', 0),
+            penta_kills=m.get('pentaKills', 0),
+            first_blood_kill=bool(m.get('firstBloodKill')),
+            first_blood_assist=bool(m.get('firstBloodAssist')),
+
+            total_minions_killed=m.get('totalMinionsKilled', 0),
+            neutral_minions_killed=m.get('neutralMinionsKilled', 0),
+            gold_earned=m.get('goldEarned', 0),
+
+            total_damage_dealt_to_champions=m.get('totalDamageDealtToChampions', 0),
+            physical_damage_dealt_to_champions=m.get('physicalDamageDealtToChampions', 0),
+            magic_damage_dealt_to_champions=m.get('magicDamageDealtToChampions', 0),
+            true_damage_dealt_to_champions=m.get('trueDamageDealtToChampions', 0),
+            total_damage_taken=m.get('totalDamageTaken', 0),
+            damage_dealt_to_objectives=m.get('damageDealtToObjectives', 0),
+
+            vision_score=m.get('visionScore', 0),
+            wards_placed=m.get('wardsPlaced', 0),
+            ward_takedowns=m.get('wardTakedowns', 0),
+
+            dragon_kills=m.get('dragonKills', 0),
+            baron_kills=m.get('baronKills', 0),
+            turret_kills=m.get('turretKills', 0),
+            turret_takedowns=m.get('turretTakedowns', 0),
+            first_tower_kill=bool(m.get('firstTowerKill')),
+            first_tower_assist=bool(m.get('firstTowerAssist')),
+
+            game_length=c.get('gameLength', 0),
+            kda=c.get('kda', 0),
+            gold_per_minute=c.get('goldPerMinute', 0),
+            damage_per_minute=c.get('damagePerMinute', 0),
+            team_damage_percentage=c.get('teamDamagePercentage', 0),
+            damage_taken_on_team_percentage=c.get('damageTakenOnTeamPercentage', 0),
+            total_damage_shielded_on_teammates=c.get('totalDamageShieldedOnTeammates', 0),
+            effective_heal_and_shielding=c.get('effectiveHealAndShielding', 0),
+            kill_participation=c.get('killParticipation', 0),
+            takedowns_first_x_minutes=c.get('takedownsFirstXMinutes', 0),
+            deaths_by_enemy_champs=c.get('deathsByEnemyChamps', 0),
+            solo_kills=c.get('soloKills', 0),
+            lane_minions_first_10_minutes=c.get('laneMinionsFirst10Minutes', 0),
+            max_cs_advantage_on_lane_opponent=c.get('maxCsAdvantageOnLaneOpponent', 0),
+            turret_plates_taken=c.get('turretPlatesTaken', 0),
+            jungle_cs_before_10_minutes=c.get('jungleCsBefore10Minutes', 0),
+            scuttle_crab_kills=c.get('scuttleCrabKills', 0),
+            void_monster_kill=c.get('voidMonsterKill', 0),
+            dragon_takedowns=c.get('dragonTakedowns', 0),
+            baron_takedowns=c.get('baronTakedowns', 0),
+            rift_herald_takedowns=c.get('riftHeraldTakedowns', 0),
+            team_rift_herald_kills=c.get('teamRiftHeraldKills', 0),
+            team_elder_dragon_kills=c.get('teamElderDragonKills', 0),
+            team_baron_kills=c.get('teamBaronKills', 0),
+            enemy_jungle_monster_kills=c.get('enemyJungleMonsterKills', 0),
+            buffs_stolen=c.get('buffsStolen', 0),
+            epic_monster_steals=c.get('epicMonsterSteals', 0),
+            more_enemy_jungle_than_opponent=bool(c.get('moreEnemyJungleThanOpponent', False)),
+            control_wards_placed=c.get('controlWardsPlaced', 0),
+            stealth_wards_placed=c.get('stealthWardsPlaced', 0),
+            vision_score_per_minute=c.get('visionScorePerMinute', 0),
+            vision_score_advantage_lane_opponent=c.get('visionScoreAdvantageLaneOpponent', 0),
+            ward_takedowns_before_20m=c.get('wardTakedownsBefore20M', 0),
+            wards_guarded=c.get('wardsGuarded', 0),
+            faster_support_quest_completion=c.get('fasterSupportQuestCompletion', 0),
+
+            opponent=opponent,
+        )
+
+
+def build_match_records(raw_matches: list, cache: dict = None) -> list:
+    #Convert participant dicts to MatchRecords. With a cache (matchId -> record) every match
+    #is converted only once, even when it appears in several queue filters.
+    if cache is None:
+        return [MatchRecord.from_participant(m) for m in raw_matches]
+
+    records = []
+    for m in raw_matches:
+        match_id = m.get('matchId')
+        record = cache.get(match_id) if match_id else None
+        if record is None:
+            record = MatchRecord.from_participant(m)
+            if match_id:
+                cache[match_id] = record
+        records.append(record)
+    return records
@@ -0,0 +1,86 @@
+import threading
+from collections.abc import Mapping
+
+
+class MetricGraph(Mapping):
+    #Dependency graph of metric nodes, evaluated lazily and memoized.
+    #nodes maps name -> (dependency names, function); the function receives the dependency
+    #values positionally. Reading graph['name'] computes that node (and only its dependencies)
+    #the first time and returns the stored result afterwards.
+    #Safe to share between threads: each node is computed once, by whichever thread reads it first.
+
+    def __init__(self, nodes: dict, inputs: dict = None):
+        self._nodes = nodes
+        self._values = dict(inputs or {})
+        # Held while computing and memoizing; reentrant because a node reads its dependencies
+        self._lock = threading.RLock()
+        # Nodes being computed, per thread (another thread's in-progress node is not a cycle)
+        self._local = threading.local()
+        # key -> callback(name, value), run once for every node this graph computes
+        self._watchers = {}
+
+    def _evaluating(self) -> set:
+        evaluating = getattr(self._local, 'evaluating', None)
+        if evaluating is None:
+            evaluating = self._local.evaluating = set()
+        return evaluating
+
+    def __getitem__(self, name):
+        # Reading a memoized value needs no lock
+        if name in self._values:
+            return self._values[name]
+        if name not in self._nodes:
+            raise KeyError(name)
+
+        with self._lock:
+            # Another thread may have computed it while this one waited
+            if name in self._values:
+                return self._values[name]
+            evaluating = self._evaluating()
+            if name in evaluating:
+                raise ValueError(f"Metric dependency cycle at '{name}'")
+
+            deps, fn = self._nodes[name]
+            evaluating.add(name)
+            try:
+                value = fn(*(self[dep] for dep in deps))
+            finally:
+                evaluating.discard(name)
+
+            self._values[name] = value
+        # Outside the lock, so a watcher never holds up readers of this graph
+        for callback in list(self._watchers.values()):
+            callback(name, value)
+        return value
+
+    def __contains__(self, name):
+        # Membership must not trigger evaluation
+        return name in self._values or name in self._nodes
+
+    def __iter__(self):
+        # Snapshot, since other threads may memoize nodes meanwhile
+        yield from list(self._values)
+        for name in self._nodes:
+            if name not in self._values:
+                yield name
+
+    def __len__(self):
+        return len(set(self._values) | set(self._nodes))
+
+    def is_computed(self, name) -> bool:
+        return name in self._values and name in self._nodes
+
+    def computed_nodes(self) -> list:
+        return [name for name in self._nodes if name in self._values]
+
+    def memoized_values(self) -> list:
+        #Inputs and every value computed so far (what the graph currently holds in memory)
+        return list(self._values.values())
+
+    def watch(self, key, callback):
+        #Call callback(name, value) whenever a node is computed; a key replaces its earlier callback
+        self._watchers[key] = callback
+
+    def pull(self, *names) -> tuple:
+        #Evaluate several nodes at once, e.g. df, metrics = graph.pull('df', 'metrics')
+        return tuple(self[name] for name in names)
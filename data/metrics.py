@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 
+from data.population import population_baseline
+from data.playstyle_rules import build_tag_features, evaluate_tag_rules
+
 def calculate_advanced_metrics(df):
     metrics = {}
     
@@ -196,11 +199,11 @@ def get_improvement_suggestions(metrics, df):
     
     return suggestions
 
-def calculate_early_late_game_stats(df, raw_matches):
+def calculate_early_late_game_stats(df, records):
     #Calculate laner-specific early game performance (wins vs losses)
     
     # Filter for laner matches only
-    laner_matches = [m for m in raw_matches if m.get('teamPosition', 'UNKNOWN') in ['TOP', 'MIDDLE', 'BOTTOM']]
+    laner_matches = [m for m in records if m.team_position in ['TOP', 'MIDDLE', 'BOTTOM']]
     
     if not laner_matches:
         return {
@@ -212,21 +215,21 @@ def calculate_early_late_game_stats(df, raw_matches):
             'early_kills_diff': 0,
         }
     
-    wins = [m for m in laner_matches if m.get('win')]
-    losses = [m for m in laner_matches if not m.get('win')]
+    wins = [m for m in laner_matches if m.win]
+    losses = [m for m in laner_matches if not m.win]
     
     def get_early_late_stats(matches):
         if not matches:
             return {}
         
         # Early game stats
-        cs_at_10 = [m.get('challenges', {}).get('laneMinionsFirst10Minutes', 0) for m in matches]
-        gold_per_min = [m.get('challenges', {}).get('goldPerMinute', 0) for m in matches]
-        early_kills = [m.get('challenges', {}).get('takedownsFirstXMinutes', 0) for m in matches]
+        cs_at_10 = [m.lane_minions_first_10_minutes for m in matches]
+        gold_per_min = [m.gold_per_minute for m in matches]
+        early_kills = [m.takedowns_first_x_minutes for m in matches]
         
         # Late game stats (approximate from total stats)
-        avg_game_length = sum(m.get('challenges', {}).get('gameLength', 1200) for m in matches) / len(matches)
-        total_damage = sum(m.get('totalDamageDealtToChampions', 0) for m in matches) / len(matches)
+        avg_game_length = sum((m.game_length or 1200) for m in matches) / len(matches)
+        total_damage = sum(m.total_damage_dealt_to_champions for m in matches) / len(matches)
         
         return {
             'avg_cs_at_10': sum(cs_at_10) / len(cs_at_10) if cs_at_10 else 0,
@@ -234,7 +237,7 @@ def calculate_early_late_game_stats(df, raw_matches):
             'avg_early_kills': sum(early_kills) / len(early_kills) if early_kills else 0,
             'avg_game_length_min': avg_game_length / 60,
             'avg_total_damage': total_damage,
-            'early_death_rate': sum(1 for m in matches if m.get('deaths', 0) > 0 and m.get('challenges', {}).get('gameLength', 1200) < 900) / len(matches) * 100,
+            'early_death_rate': sum(1 for m in matches if m.deaths > 0 and (m.game_length or 1200) < 900) / len(matches) * 100,
             'games_count': len(matches),
         }
     
@@ -250,10 +253,10 @@ def calculate_early_late_game_stats(df, raw_matches):
         'early_kills_diff': win_stats.get('avg_early_kills', 0) - loss_stats.get('avg_early_kills', 0),
     }
 
-def calculate_laner_additional_metrics(raw_matches):
+def calculate_laner_additional_metrics(records):
    #laner-specific metrics
     
-    lane_matches = [m for m in raw_matches if m.get('teamPosition', 'UNKNOWN') in ['TOP', 'MIDDLE', 'BOTTOM']]
+    lane_matches = [m for m in records if m.team_position in ['TOP', 'MIDDLE', 'BOTTOM']]
     if not lane_matches:
         return {
             'has_lane_data': False,
@@ -263,14 +266,14 @@ def calculate_laner_additional_metrics(raw_matches):
     
     num_games = len(lane_matches)
 
-    total_cs_per_min = sum(((m.get('totalMinionsKilled', 0) + m.get('neutralMinionsKilled', 0)) / (m.get('challenges', {}).get('gameLength', 0)/60)) for m in lane_matches) if lane_matches else 0
+    total_cs_per_min = sum(((m.total_minions_killed + m.neutral_minions_killed) / (m.game_length/60)) for m in lane_matches) if lane_matches else 0
     avg_cs_per_min = total_cs_per_min/num_games
     
-    avg_damage_share = sum(m.get('challenges', {}).get('teamDamagePercentage', 0)*100 for m in lane_matches) / num_games
-    avg_tank_share = sum(m.get('challenges',{}).get('damageTakenOnTeamPercentage', 0)*100 for m in lane_matches) / num_games
+    avg_damage_share = sum(m.team_damage_percentage*100 for m in lane_matches) / num_games
+    avg_tank_share = sum(m.damage_taken_on_team_percentage*100 for m in lane_matches) / num_games
     combat_share = avg_damage_share + avg_tank_share
     
-    avg_gold_gained = sum(m.get('goldEarned', 0) for m in lane_matches) / num_games
+    avg_gold_gained = sum(m.gold_earned for m in lane_matches) / num_games
     gold_in_thousands = avg_gold_gained / 1000
 
 
@@ -295,10 +298,10 @@ def calculate_laner_additional_metrics(raw_matches):
     }
 
 
-def calculate_jungle_advanced_metrics(raw_matches):
+def calculate_jungle_advanced_metrics(records):
     #jungle-specific metrics
     
-    jungle_matches = [m for m in raw_matches if m.get('teamPosition', 'UNKNOWN') == 'JUNGLE']
+    jungle_matches = [m for m in records if m.team_position == 'JUNGLE']
     
     if not jungle_matches:
         return {
@@ -312,29 +315,29 @@ def calculate_jungle_advanced_metrics(raw_matches):
     
     # Jungle Objective Control Score (0-10)
     # Based on: dragons, barons, heralds, void grubs
-    avg_dragons = sum(m.get('challenges', {}).get('dragonTakedowns', 0) for m in jungle_matches) / num_games
-    avg_barons = sum(m.get('challenges', {}).get('baronTakedowns', 0) for m in jungle_matches) / num_games
-    avg_heralds = sum(m.get('challenges', {}).get('teamRiftHeraldKills', 0) for m in jungle_matches) / num_games
-    avg_grubs = sum(m.get('challenges', {}).get('voidMonsterKill', 0) for m in jungle_matches) / num_games
+    avg_dragons = sum(m.dragon_takedowns for m in jungle_matches) / num_games
+    avg_barons = sum(m.baron_takedowns for m in jungle_matches) / num_games
+    avg_heralds = sum(m.team_rift_herald_kills for m in jungle_matches) / num_games
+    avg_grubs = sum(m.void_monster_kill for m in jungle_matches) / num_games
     
     # Scoring: 2 dragons = 4pts, 1 baron = 3pts, 1 herald = 2pts, 3 grubs = 1pt (normalized to 10)
     objective_score = min(10, (avg_dragons * 2) + (avg_barons * 3) + (avg_heralds * 2) + (avg_grubs / 3))
     
     # Jungle Pressure Score (0-10)
     # Based on: scuttle control, early kills/assists, jungle CS
-    avg_scuttles = sum(m.get('challenges', {}).get('scuttleCrabKills', 0) for m in jungle_matches) / num_games
-    avg_early_takedowns = sum(m.get('challenges', {}).get('takedownsFirstXMinutes', 0) for m in jungle_matches) / num_games
-    avg_jungle_cs_10 = sum(m.get('challenges', {}).get('jungleCsBefore10Minutes', 0) for m in jungle_matches) / num_games
+    avg_scuttles = sum(m.scuttle_crab_kills for m in jungle_matches) / num_games
+    avg_early_takedowns = sum(m.takedowns_first_x_minutes for m in jungle_matches) / num_games
+    avg_jungle_cs_10 = sum(m.jungle_cs_before_10_minutes for m in jungle_matches) / num_games
     
     # Scoring: 1.5 scuttles = 3pts, 2 early takedowns = 4pts, 40 cs@10 = 3pts
     pressure_score = min(10, (avg_scuttles / 1.5 * 3) + (avg_early_takedowns / 2 * 4) + (avg_jungle_cs_10 / 40 * 3))
     
     # Counter-Jungle Score (0-10)
     # Based on: enemy camps taken, buffs stolen, epic steals, invade advantage
-    avg_enemy_camps = sum(m.get('challenges', {}).get('enemyJungleMonsterKills', 0) for m in jungle_matches) / num_games
-    avg_buffs_stolen = sum(m.get('challenges', {}).get('buffsStolen', 0) for m in jungle_matches) / num_games
-    avg_epic_steals = sum(m.get('challenges', {}).get('epicMonsterSteals', 0) for m in jungle_matches) / num_games
-    invade_rate = sum(1 for m in jungle_matches if m.get('challenges', {}).get('moreEnemyJungleThanOpponent', False)) / num_games * 100
+    avg_enemy_camps = sum(m.enemy_jungle_monster_kills for m in jungle_matches) / num_games
+    avg_buffs_stolen = sum(m.buffs_stolen for m in jungle_matches) / num_games
+    avg_epic_steals = sum(m.epic_monster_steals for m in jungle_matches) / num_games
+    invade_rate = sum(1 for m in jungle_matches if m.more_enemy_jungle_than_opponent) / num_games * 100
     
     # Scoring: 3 camps = 3pts, 0.5 buff = 2pts, 0.3 steal = 3pts, 50% invade = 2pts
     counter_score = min(10, (avg_enemy_camps / 3 * 3) + (avg_buffs_stolen / 0.5 * 2) + (avg_epic_steals / 0.3 * 3) + (invade_rate / 50 * 2))
@@ -355,9 +358,9 @@ def calculate_jungle_advanced_metrics(raw_matches):
         'avg_epic_steals': avg_epic_steals,
     }
 
-def calculate_support_advanced_metrics(raw_matches):
+def calculate_support_advanced_metrics(records):
     #advanced support-specific metrics
-    support_matches = [m for m in raw_matches if m.get('teamPosition', 'UNKNOWN') == 'UTILITY']
+    support_matches = [m for m in records if m.team_position == 'UTILITY']
     
     if not support_matches:
         return {
@@ -371,28 +374,28 @@ def calculate_support_advanced_metrics(raw_matches):
     
     # Vision Dominance Score (0-10)
     # Based on: vision score per min, control wards, wards killed, vision advantage
-    avg_vision_per_min = sum(m.get('challenges', {}).get('visionScorePerMinute', 0) for m in support_matches) / num_games
-    avg_control_wards = sum(m.get('challenges', {}).get('controlWardsPlaced', 0) for m in support_matches) / num_games
-    avg_wards_killed = sum(m.get('wardTakedowns', 0) for m in support_matches) / num_games
-    avg_vision_advantage = sum(m.get('challenges', {}).get('visionScoreAdvantageLaneOpponent', 0) for m in support_matches) / num_games
+    avg_vision_per_min = sum(m.vision_score_per_minute for m in support_matches) / num_games
+    avg_control_wards = sum(m.control_wards_placed for m in support_matches) / num_games
+    avg_wards_killed = sum(m.ward_takedowns for m in support_matches) / num_games
+    avg_vision_advantage = sum(m.vision_score_advantage_lane_opponent for m in support_matches) / num_games
     
     # Scoring: 2.0 vspm = 3pts, 8 pinks = 2pts, 15 wards killed = 3pts, +10 advantage = 2pts
     vision_score = min(10, (avg_vision_per_min / 2.0 * 3) + (avg_control_wards / 8 * 2) + (avg_wards_killed / 15 * 3) + (max(0, avg_vision_advantage) / 10 * 2))
     
     # Utility Output Score (0-10)
     # Based on: healing/shielding, assist rate, kill participation
-    avg_heal_shield = sum(m.get('challenges', {}).get('effectiveHealAndShielding', 0) for m in support_matches) / num_games
-    avg_assists = sum(m.get('assists', 0) for m in support_matches) / num_games
-    avg_kp = sum(m.get('challenges', {}).get('killParticipation', 0) for m in support_matches) / num_games * 100
+    avg_heal_shield = sum(m.effective_heal_and_shielding for m in support_matches) / num_games
+    avg_assists = sum(m.assists for m in support_matches) / num_games
+    avg_kp = sum(m.kill_participation for m in support_matches) / num_games * 100
     
     # Scoring: 5000 heal/shield = 4pts, 15 assists = 3pts, 70% kp = 3pts
     utility_score = min(10, (avg_heal_shield / 5000 * 4) + (avg_assists / 15 * 3) + (avg_kp / 70 * 3))
     
     # Frontline/Tanking Score (0-10)
     # Based on: damage taken %, damage taken, wards guarded
-    avg_dmg_taken_pct = sum(m.get('challenges', {}).get('damageTakenOnTeamPercentage', 0) for m in support_matches) / num_games * 100
-    avg_dmg_taken = sum(m.get('totalDamageTaken', 0) for m in support_matches) / num_games
-    avg_wards_guarded = sum(m.get('challenges', {}).get('wardsGuarded', 0) for m in support_matches) / num_games
+    avg_dmg_taken_pct = sum(m.damage_taken_on_team_percentage for m in support_matches) / num_games * 100
+    avg_dmg_taken = sum(m.total_damage_taken for m in support_matches) / num_games
+    avg_wards_guarded = sum(m.wards_guarded for m in support_matches) / num_games
     
     # Scoring: 25% team dmg = 4pts, 20k dmg = 3pts, 5 guarded = 3pts
     frontline_score = min(10, (avg_dmg_taken_pct / 25 * 4) + (avg_dmg_taken / 20000 * 3) + (avg_wards_guarded / 5 * 3))
@@ -413,10 +416,10 @@ def calculate_support_advanced_metrics(raw_matches):
         'avg_dmg_taken_pct': avg_dmg_taken_pct,
     }
 
-def calculate_support_early_game_stats(raw_matches):
+def calculate_support_early_game_stats(records):
     #Calculate support-specific early game performance (wins vs losses)
 
-    support_matches = [m for m in raw_matches if m.get('teamPosition', 'UNKNOWN') == 'UTILITY']
+    support_matches = [m for m in records if m.team_position == 'UTILITY']
     
     if not support_matches:
         return {
@@ -425,24 +428,24 @@ def calculate_support_early_game_stats(raw_matches):
             'losses': {},
         }
     
-    wins = [m for m in support_matches if m.get('win')]
-    losses = [m for m in support_matches if not m.get('win')]
+    wins = [m for m in support_matches if m.win]
+    losses = [m for m in support_matches if not m.win]
     
     def get_support_early_stats(matches):
         if not matches:
             return {}
         
         # Wards placed early (approximate from total / game length * 10 min)
-        avg_wards_per_game = sum(m.get('wardsPlaced', 0) for m in matches) / len(matches)
-        avg_game_length_min = sum(m.get('challenges', {}).get('gameLength', 1800) / 60 for m in matches) / len(matches)
+        avg_wards_per_game = sum(m.wards_placed for m in matches) / len(matches)
+        avg_game_length_min = sum((m.game_length or 1800) / 60 for m in matches) / len(matches)
         wards_at_10_estimate = (avg_wards_per_game / avg_game_length_min) * 10 if avg_game_length_min > 0 else 0
         
         # Support quest completion rate
-        faster_quest = sum(1 for m in matches if m.get('challenges', {}).get('fasterSupportQuestCompletion', 0) > 0)
+        faster_quest = sum(1 for m in matches if m.faster_support_quest_completion > 0)
         quest_completion_rate = (faster_quest / len(matches)) * 100
         
         # Early assists/kill participation (first 10-15 min)
-        avg_early_assists = sum(m.get('challenges', {}).get('takedownsFirstXMinutes', 0) for m in matches) / len(matches)
+        avg_early_assists = sum(m.takedowns_first_x_minutes for m in matches) / len(matches)
         
         return {
             'avg_wards_at_10': wards_at_10_estimate,
@@ -468,9 +471,9 @@ def calculate_support_early_game_stats(raw_matches):
         'early_assists_diff': assists_diff,
     }
 
-def calculate_jungle_early_game_stats(raw_matches):
+def calculate_jungle_early_game_stats(records):
     #Calculate jungle-specific early game performance (wins vs losses)
-    jungle_matches = [m for m in raw_matches if m.get('teamPosition', 'UNKNOWN') == 'JUNGLE']
+    jungle_matches = [m for m in records if m.team_position == 'JUNGLE']
     
     if not jungle_matches:
         return {
@@ -479,21 +482,21 @@ def calculate_jungle_early_game_stats(raw_matches):
             'losses': {},
         }
     
-    wins = [m for m in jungle_matches if m.get('win')]
-    losses = [m for m in jungle_matches if not m.get('win')]
+    wins = [m for m in jungle_matches if m.win]
+    losses = [m for m in jungle_matches if not m.win]
     
     def get_jungle_early_stats(matches):
         if not matches:
             return {}
         
         # Jungle CS at 10 minutes
-        avg_jungle_cs_10 = sum(m.get('challenges', {}).get('jungleCsBefore10Minutes', 0) for m in matches) / len(matches)
+        avg_jungle_cs_10 = sum(m.jungle_cs_before_10_minutes for m in matches) / len(matches)
         
         # Gold per minute (first 10 min approximate)
-        avg_gold_per_min = sum(m.get('challenges', {}).get('goldPerMinute', 0) for m in matches) / len(matches)
+        avg_gold_per_min = sum(m.gold_per_minute for m in matches) / len(matches)
         
         # Early kills + assists (takedowns)
-        avg_early_takedowns = sum(m.get('challenges', {}).get('takedownsFirstXMinutes', 0) for m in matches) / len(matches)
+        avg_early_takedowns = sum(m.takedowns_first_x_minutes for m in matches) / len(matches)
         
         return {
             'avg_jungle_cs_10': avg_jungle_cs_10,
@@ -519,29 +522,29 @@ def calculate_jungle_early_game_stats(raw_matches):
         'early_takedown_diff': takedown_diff,
     }
 
-def calculate_support_early_dominance(raw_matches):
+def calculate_support_early_dominance(records):
     #Calculate early game dominance score based on: support quest completion, vision advantage, and early assists.
     
-    support_matches = [m for m in raw_matches if m.get('teamPosition', 'UNKNOWN') == 'UTILITY']
+    support_matches = [m for m in records if m.team_position == 'UTILITY']
     
     if not support_matches:
         return 0.0
     
-    wins = [m for m in support_matches if m.get('win')]
+    wins = [m for m in support_matches if m.win]
     
     if not wins:
         return 0.0
     
     # Support Quest Completion Time (faster = better)
-    faster_quest_count = sum(1 for m in wins if m.get('challenges', {}).get('fasterSupportQuestCompletion', 0) > 0)
+    faster_quest_count = sum(1 for m in wins if m.faster_support_quest_completion > 0)
     quest_score = (faster_quest_count / len(wins) * 100) / 10  # 100% completion = 10 pts
     
     # Vision Advantage over lane opponent
-    avg_vision_advantage = sum(m.get('challenges', {}).get('visionScoreAdvantageLaneOpponent', 0) for m in wins) / len(wins)
+    avg_vision_advantage = sum(m.vision_score_advantage_lane_opponent for m in wins) / len(wins)
     vision_score = min(10, max(0, (avg_vision_advantage + 5) / 1.5))  # +10 advantage = 10pts, -5 = 0pts
     
     # Early assists/kill participation
-    avg_early_assists = sum(m.get('challenges', {}).get('takedownsFirstXMinutes', 0) for m in wins) / len(wins)
+    avg_early_assists = sum(m.takedowns_first_x_minutes for m in wins) / len(wins)
     assist_score = min(10, avg_early_assists * 2)  # 5 early assists = 10pts
     
     # Weighted average: 40% quest, 30% vision, 30% assists
@@ -549,30 +552,33 @@ def calculate_support_early_dominance(raw_matches):
     
     return dominance_score
 
-def calculate_jungle_early_dominance(raw_matches):
+def calculate_jungle_early_dominance(records, population=None):
     #Calculate early game jungle dominance score based on: jungle CS advantage, gold differential, and early kills+assists.
     
-    jungle_matches = [m for m in raw_matches if m.get('teamPosition', 'UNKNOWN') == 'JUNGLE']
+    jungle_matches = [m for m in records if m.team_position == 'JUNGLE']
     
     if not jungle_matches:
         return 0.0
     
-    wins = [m for m in jungle_matches if m.get('win')]
+    wins = [m for m in jungle_matches if m.win]
     
     if not wins:
         return 0.0
     
     # Jungle CS at 10 (higher = better clear speed)
-    avg_jungle_cs_10 = sum(m.get('challenges', {}).get('jungleCsBefore10Minutes', 0) for m in wins) / len(wins)
-    cs_score = (avg_jungle_cs_10 / 40) * 10  # 40 CS@10 = max score
-    
-    # Gold per minute advantage (compare to baseline 350 gpm)
-    avg_gpm = sum(m.get('challenges', {}).get('goldPerMinute', 0) for m in wins) / len(wins)
-    gold_advantage = (avg_gpm - 350) * 10  # Difference from baseline
+    # Top-10% jungle CS@10 in the population = max score (40 until enough games are sketched)
+    avg_jungle_cs_10 = sum(m.jungle_cs_before_10_minutes for m in wins) / len(wins)
+    cs_target = population.quantile('jungle_cs_at_10', 0.9, role='JUNGLE', default=40) if population else 40
+    cs_score = (avg_jungle_cs_10 / max(cs_target, 1)) * 10
+    
+    # Gold per minute advantage (compare to the median jungler, baseline 350 gpm)
+    avg_gpm = sum(m.gold_per_minute for m in wins) / len(wins)
+    baseline_gpm = population_baseline(population, 'gold_per_min', 350, role='JUNGLE')
+    gold_advantage = (avg_gpm - baseline_gpm) * 10  # Difference from baseline
     gold_score = min(10, max(0, (gold_advantage + 250) / 50))  # +250g = 5pts, +500g = 10pts
     
     # Early kills + assists (takedowns)
-    avg_early_takedowns = sum(m.get('challenges', {}).get('takedownsFirstXMinutes', 0) for m in wins) / len(wins)
+    avg_early_takedowns = sum(m.takedowns_first_x_minutes for m in wins) / len(wins)
     takedown_score = min(10, avg_early_takedowns * 2)  # 5 early takedowns = 10pts
     
     # Weighted average: 30% CS, 30% gold, 40% takedowns (ganks matter more for junglers)
@@ -580,294 +586,43 @@ def calculate_jungle_early_dominance(raw_matches):
     
     return dominance_score
 
-def _calculate_role_specific_tags(primary_role: str, secondary_role: str, raw_matches: list, 
-                                   jungle_advanced: dict = None, support_advanced: dict = None,
-                                   metrics: dict = None):
-    #Helper function to calculate role-specific tags.
-    
-    tags = {'strengths': [], 'weaknesses': []}
-    
-    # === LANER TAGS ===
-    if primary_role in ['TOP', 'MIDDLE', 'BOTTOM'] or secondary_role in ['TOP', 'MIDDLE', 'BOTTOM']:
-        laner_matches = [m for m in raw_matches if m.get('teamPosition', 'UNKNOWN') in ['TOP', 'MIDDLE', 'BOTTOM']]
-        
-        if laner_matches:
-            # Calculate laner stats
-            avg_cs_10 = sum(m.get('challenges', {}).get('laneMinionsFirst10Minutes', 0) for m in laner_matches) / len(laner_matches)
-            avg_plates = sum(m.get('challenges', {}).get('turretPlatesTaken', 0) for m in laner_matches) / len(laner_matches)
-            avg_early_kills = sum(m.get('challenges', {}).get('takedownsFirstXMinutes', 0) for m in laner_matches) / len(laner_matches)
-            
-            # Lane Kingdom (strong laning)
-            if avg_cs_10 >= 65 and (avg_plates >= 1.5 or avg_early_kills >= 1.5):
-                score = ((avg_cs_10 / 80) * 40) + ((avg_plates / 3) * 30) + ((avg_early_kills / 3) * 30)
-                tags['strengths'].append({
-                    'label': 'Lane Kingdom',
-                    'score': score,
-                    'tooltip': f"{avg_cs_10:.0f} CS@10, {avg_plates:.1f} plates, {avg_early_kills:.1f} early kills"
-                })
-            
-            # Weak Laning
-            elif avg_cs_10 < 50:
-                score = 100 - ((avg_cs_10 / 50) * 100)
-                tags['weaknesses'].append({
-                    'label': 'Weak Laning',
-                    'score': score,
-                    'tooltip': f"{avg_cs_10:.0f} CS@10 - below 50 benchmark"
-                })
-    
-    # === JUNGLE TAGS ===
-    if (primary_role == 'JUNGLE' or secondary_role == 'JUNGLE') and jungle_advanced and jungle_advanced.get('has_jungle_data'):
-        
-        # Dragonslayer (high objective control)
-        obj_score = jungle_advanced.get('jungle_objective_control', 0)
-        if obj_score >= 7:
-            tags['strengths'].append({
-                'label': 'Dragonslayer',
-                'score': obj_score * 10,
-                'tooltip': f"{jungle_advanced.get('avg_dragons', 0):.1f} drags, {jungle_advanced.get('avg_barons', 0):.1f} barons"
-            })
-        
-        # Counter Jungle King
-        counter_score = jungle_advanced.get('counter_jungle_score', 0)
-        if counter_score >= 6:
-            tags['strengths'].append({
-                'label': 'Counter Jungle King',
-                'score': counter_score * 10,
-                'tooltip': f"{jungle_advanced.get('avg_enemy_camps', 0):.1f} enemy camps, {jungle_advanced.get('avg_epic_steals', 0):.1f} steals"
-            })
-        
-        # Objective Neglect
-        if obj_score < 4:
-            score = 100 - (obj_score * 20)
-            tags['weaknesses'].append({
-                'label': 'Objective Neglect',
-                'score': score,
-                'tooltip': f"Low objective control ({obj_score:.1f}/10)"
-            })
-        
-        # Passive Jungler
-        pressure_score = jungle_advanced.get('jungle_pressure_score', 0)
-        if pressure_score < 4:
-            score = 100 - (pressure_score * 20)
-            tags['weaknesses'].append({
-                'label': 'Passive Jungler',
-                'score': score,
-                'tooltip': f"Low early pressure ({pressure_score:.1f}/10)"
-            })
-    
-    # === SUPPORT TAGS ===
-    if (primary_role == 'UTILITY' or secondary_role == 'UTILITY') and support_advanced and support_advanced.get('has_support_data'):
-        
-        # The All Seeing (high vision)
-        vision_score = support_advanced.get('vision_dominance_score', 0)
-        if vision_score >= 7:
-            tags['strengths'].append({
-                'label': 'The All Seeing',
-                'score': vision_score * 10,
-                'tooltip': f"{support_advanced.get('avg_vision_per_min', 0):.1f} vision/min"
-            })
-        
-        # Guardian Angel (high utility)
-        utility_score = support_advanced.get('utility_output_score', 0)
-        if utility_score >= 7:
-            tags['strengths'].append({
-                'label': 'Guardian Angel',
-                'score': utility_score * 10,
-                'tooltip': f"{support_advanced.get('avg_heal_shield', 0):,.0f} healing/shielding"
-            })
-        
-        # Nearsighted (low vision)
-        if vision_score < 4:
-            score = 100 - (vision_score * 20)
-            tags['weaknesses'].append({
-                'label': 'Nearsighted',
-                'score': score,
-                'tooltip': f"Low vision control ({vision_score:.1f}/10)"
-            })
-        
-        # Low Impact
-        if utility_score < 4:
-            score = 100 - (utility_score * 20)
-            tags['weaknesses'].append({
-                'label': 'Low Impact',
-                'score': score,
-                'tooltip': f"Low utility output ({utility_score:.1f}/10)"
-            })
-    
-    return tags
-
-def calculate_playstyle_tags(metrics: dict, raw_matches: list, role_info: dict, jungle_advanced: dict = None, support_advanced: dict = None):
+def calculate_playstyle_tags(metrics: dict, records: list, role_info: dict, jungle_advanced: dict = None, support_advanced: dict = None):
     
     #Calculate playstyle tags (strengths and weaknesses) based on player metrics.
     #Returns lists of tags with their scores for dynamic selection.
+    #Tags are declarative rules in data/playstyle_rules.py evaluated against one feature vector.
     
     if metrics['total_games'] < 10:
         return {'strengths': [], 'weaknesses': [], 'neutral': []}
     
-    tags = {
-        'strengths': [],
-        'weaknesses': [],
-        'neutral': []
-    }
-    
-    primary_role = role_info.get('primary_role', 'UNKNOWN')
-    secondary_role = role_info.get('secondary_role', 'NONE')
-    
-    # Calculate scores for each potential tag (0-100 scale)
-    # Higher score = more applicable
-    
-    # === GENERIC STRENGTHS ===
-    
-    # Consistent Performer (low volatility)
-    if metrics.get('performance_volatility', 10) <= 3:
-        score = 100 - (metrics['performance_volatility'] * 10)
-        tags['strengths'].append({
-            'label': 'Consistent Performer',
-            'score': score,
-            'tooltip': f"Low performance variance ({metrics['performance_volatility']:.1f}/10)"
-        })
-    
-    # Team Player (high assists and KP)
-    avg_assists = metrics.get('avg_assists', 0)
-    if avg_assists >= 8:
-        # Get kill participation from raw matches
-        avg_kp = sum(m.get('challenges', {}).get('killParticipation', 0) for m in raw_matches) / len(raw_matches) * 100 if raw_matches else 0
-        if avg_kp >= 60:
-            score = min(100, (avg_assists / 15 * 50) + (avg_kp / 80 * 50))
-            tags['strengths'].append({
-                'label': 'Team Player',
-                'score': score,
-                'tooltip': f"{avg_assists:.1f} avg assists, {avg_kp:.0f}% kill participation"
-            })
-    
-    # Safe Player (low deaths)
-    if metrics.get('safety_score', 0) >= 7:
-        score = metrics['safety_score'] * 10
-        tags['strengths'].append({
-            'label': 'Safe Player',
-            'score': score,
-            'tooltip': f"{metrics['avg_deaths']:.1f} avg deaths - excellent survival"
-        })
-    
-    # Damage Dealer (high DPM)
-    avg_dpm = sum(m.get('challenges', {}).get('damagePerMinute', 0) for m in raw_matches) / len(raw_matches) if raw_matches else 0
-    if avg_dpm >= 500:
-        score = min(100, (avg_dpm / 800) * 100)
-        tags['strengths'].append({
-            'label': 'Damage Dealer',
-            'score': score,
-            'tooltip': f"{avg_dpm:.0f} damage per minute"
-        })
-    
-    # One Man Army (high damage share or tank)
-    avg_dmg_share = sum(m.get('challenges', {}).get('teamDamagePercentage', 0) for m in raw_matches) / len(raw_matches) * 100 if raw_matches else 0
-    avg_tank_share = sum(m.get('challenges', {}).get('damageTakenOnTeamPercentage', 0) for m in raw_matches) / len(raw_matches) * 100 if raw_matches else 0
-    
-    if avg_dmg_share >= 25 or avg_tank_share >= 25:
-        score = max(avg_dmg_share, avg_tank_share) * 3
-        label = "One Man Army" if avg_dmg_share >= avg_tank_share else "Team's Shield"
-        tags['strengths'].append({
-            'label': label,
-            'score': score,
-            'tooltip': f"{max(avg_dmg_share, avg_tank_share):.0f}% of team's burden"
-        })
-    
-    # === GENERIC WEAKNESSES ===
-    
-    # Coin Flip (high volatility)
-    if metrics.get('performance_volatility', 0) >= 7:
-        score = metrics['performance_volatility'] * 10
-        tags['weaknesses'].append({
-            'label': 'Coin Flip',
-            'score': score,
-            'tooltip': f"High performance variance ({metrics['performance_volatility']:.1f}/10)"
-        })
-    
-    # Weak Vision (low vision score)
-    avg_vision = sum(m.get('visionScore', 0) for m in raw_matches) / len(raw_matches) if raw_matches else 0
-    if avg_vision < 20 and primary_role != 'UTILITY':  # Don't penalize non-supports as harshly
-        score = 100 - (avg_vision / 20 * 100)
-        tags['weaknesses'].append({
-            'label': 'Weak Vision',
-            'score': score,
-            'tooltip': f"{avg_vision:.1f} avg vision score"
-        })
-    
-    # Spectator (low KP)
-    avg_kp = sum(m.get('challenges', {}).get('killParticipation', 0) for m in raw_matches * 100)/ len(raw_matches)  if raw_matches else 0
-    if avg_kp < 30:
-        score = 100 - (avg_kp / 30 * 100)
-        tags['weaknesses'].append({
-            'label': 'Spectator',
-            'score': score,
-            'tooltip': f"{avg_kp:.0f}% kill participation"
-        })
-    
-    # Careless (high death rate)
-    if metrics.get('avg_deaths', 0) >= 7:
-        score = min(100, (metrics['avg_deaths'] / 10) * 100)
-        tags['weaknesses'].append({
-            'label': 'Careless',
-            'score': score,
-            'tooltip': f"{metrics['avg_deaths']:.1f} avg deaths per game"
-        })
-    
-    # === NEUTRAL TAG ===
-    
-    # Glass Cannon (high DPM but also high deaths)
-    if avg_dpm >= 500 and metrics.get('avg_deaths', 0) >= 6:
-        score = ((avg_dpm / 800) * 50) + ((metrics['avg_deaths'] / 10) * 50)
-        tags['neutral'].append({
-            'label': 'Glass Cannon',
-            'score': score,
-            'tooltip': f"{avg_dpm:.0f} DPM but {metrics['avg_deaths']:.1f} deaths"
-        })
-    
-    # === ADD ROLE-SPECIFIC TAGS ===
-    role_tags = _calculate_role_specific_tags(
-        primary_role, 
-        secondary_role, 
-        raw_matches, 
-        jungle_advanced, 
-        support_advanced,
-        metrics
-    )
-    
-    # Merge role-specific tags
-    tags['strengths'].extend(role_tags['strengths'])
-    tags['weaknesses'].extend(role_tags['weaknesses'])
-    
-    # Sort by score (highest first) and limit
-    tags['strengths'] = sorted(tags['strengths'], key=lambda x: x['score'], reverse=True)[:8]
-    tags['weaknesses'] = sorted(tags['weaknesses'], key=lambda x: x['score'], reverse=True)[:5]
-    
-    return tags
+    features = build_tag_features(metrics, records, role_info, jungle_advanced, support_advanced)
+    return evaluate_tag_rules(features)
 
-def calculate_damage_efficiency(raw_matches: list):
+def calculate_damage_efficiency(records: list):
     #Measures how efficiently a player converts gold earned into damage
     
-    avg_dpg = sum((m.get('totalDamageDealtToChampions', 0)/m.get('goldEarned')) for m in raw_matches)/len(raw_matches) if raw_matches else 0
-    for match in raw_matches:
-        totalDamageToChampions = match.get('totalDamageDealtToChampions')
-        goldEarned = match.get('goldEarned')
+    avg_dpg = sum((m.total_damage_dealt_to_champions/m.gold_earned) for m in records)/len(records) if records else 0
+    for match in records:
+        totalDamageToChampions = match.total_damage_dealt_to_champions
+        goldEarned = match.gold_earned
 
         dpg = totalDamageToChampions / goldEarned
         print(dpg)
     return avg_dpg
 
-def calculate_objective_score(raw_matches: list):
+def calculate_objective_score(records: list):
     #Measures how actively a player participates in objectives (kills, dragons, barons, heralds and turrets)
     
-    if not raw_matches:
+    if not records:
         return 0.0
     
-    num_games = len(raw_matches)
+    num_games = len(records)
 
-    avg_kp = sum(m.get('challenges', {}).get('killParticipation', 0) for m in raw_matches)/ num_games if raw_matches else 0
-    avg_dragons = sum(m.get('challenges', {}).get('dragonTakedowns', 0) for m in raw_matches) / num_games if raw_matches else 0
-    avg_barons = sum(m.get('challenges', {}).get('baronTakedowns', 0) for m in raw_matches) / num_games if raw_matches else 0
-    avg_heralds = sum(m.get('challenges', {}).get('teamRiftHeraldKills', 0) for m in raw_matches) / num_games if raw_matches else 0
-    avg_turrets = sum(m.get('challenges', {}).get('turretTakedowns', 0) for m in raw_matches) / num_games
+    avg_kp = sum(m.kill_participation for m in records)/ num_games if records else 0
+    avg_dragons = sum(m.dragon_takedowns for m in records) / num_games if records else 0
+    avg_barons = sum(m.baron_takedowns for m in records) / num_games if records else 0
+    avg_heralds = sum(m.team_rift_herald_kills for m in records) / num_games if records else 0
+    avg_turrets = sum(m.turret_takedowns for m in records) / num_games
     
     #defining weights
     W_KP, W_D, W_B, W_H, W_T = 3.0, 1.5, 2.5, 1.0, 2.0
@@ -878,23 +633,23 @@ def calculate_objective_score(raw_matches: list):
     objective_score = (weighted_performance / max_weighted_score) * 10
     return objective_score
 
-def calculate_persistence_score(raw_matches: list):
+def calculate_persistence_score(records: list):
     #Measures how much a player never gives up even in losing games (by calculating objective score, combat share and kill participation in losing games)
     
-    if not raw_matches:
+    if not records:
         return 0.0
     
-    losses = [m for m in raw_matches if not m.get('win')]
+    losses = [m for m in records if not m.win]
     if not losses:
         return 0.0
 
     num_games = len(losses)
 
     loss_objective_score  = calculate_objective_score(losses)
-    loss_avg_damage_share = sum(m.get('challenges', {}).get('teamDamagePercentage', 0) for m in losses)/ num_games if losses else 0
-    loss_avg_tanking_share = sum(m.get('challenges', {}).get('damageTakenOnTeamPercentage', 0) for m in losses)/ num_games if losses else 0
+    loss_avg_damage_share = sum(m.team_damage_percentage for m in losses)/ num_games if losses else 0
+    loss_avg_tanking_share = sum(m.damage_taken_on_team_percentage for m in losses)/ num_games if losses else 0
     lost_combat_share = loss_avg_damage_share + loss_avg_tanking_share
-    loss_avg_kill_participation = sum(m.get('challenges', {}).get('killParticipation', 0) for m in losses)/ num_games if losses else 0
+    loss_avg_kill_participation = sum(m.kill_participation for m in losses)/ num_games if losses else 0
 
     #defining weights
     W_LKP = 3.5  # Loss Kill Participation
@@ -0,0 +1,254 @@
+from data.match_model import LANER_ROLES
+
+# Top N tags kept per category after sorting by score (neutral tags are not capped)
+TAG_LIMITS = {'strengths': 8, 'weaknesses': 5}
+
+
+def build_tag_features(metrics: dict, records: list, role_info: dict,
+                       jungle_advanced: dict = None, support_advanced: dict = None) -> dict:
+    #One flat feature vector for the tag rules, built with a single pass over the match records.
+    #Every rule reads from here, so adding a tag never adds another scan of the matches.
+    primary_role = role_info.get('primary_role', 'UNKNOWN')
+    secondary_role = role_info.get('secondary_role', 'NONE')
+
+    kp_sum = dpm_sum = dmg_share_sum = tank_share_sum = vision_sum = 0.0
+    laner_games = 0
+    cs_10_sum = plates_sum = early_kills_sum = 0.0
+
+    for m in records:
+        kp_sum += m.kill_participation
+        dpm_sum += m.damage_per_minute
+        dmg_share_sum += m.team_damage_percentage
+        tank_share_sum += m.damage_taken_on_team_percentage
+        vision_sum += m.vision_score
+
+        if m.team_position in LANER_ROLES:
+            laner_games += 1
+            cs_10_sum += m.lane_minions_first_10_minutes
+            plates_sum += m.turret_plates_taken
+            early_kills_sum += m.takedowns_first_x_minutes
+
+    games = len(records)
+    jungle_advanced = jungle_advanced or {}
+    support_advanced = support_advanced or {}
+
+    return {
+        'total_games': metrics.get('total_games', games),
+        'primary_role': primary_role,
+        'secondary_role': secondary_role,
+
+        # Generic
+        'performance_volatility': metrics.get('performance_volatility', 5),
+        'safety_score': metrics.get('safety_score', 0),
+        'avg_assists': metrics.get('avg_assists', 0),
+        'avg_deaths': metrics.get('avg_deaths', 0),
+        'avg_kp': kp_sum / games * 100 if games else 0,
+        'avg_dpm': dpm_sum / games if games else 0,
+        'avg_dmg_share': dmg_share_sum / games * 100 if games else 0,
+        'avg_tank_share': tank_share_sum / games * 100 if games else 0,
+        'avg_vision': vision_sum / games if games else 0,
+
+        # Laner
+        'plays_laner': laner_games > 0 and (primary_role in LANER_ROLES or secondary_role in LANER_ROLES),
+        'avg_cs_10': cs_10_sum / laner_games if laner_games else 0,
+        'avg_plates': plates_sum / laner_games if laner_games else 0,
+        'avg_early_kills': early_kills_sum / laner_games if laner_games else 0,
+
+        # Jungle
+        'plays_jungle': 'JUNGLE' in (primary_role, secondary_role) and bool(jungle_advanced.get('has_jungle_data')),
+        'jungle_objective_control': jungle_advanced.get('jungle_objective_control', 0),
+        'counter_jungle_score': jungle_advanced.get('counter_jungle_score', 0),
+        'jungle_pressure_score': jungle_advanced.get('jungle_pressure_score', 0),
+        'avg_dragons': jungle_advanced.get('avg_dragons', 0),
+        'avg_barons': jungle_advanced.get('avg_barons', 0),
+        'avg_enemy_camps': jungle_advanced.get('avg_enemy_camps', 0),
+        'avg_epic_steals': jungle_advanced.get('avg_epic_steals', 0),
+
+        # Support
+        'plays_support': 'UTILITY' in (primary_role, secondary_role) and bool(support_advanced.get('has_support_data')),
+        'vision_dominance_score': support_advanced.get('vision_dominance_score', 0),
+        'utility_output_score': support_advanced.get('utility_output_score', 0),
+        'avg_vision_per_min': support_advanced.get('avg_vision_per_min', 0),
+        'avg_heal_shield': support_advanced.get('avg_heal_shield', 0),
+    }
+
+
+# Each rule: label (str or f(features)), category, when(features) -> bool,
+# score(features) -> 0-100ish, and a tooltip template formatted with the feature vector
+PLAYSTYLE_TAG_RULES = [
+    # === GENERIC STRENGTHS ===
+    {
+        'label': 'Consistent Performer',
+        'category': 'strengths',
+        'when': lambda f: f['performance_volatility'] <= 3,
+        'score': lambda f: 100 - (f['performance_volatility'] * 10),
+        'tooltip': "Low performance variance ({performance_volatility:.1f}/10)",
+    },
+    {
+        'label': 'Team Player',
+        'category': 'strengths',
+        'when': lambda f: f['avg_assists'] >= 8 and f['avg_kp'] >= 60,
+        'score': lambda f: min(100, (f['avg_assists'] / 15 * 50) + (f['avg_kp'] / 80 * 50)),
+        'tooltip': "{avg_assists:.1f} avg assists, {avg_kp:.0f}% kill participation",
+    },
+    {
+        'label': 'Safe Player',
+        'category': 'strengths',
+        'when': lambda f: f['safety_score'] >= 7,
+        'score': lambda f: f['safety_score'] * 10,
+        'tooltip': "{avg_deaths:.1f} avg deaths - excellent survival",
+    },
+    {
+        'label': 'Damage Dealer',
+        'category': 'strengths',
+        'when': lambda f: f['avg_dpm'] >= 500,
+        'score': lambda f: min(100, (f['avg_dpm'] / 800) * 100),
+        'tooltip': "{avg_dpm:.0f} damage per minute",
+    },
+    {
+        # High damage share or tank share
+        'label': lambda f: "One Man Army" if f['avg_dmg_share'] >= f['avg_tank_share'] else "Team's Shield",
+        'category': 'strengths',
+        'when': lambda f: f['avg_dmg_share'] >= 25 or f['avg_tank_share'] >= 25,
+        'score': lambda f: max(f['avg_dmg_share'], f['avg_tank_share']) * 3,
+        'tooltip': lambda f: f"{max(f['avg_dmg_share'], f['avg_tank_share']):.0f}% of team's burden",
+    },
+
+    # === GENERIC WEAKNESSES ===
+    {
+        'label': 'Coin Flip',
+        'category': 'weaknesses',
+        'when': lambda f: f['performance_volatility'] >= 7,
+        'score': lambda f: f['performance_volatility'] * 10,
+        'tooltip': "High performance variance ({performance_volatility:.1f}/10)",
+    },
+    {
+        # Don't penalize non-supports as harshly
+        'label': 'Weak Vision',
+        'category': 'weaknesses',
+        'when': lambda f: f['avg_vision'] < 20 and f['primary_role'] != 'UTILITY',
+        'score': lambda f: 100 - (f['avg_vision'] / 20 * 100),
+        'tooltip': "{avg_vision:.1f} avg vision score",
+    },
+    {
+        'label': 'Spectator',
+        'category': 'weaknesses',
+        'when': lambda f: f['avg_kp'] < 30,
+        'score': lambda f: 100 - (f['avg_kp'] / 30 * 100),
+        'tooltip': "{avg_kp:.0f}% kill participation",
+    },
+    {
+        'label': 'Careless',
+        'category': 'weaknesses',
+        'when': lambda f: f['avg_deaths'] >= 7,
+        'score': lambda f: min(100, (f['avg_deaths'] / 10) * 100),
+        'tooltip': "{avg_deaths:.1f} avg deaths per game",
+    },
+
+    # === NEUTRAL ===
+    {
+        'label': 'Glass Cannon',
+        'category': 'neutral',
+        'when': lambda f: f['avg_dpm'] >= 500 and f['avg_deaths'] >= 6,
+        'score': lambda f: ((f['avg_dpm'] / 800) * 50) + ((f['avg_deaths'] / 10) * 50),
+        'tooltip': "{avg_dpm:.0f} DPM but {avg_deaths:.1f} deaths",
+    },
+
+    # === LANER ===
+    {
+        'label': 'Lane Kingdom',
+        'category': 'strengths',
+        'when': lambda f: f['plays_laner'] and f['avg_cs_10'] >= 65 and (f['avg_plates'] >= 1.5 or f['avg_early_kills'] >= 1.5),
+        'score': lambda f: ((f['avg_cs_10'] / 80) * 40) + ((f['avg_plates'] / 3) * 30) + ((f['avg_early_kills'] / 3) * 30),
+        'tooltip': "{avg_cs_10:.0f} CS@10, {avg_plates:.1f} plates, {avg_early_kills:.1f} early kills",
+    },
+    {
+        'label': 'Weak Laning',
+        'category': 'weaknesses',
+        'when': lambda f: f['plays_laner'] and f['avg_cs_10'] < 50,
+        'score': lambda f: 100 - ((f['avg_cs_10'] / 50) * 100),
+        'tooltip': "{avg_cs_10:.0f} CS@10 - below 50 benchmark",
+    },
+
+    # === JUNGLE ===
+    {
+        'label': 'Dragonslayer',
+        'category': 'strengths',
+        'when': lambda f: f['plays_jungle'] and f['jungle_objective_control'] >= 7,
+        'score': lambda f: f['jungle_objective_control'] * 10,
+        'tooltip': "{avg_dragons:.1f} drags, {avg_barons:.1f} barons",
+    },
+    {
+        'label': 'Counter Jungle King',
+        'category': 'strengths',
+        'when': lambda f: f['plays_jungle'] and f['counter_jungle_score'] >= 6,
+        'score': lambda f: f['counter_jungle_score'] * 10,
+        'tooltip': "{avg_enemy_camps:.1f} enemy camps, {avg_epic_steals:.1f} steals",
+    },
+    {
+        'label': 'Objective Neglect',
+        'category': 'weaknesses',
+        'when': lambda f: f['plays_jungle'] and f['jungle_objective_control'] < 4,
+        'score': lambda f: 100 - (f['jungle_objective_control'] * 20),
+        'tooltip': "Low objective control ({jungle_objective_control:.1f}/10)",
+    },
+    {
+        'label': 'Passive Jungler',
+        'category': 'weaknesses',
+        'when': lambda f: f['plays_jungle'] and f['jungle_pressure_score'] < 4,
+        'score': lambda f: 100 - (f['jungle_pressure_score'] * 20),
+        'tooltip': "Low early pressure ({jungle_pressure_score:.1f}/10)",
+    },
+
+    # === SUPPORT ===
+    {
+        'label': 'The All Seeing',
+        'category': 'strengths',
+        'when': lambda f: f['plays_support'] and f['vision_dominance_score'] >= 7,
+        'score': lambda f: f['vision_dominance_score'] * 10,
+        'tooltip': "{avg_vision_per_min:.1f} vision/min",
+    },
+    {
+        'label': 'Guardian Angel',
+        'category': 'strengths',
+        'when': lambda f: f['plays_support'] and f['utility_output_score'] >= 7,
+        'score': lambda f: f['utility_output_score'] * 10,
+        'tooltip': "{avg_heal_shield:,.0f} healing/shielding",
+    },
+    {
+        'label': 'Nearsighted',
+        'category': 'weaknesses',
+        'when': lambda f: f['plays_support'] and f['vision_dominance_score'] < 4,
+        'score': lambda f: 100 - (f['vision_dominance_score'] * 20),
+        'tooltip': "Low vision control ({vision_dominance_score:.1f}/10)",
+    },
+    {
+        'label': 'Low Impact',
+        'category': 'weaknesses',
+        'when': lambda f: f['plays_support'] and f['utility_output_score'] < 4,
+        'score': lambda f: 100 - (f['utility_output_score'] * 20),
+        'tooltip': "Low utility output ({utility_output_score:.1f}/10)",
+    },
+]
+
+
+def evaluate_tag_rules(features: dict, rules: list = None) -> dict:
+    #Evaluate every rule once against the feature vector (O(number of rules))
+    tags = {'strengths': [], 'weaknesses': [], 'neutral': []}
+
+    for rule in rules if rules is not None else PLAYSTYLE_TAG_RULES:
+        if not rule['when'](features):
+            continue
+        label = rule['label'](features) if callable(rule['label']) else rule['label']
+        tooltip = rule['tooltip'](features) if callable(rule['tooltip']) else rule['tooltip'].format(**features)
+        tags[rule['category']].append({
+            'label': label,
+            'score': rule['score'](features),
+            'tooltip': tooltip,
+        })
+
+    # Sort by score (highest first) and limit
+    for category, limit in TAG_LIMITS.items():
+        tags[category] = sorted(tags[category], key=lambda x: x['score'], reverse=True)[:limit]
+
+    return tags
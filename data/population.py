@@ -0,0 +1,301 @@
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# t-digest compression: roughly the number of centroids kept per sketch (higher = more accurate tails)
+DIGEST_COMPRESSION = 100
+
+# Remember this many match ids so the same game is never counted twice; oldest ids are forgotten first
+MAX_SEEN_MATCHES = 100_000
+
+# A baseline needs at least this many samples before it replaces the hard-coded benchmark
+MIN_POPULATION_SAMPLES = 50
+
+# (metric name, participant challenges key, scale) streamed from every participant of every match
+POPULATION_METRICS = [
+    ('gold_per_min', 'goldPerMinute', 1),
+    ('cs_at_10', 'laneMinionsFirst10Minutes', 1),
+    ('jungle_cs_at_10', 'jungleCsBefore10Minutes', 1),
+    ('early_takedowns', 'takedownsFirstXMinutes', 1),
+    ('kda', 'kda', 1),
+    ('kill_participation', 'killParticipation', 100),
+    ('damage_per_min', 'damagePerMinute', 1),
+    ('vision_per_min', 'visionScorePerMinute', 1),
+]
+
+
+class TDigest:
+    #Mergeable quantile sketch (merging t-digest with the arcsine scale function).
+    #Size stays O(compression) no matter how many values are added.
+
+    __slots__ = ('compression', '_means', '_weights', '_buffer', '_count', '_min', '_max')
+
+    def __init__(self, compression: int = DIGEST_COMPRESSION):
+        self.compression = compression
+        self._means = np.zeros(0)
+        self._weights = np.zeros(0)
+        self._buffer = []
+        self._count = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+
+    def __len__(self):
+        return int(self._count + len(self._buffer))
+
+    @property
+    def count(self) -> int:
+        return len(self)
+
+    def add(self, value: float):
+        self._buffer.append(float(value))
+        if len(self._buffer) >= self.compression * 5:
+            self._compress()
+
+    def add_many(self, values):
+        self._buffer.extend(float(v) for v in values)
+        if len(self._buffer) >= self.compression * 5:
+            self._compress()
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        #Fold another digest into this one (both keep their own accuracy guarantees)
+        other._compress()
+        if len(other._means) == 0:
+            return self
+        self._compress()
+        self._combine(other._means, other._weights)
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        return self
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        values = np.asarray(self._buffer)
+        self._buffer = []
+        self._min = min(self._min, float(values.min()))
+        self._max = max(self._max, float(values.max()))
+        self._combine(values, np.ones(values.size))
+
+    def _combine(self, means, weights):
+        means = np.concatenate([self._means, means])
+        weights = np.concatenate([self._weights, weights])
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+
+        total = weights.sum()
+        # Each centroid goes into the scale-function bucket of its cumulative midpoint;
+        # buckets are narrow at the tails and wide at the median, as in the t-digest paper
+        q_mid = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / math.pi * np.arcsin(2 * q_mid - 1)
+        bucket = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+
+        merged_weights = np.add.reduceat(weights, starts)
+        self._means = np.add.reduceat(means * weights, starts) / merged_weights
+        self._weights = merged_weights
+        self._count = float(total)
+
+    def quantile(self, q: float) -> float:
+        #Value below which a fraction q of the samples fall
+        self._compress()
+        if self._count == 0:
+            return 0.0
+        if len(self._means) == 1:
+            return float(self._means[0])
+        centers = np.cumsum(self._weights) - self._weights / 2
+        xp = np.r_[0.0, centers, self._count]
+        fp = np.r_[self._min, self._means, self._max]
+        return float(np.interp(min(max(q, 0.0), 1.0) * self._count, xp, fp))
+
+    def percentile_of(self, value: float) -> float:
+        #Percentile rank (0-100) of a value within the sketched distribution
+        self._compress()
+        if self._count == 0:
+            return 50.0
+        if value <= self._min:
+            return 0.0
+        if value >= self._max:
+            return 100.0
+        centers = np.cumsum(self._weights) - self._weights / 2
+        xp = np.r_[self._min, self._means, self._max]
+        fp = np.r_[0.0, centers, self._count]
+        return float(np.interp(value, xp, fp) / self._count * 100)
+
+    def to_dict(self) -> dict:
+        self._compress()
+        return {
+            'compression': self.compression,
+            'means': self._means.tolist(),
+            'weights': self._weights.tolist(),
+            'min': self._min,
+            'max': self._max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'TDigest':
+        digest = cls(data.get('compression', DIGEST_COMPRESSION))
+        digest._means = np.asarray(data.get('means', []), dtype=float)
+        digest._weights = np.asarray(data.get('weights', []), dtype=float)
+        digest._count = float(digest._weights.sum())
+        digest._min = data.get('min', math.inf)
+        digest._max = data.get('max', -math.inf)
+        return digest
+
+
+class PopulationStats:
+    #Per-role / per-champion t-digests over every participant the app has seen.
+    #Memory is bounded by (metrics x (roles + champions)) digests plus the seen-match window.
+
+    def __init__(self, compression: int = DIGEST_COMPRESSION, max_seen_matches: int = MAX_SEEN_MATCHES):
+        self.compression = compression
+        self.max_seen_matches = max_seen_matches
+        self._digests = {}
+        self._seen_matches = OrderedDict()
+        self.participants_ingested = 0
+        # Shared across Streamlit sessions, so ingestion and queries are serialized
+        self._lock = threading.RLock()
+
+    def _digest(self, key) -> TDigest:
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = TDigest(self.compression)
+        return digest
+
+    def ingest_matches(self, raw_matches: list) -> int:
+        #Stream the other 9 participants of each new match into the sketches.
+        #Returns how many matches were new.
+        with self._lock:
+            return self._ingest(raw_matches)
+
+    def _ingest(self, raw_matches: list) -> int:
+        pending = {}
+        new_matches = 0
+
+        for match in raw_matches:
+            match_id = match.get('matchId')
+            if not match_id or match_id in self._seen_matches:
+                continue
+            self._seen_matches[match_id] = True
+            if len(self._seen_matches) > self.max_seen_matches:
+                self._seen_matches.popitem(last=False)
+            new_matches += 1
+
+            for p in match.get('participants', []):
+                # The player's own games would bias their percentile towards themselves
+                if p.get('puuid') == match.get('puuid'):
+                    continue
+                role = p.get('teamPosition') or 'UNKNOWN'
+                champion = p.get('championName', 'Unknown')
+                challenges = p.get('challenges', {})
+                self.participants_ingested += 1
+
+                for metric, source_key, scale in POPULATION_METRICS:
+                    value = challenges.get(source_key)
+                    if value is None:
+                        continue
+                    value = value * scale
+                    pending.setdefault((metric, 'all', ''), []).append(value)
+                    pending.setdefault((metric, 'role', role), []).append(value)
+                    pending.setdefault((metric, 'champion', champion), []).append(value)
+
+        for key, values in pending.items():
+            self._digest(key).add_many(values)
+
+        return new_matches
+
+    def merge(self, other: 'PopulationStats') -> 'PopulationStats':
+        with self._lock:
+            self._merge(other)
+        return self
+
+    def _merge(self, other: 'PopulationStats'):
+        for key, digest in other._digests.items():
+            self._digest(key).merge(digest)
+        for match_id in other._seen_matches:
+            self._seen_matches[match_id] = True
+        while len(self._seen_matches) > self.max_seen_matches:
+            self._seen_matches.popitem(last=False)
+        self.participants_ingested += other.participants_ingested
+
+    def _lookup(self, metric: str, role: str = None, champion: str = None):
+        #Most specific sketch with enough samples: champion, then role, then everyone
+        candidates = []
+        if champion:
+            candidates.append((metric, 'champion', champion))
+        if role:
+            candidates.append((metric, 'role', role))
+        candidates.append((metric, 'all', ''))
+
+        for key in candidates:
+            digest = self._digests.get(key)
+            if digest is not None and digest.count >= MIN_POPULATION_SAMPLES:
+                return digest
+        return None
+
+    def quantile(self, metric: str, q: float, role: str = None, champion: str = None, default: float = None):
+        with self._lock:
+            digest = self._lookup(metric, role, champion)
+            return digest.quantile(q) if digest is not None else default
+
+    def median(self, metric: str, role: str = None, champion: str = None, default: float = None):
+        return self.quantile(metric, 0.5, role, champion, default)
+
+    def percentile(self, metric: str, value: float, role: str = None, champion: str = None):
+        #Percentile rank of value among the population, or None if there is not enough data yet
+        with self._lock:
+            digest = self._lookup(metric, role, champion)
+            return digest.percentile_of(value) if digest is not None else None
+
+    def sample_count(self, metric: str, role: str = None, champion: str = None) -> int:
+        with self._lock:
+            digest = self._lookup(metric, role, champion)
+            return digest.count if digest is not None else 0
+
+    def summary(self) -> dict:
+        return {
+            'matches_seen': len(self._seen_matches),
+            'participants_ingested': self.participants_ingested,
+            'sketches': len(self._digests),
+        }
+
+
+def population_baseline(population, metric: str, default: float, role: str = None, champion: str = None) -> float:
+    #Median from the population sketches, falling back to the hard-coded benchmark
+    if population is None:
+        return default
+    return population.median(metric, role=role, champion=champion, default=default)
+
+
+def calculate_population_percentiles(raw_matches: list, population, primary_role: str = None) -> dict:
+    #Where the player's per-game averages sit among everyone else in the same role
+    if population is None or not raw_matches:
+        return {'has_population_data': False}
+
+    # Only compare games played in that role, e.g. jungle CS against other junglers
+    role_matches = [m for m in raw_matches if m.get('teamPosition') == primary_role] if primary_role else raw_matches
+
+    percentiles = {}
+    for metric, source_key, scale in POPULATION_METRICS:
+        values = [m.get('challenges', {}).get(source_key) for m in role_matches]
+        values = [v * scale for v in values if v is not None]
+        if not values:
+            continue
+        player_avg = sum(values) / len(values)
+        rank = population.percentile(metric, player_avg, role=primary_role)
+        if rank is None:
+            continue
+        percentiles[metric] = {
+            'player_avg': player_avg,
+            'population_median': population.median(metric, role=primary_role),
+            'percentile': rank,
+            'sample_size': population.sample_count(metric, role=primary_role),
+        }
+
+    return {
+        'has_population_data': bool(percentiles),
+        'role': primary_role,
+        'games_compared': len(role_matches),
+        'metrics': percentiles,
+    }
@@ -0,0 +1,178 @@
+import json
+from collections.abc import Mapping
+
+# Rough chars-per-token ratio for compact JSON (close enough to budget Bedrock prompts)
+CHARS_PER_TOKEN = 4
+
+# Default budget for a whole rich context dropped into a prompt
+DEFAULT_CONTEXT_TOKEN_BUDGET = 6000
+
+# Rich context sections in the order they are worth spending tokens on; unlisted sections go last
+CONTEXT_SECTION_PRIORITY = [
+    'overview',
+    'role_consistency',
+    'combat_stats',
+    'win_loss_comparison',
+    'performance_trends',
+    'session_analysis',
+    'laner_performance',
+    'jungle_performance',
+    'support_performance',
+    'early_game_analysis',
+    'early_game_jungle_analysis',
+    'early_game_support_analysis',
+    'population_percentiles',
+    'champion_pool',
+    'farming_economy',
+    'vision_control',
+    'combat_efficiency',
+    'objective_control',
+    'objective_control_by_outcome',
+    'damage_profile',
+    'damage_efficiency',
+    'champion_details',
+    'matchup_data',
+    'opponent_stats',
+    'role_analysis',
+    'recent_matches',
+    'match_history',
+]
+
+# Verbose key fragments and their short forms (applied to snake_case and camelCase keys)
+KEY_ABBREVIATIONS = [
+    ('Percentage', 'Pct'),
+    ('percentage', 'pct'),
+    ('percent', 'pct'),
+    ('Participation', 'Part'),
+    ('participation', 'part'),
+    ('PerMinute', 'PerMin'),
+    ('per_minute', 'per_min'),
+    ('Minutes', 'Min'),
+    ('minutes', 'min'),
+    ('average', 'avg'),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def compact_key(key) -> str:
+    key = str(key)
+    for long, short in KEY_ABBREVIATIONS:
+        key = key.replace(long, short)
+    return key
+
+
+def round_number(value: float):
+    #Keep ~3 significant figures: 23456.78 -> 23457, 54.321 -> 54.3, 3.4567 -> 3.46
+    if value != value or value in (float('inf'), float('-inf')):
+        return None
+    magnitude = abs(value)
+    if magnitude >= 100:
+        return int(round(value))
+    rounded = round(value, 1 if magnitude >= 10 else 2)
+    return int(rounded) if rounded == int(rounded) else rounded
+
+
+def _is_default(value) -> bool:
+    # Zero / empty / missing values carry no information for the model (booleans are kept)
+    if value is None:
+        return True
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value == 0:
+        return True
+    return isinstance(value, (str, list, tuple, dict)) and len(value) == 0
+
+
+def compact_payload(obj, drop_defaults: bool = True):
+    #Rounded, key-compacted copy of a context/tool payload with zero and empty fields removed
+    if isinstance(obj, Mapping):
+        result = {}
+        for key, value in obj.items():
+            value = compact_payload(value, drop_defaults)
+            if drop_defaults and _is_default(value):
+                continue
+            result[compact_key(key)] = value
+        return result
+    if isinstance(obj, (list, tuple)):
+        return [compact_payload(v, drop_defaults) for v in obj]
+    if isinstance(obj, bool) or obj is None or isinstance(obj, str):
+        return obj
+    if hasattr(obj, 'item'):
+        # numpy / pandas scalars
+        return compact_payload(obj.item(), drop_defaults)
+    if isinstance(obj, int):
+        return obj
+    if isinstance(obj, float):
+        return round_number(obj)
+    return str(obj)
+
+
+def to_compact_json(obj) -> str:
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def _fit_section(value, budget_chars: int):
+    #Largest prefix of a dict (or most recent tail of a list) that fits in budget_chars
+    if isinstance(value, list):
+        kept, used = [], 2
+        for item in reversed(value):
+            size = len(to_compact_json(item)) + 1
+            if used + size > budget_chars:
+                break
+            kept.append(item)
+            used += size
+        return list(reversed(kept)) if kept else None
+    if isinstance(value, dict):
+        kept, used = {}, 2
+        for key, item in value.items():
+            size = len(to_compact_json({key: item}))
+            if used + size > budget_chars:
+                break
+            kept[key] = item
+            used += size - 1
+        return kept or None
+    return None
+
+
+def serialize_for_prompt(context, token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET,
+                         priorities: list = None) -> tuple:
+    #Compact JSON of the context within token_budget; returns (text, estimated_tokens).
+    #Sections are added in priority order; the first one that does not fit is trimmed
+    #(most recent list items / leading dict entries) and anything left is listed under '_omitted'.
+    #Lazy contexts only build the sections that end up in the prompt.
+    if not context:
+        return '{}', 1
+
+    priorities = CONTEXT_SECTION_PRIORITY if priorities is None else priorities
+    rank = {name: i for i, name in enumerate(priorities)}
+    names = sorted(context.keys(), key=lambda name: rank.get(name, len(rank)))
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    # Leave room for the omitted-sections note
+    used = 2 + 256
+    sections, omitted = {}, []
+
+    for name in names:
+        if used >= budget_chars:
+            omitted.append(name)
+            continue
+        value = compact_payload(context[name])
+        if _is_default(value):
+            continue
+        key = compact_key(name)
+        size = len(to_compact_json({key: value}))
+        if used + size > budget_chars:
+            value = _fit_section(value, budget_chars - used - len(key) - 4)
+            if value is None:
+                omitted.append(name)
+                continue
+            size = len(to_compact_json({key: value}))
+            omitted.append(f'{name} (partial)')
+        sections[key] = value
+        used += size
+
+    if omitted:
+        sections['_omitted'] = omitted
+    text = to_compact_json(sections)
+    return text, estimate_tokens(text)
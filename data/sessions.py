@@ -0,0 +1,136 @@
+import numpy as np
+
+# A gap longer than this between one game's end and the next game's start starts a new play session
+SESSION_GAP_MINUTES = 45
+
+# Games 1..N-1 in a session are reported individually, everything after is bucketed as "N+"
+MAX_TRACKED_SESSION_GAME = 5
+
+
+def segment_sessions(start_timestamps, end_timestamps, gap_minutes: int = SESSION_GAP_MINUTES):
+    #Split a chronological list of games into play sessions from timestamp gaps (ms).
+    #Returns (session_id, game_in_session) arrays; ids start at 0, positions start at 1.
+    start = np.asarray(start_timestamps, dtype=np.int64)
+    end = np.asarray(end_timestamps, dtype=np.int64)
+    if start.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # Older cached matches may lack an end timestamp - fall back to the start
+    end = np.where(end > 0, end, start)
+
+    new_session = np.empty(start.size, dtype=bool)
+    new_session[0] = True
+    new_session[1:] = (start[1:] - end[:-1]) > gap_minutes * 60 * 1000
+
+    session_id = np.cumsum(new_session) - 1
+    session_starts = np.flatnonzero(new_session)
+    game_in_session = np.arange(start.size) - session_starts[session_id] + 1
+    return session_id, game_in_session
+
+
+def tag_sessions(df, gap_minutes: int = SESSION_GAP_MINUTES):
+    #Add SessionId / SessionGame columns to the chronological match DataFrame (in place)
+    if 'GameStart' not in df or len(df) == 0:
+        df['SessionId'] = 0
+        df['SessionGame'] = np.arange(1, len(df) + 1)
+        return df
+
+    end = df['GameEnd'] if 'GameEnd' in df else df['GameStart']
+    session_id, game_in_session = segment_sessions(df['GameStart'].to_numpy(), end.to_numpy(), gap_minutes)
+    df['SessionId'] = session_id
+    df['SessionGame'] = game_in_session
+    return df
+
+
+def _group_means(values, groups, n_groups):
+    #Per-group mean with bincount; empty groups come back as 0
+    counts = np.bincount(groups, minlength=n_groups)
+    sums = np.bincount(groups, weights=values, minlength=n_groups)
+    means = np.divide(sums, counts, out=np.zeros(n_groups), where=counts > 0)
+    return counts, means
+
+
+def calculate_session_stats(df) -> dict:
+    #Per-session aggregates: win rate by game number in a session and how performance
+    #changes right after a win or a loss (tilt). Expects tag_sessions() to have run.
+    if len(df) == 0 or 'SessionId' not in df or not (df.get('GameStart', 0) > 0).all():
+        return {'has_session_data': False}
+
+    win = df['Win'].to_numpy(dtype=float)
+    kda = df['KDA'].to_numpy(dtype=float)
+    deaths = df['Deaths'].to_numpy(dtype=float)
+    session_id = df['SessionId'].to_numpy()
+    game_in_session = df['SessionGame'].to_numpy()
+
+    session_lengths = np.bincount(session_id)
+    session_wins = np.bincount(session_id, weights=win)
+
+    # Win rate / KDA by game number within the session
+    bucket = np.minimum(game_in_session, MAX_TRACKED_SESSION_GAME) - 1
+    counts, wr_by_game = _group_means(win, bucket, MAX_TRACKED_SESSION_GAME)
+    _, kda_by_game = _group_means(kda, bucket, MAX_TRACKED_SESSION_GAME)
+    _, deaths_by_game = _group_means(deaths, bucket, MAX_TRACKED_SESSION_GAME)
+
+    by_game_number = []
+    for i in range(MAX_TRACKED_SESSION_GAME):
+        if counts[i] == 0:
+            continue
+        label = str(i + 1) if i + 1 < MAX_TRACKED_SESSION_GAME else f"{MAX_TRACKED_SESSION_GAME}+"
+        by_game_number.append({
+            'game_number': label,
+            'games': int(counts[i]),
+            'win_rate': float(wr_by_game[i] * 100),
+            'avg_kda': float(kda_by_game[i]),
+            'avg_deaths': float(deaths_by_game[i]),
+        })
+
+    # Games that follow another game in the same session, split by the previous result
+    follows = np.zeros(len(df), dtype=bool)
+    follows[1:] = session_id[1:] == session_id[:-1]
+    prev_win = np.zeros(len(df))
+    prev_win[1:] = win[:-1]
+    after_win = follows & (prev_win == 1)
+    after_loss = follows & (prev_win == 0)
+
+    # Two losses in a row inside the same session before this game
+    after_two_losses = np.zeros(len(df), dtype=bool)
+    after_two_losses[2:] = (
+        after_loss[2:] & follows[1:-1] & (win[:-2] == 0)
+    )
+
+    def outcome_stats(mask):
+        n = int(mask.sum())
+        if n == 0:
+            return {'games': 0, 'win_rate': 0, 'avg_kda': 0, 'avg_deaths': 0}
+        return {
+            'games': n,
+            'win_rate': float(win[mask].mean() * 100),
+            'avg_kda': float(kda[mask].mean()),
+            'avg_deaths': float(deaths[mask].mean()),
+        }
+
+    overall_wr = float(win.mean() * 100)
+    after_win_stats = outcome_stats(after_win)
+    after_loss_stats = outcome_stats(after_loss)
+    after_two_losses_stats = outcome_stats(after_two_losses)
+
+    # Tilt: results drop sharply once the player keeps queuing after losses
+    tilt_gap = overall_wr - after_two_losses_stats['win_rate'] if after_two_losses_stats['games'] >= 5 else 0
+    tilt_risk = 'high' if tilt_gap >= 15 else 'moderate' if tilt_gap >= 7 else 'low'
+
+    return {
+        'has_session_data': True,
+        'gap_minutes': SESSION_GAP_MINUTES,
+        'total_sessions': int(session_lengths.size),
+        'avg_games_per_session': float(session_lengths.mean()),
+        'longest_session': int(session_lengths.max()),
+        'single_game_sessions': int((session_lengths == 1).sum()),
+        'best_session_win_rate': float((session_wins / session_lengths)[session_lengths >= 3].max() * 100) if (session_lengths >= 3).any() else 0,
+        'overall_win_rate': overall_wr,
+        'win_rate_by_game_number': by_game_number,
+        'after_win': after_win_stats,
+        'after_loss': after_loss_stats,
+        'after_two_losses': after_two_losses_stats,
+        'kda_decay_after_loss': after_loss_stats['avg_kda'] - after_win_stats['avg_kda'],
+        'tilt_risk': tilt_risk,
+    }
@@ -0,0 +1,115 @@
+import numpy as np
+
+# Default smoothing for the trend charts: a 10-game trailing window and an EWMA with a 10-game span
+TREND_WINDOW = 10
+EWMA_SPAN = 10
+
+
+def rolling_mean(values, window: int = TREND_WINDOW) -> np.ndarray:
+    #Trailing rolling mean computed from one cumulative sum (O(n), no Python loop).
+    #The first window-1 points average over the games available so far instead of being NaN.
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return values
+
+    window = max(1, int(window))
+    csum = np.cumsum(values)
+    lagged = np.zeros_like(csum)
+    lagged[window:] = csum[:-window]
+    counts = np.minimum(np.arange(1, values.size + 1), window)
+    return (csum - lagged) / counts
+
+
+def ewma(values, span: int = EWMA_SPAN, block: int = 256) -> np.ndarray:
+    #Exponentially weighted moving average (same as pandas ewm(span, adjust=False)).
+    #Each block is solved in closed form with a cumulative sum; rescaling per block keeps
+    #decay**-k inside float64 range even for long histories and short spans.
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return values
+
+    alpha = 2.0 / (max(1, span) + 1.0)
+    decay = 1.0 - alpha
+    if decay <= 0:
+        return values.copy()
+
+    # Largest block for which decay**-block stays below ~1e150
+    block = max(1, min(block, int(150 / -np.log10(decay))))
+
+    out = np.empty_like(values)
+    prev = values[0]
+    for start in range(0, values.size, block):
+        chunk = values[start:start + block]
+        powers = decay ** np.arange(chunk.size)
+        # y_k = decay^(k+1) * prev + alpha * decay^k * sum_{i<=k} x_i / decay^i
+        chunk_out = decay * powers * prev + alpha * powers * np.cumsum(chunk / powers)
+        out[start:start + chunk.size] = chunk_out
+        prev = chunk_out[-1]
+    return out
+
+
+def calculate_trend_series(df, window: int = TREND_WINDOW, span: int = EWMA_SPAN) -> dict:
+    #Rolling/EWMA series over the full (chronological) match DataFrame.
+    #Returns plain NumPy arrays so callers can chart them or take the latest values cheaply.
+    if df is None or len(df) == 0:
+        return {'games': 0, 'window': window, 'span': span}
+
+    win = df['Win'].to_numpy(dtype=float)
+    kda = df['KDA'].to_numpy(dtype=float)
+    deaths = df['Deaths'].to_numpy(dtype=float)
+    minutes = df['Minutes'].to_numpy(dtype=float) if 'Minutes' in df else np.zeros(len(df))
+    cs = df['CS'].to_numpy(dtype=float) if 'CS' in df else np.zeros(len(df))
+    vision = df['Vision'].to_numpy(dtype=float) if 'Vision' in df else np.zeros(len(df))
+
+    cs_per_min = np.divide(cs, minutes, out=np.zeros_like(cs), where=minutes > 0)
+
+    return {
+        'games': len(df),
+        'window': window,
+        'span': span,
+        'match_number': np.arange(1, len(df) + 1),
+        'rolling_win_rate': rolling_mean(win, window) * 100,
+        'ewma_kda': ewma(kda, span),
+        'rolling_cs_per_min': rolling_mean(cs_per_min, window),
+        'rolling_deaths': rolling_mean(deaths, window),
+        'rolling_vision': rolling_mean(vision, window),
+    }
+
+
+def summarize_trends(trend_series: dict) -> dict:
+    #Latest value of each series and its change over the last window (for metrics and AI tools)
+    games = trend_series.get('games', 0)
+    if games == 0:
+        return {'has_trend_data': False}
+
+    window = trend_series['window']
+    # Compare against the last point of the previous window, or the first game for short histories
+    previous_index = max(0, games - 1 - window)
+
+    summary = {
+        'has_trend_data': True,
+        'games': games,
+        'window': window,
+        'ewma_span': trend_series['span'],
+    }
+    for key in ['rolling_win_rate', 'ewma_kda', 'rolling_cs_per_min', 'rolling_deaths', 'rolling_vision']:
+        series = trend_series[key]
+        current = float(series[-1])
+        previous = float(series[previous_index])
+        summary[key] = {
+            'current': current,
+            'previous': previous,
+            'change': current - previous,
+            'best': float(series.max()),
+            'worst': float(series.min()),
+        }
+
+    # Fewer deaths is an improvement, everything else improves upwards
+    improving = (
+        (summary['rolling_win_rate']['change'] > 0)
+        + (summary['ewma_kda']['change'] > 0)
+        + (summary['rolling_cs_per_min']['change'] > 0)
+        + (summary['rolling_deaths']['change'] < 0)
+    )
+    summary['direction'] = 'improving' if improving >= 3 else 'declining' if improving <= 1 else 'stable'
+    return summary
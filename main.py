@@ -18,12 +18,16 @@ from ui.overview_component import (
 )
 from ui.match_history_component import render_match_history
 from utils.helpers import filter_matches_by_queue
+from utils.user_cache import get_user_cache
 from utils.queue_filters import (
     prepare_all_filtered_data,
     display_queue_filter_badge,
+    sync_filtered_context,
 )
 
-from agents.playstyle_agent import generate_playstyle_description
+from agents.prefetch import AI_PREFETCH_ENABLED
+from ui.ai_session import reset_session_coach, start_session_prefetch, start_playstyle_job
+from agents.telemetry import configure_telemetry
 from ui.styles import (
     apply_global_styles,
     apply_welcome_background_styles, 
@@ -31,12 +35,14 @@ from ui.styles import (
     altair_chart_mobile_responsiveness,
 )
 from ui.welcome_component import render_welcome_page
+from ui.agent_debug_component import display_agent_debug_panel
 from api.riot_api import(
     get_match_ids_by_puuid,
     get_match_details_by_matchId
 )
 
 altair_chart_mobile_responsiveness()
+configure_telemetry()
 
 
 load_dotenv()
@@ -60,10 +66,6 @@ if not all([RIOT_API_KEY, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY]):
     st.stop()
 
 # ============ SESSION STATE ============
-MAX_CACHED_USERS = 5
-if 'user_cache' not in st.session_state:
-    st.session_state.user_cache = {}
-
 if 'raw_matches' not in st.session_state:
     st.session_state.raw_matches = None
 if 'rich_context' not in st.session_state:
@@ -89,6 +91,7 @@ max_matches = 100
 st.sidebar.markdown("---")
 fetch_button = st.sidebar.button(" :material/search:    Fetch & Analyze Data", type="primary")
 st.sidebar.info(" :material/lightbulb:    **Tip:** Enter your Game Name and Tag Line separately. Don't include the '#' symbol!")
+display_agent_debug_panel()
 
 # ============ DATA FETCHING ============
 
@@ -109,20 +112,22 @@ if fetch_button and riot_id and tag_line:
     # Clear welcome page background styling
     remove_welcome_background_styles()
 
-    if user_key in st.session_state.user_cache:
+    # Shared by every session, so a player fetched in another tab is served from memory too
+    cached_data = get_user_cache().get(user_key)
+    if cached_data is not None:
         try:
             with st.spinner("Checking for new matches..."):
                 # Get account PUUID
                 from api.riot_api import  get_match_ids_by_puuid, get_match_details_by_matchId
                 
-                temp_puuid = st.session_state.user_cache[user_key]['puuid']
+                temp_puuid = cached_data['puuid']
                 latest_match_ids = get_match_ids_by_puuid(region, temp_puuid, count=1)
                 
                 if 'error' not in latest_match_ids and len(latest_match_ids) > 0:
 
                     latest_match_id = latest_match_ids[0]
                     # Get the most recent match ID from cache
-                    cached_matches = st.session_state.user_cache[user_key]['raw_matches']
+                    cached_matches = cached_data['raw_matches']
                     if len(cached_matches) > 0:
 
                         cached_game_id = cached_matches[0].get('matchId', "")
@@ -135,7 +140,6 @@ if fetch_button and riot_id and tag_line:
 
                                 should_fetch_new = False
                                 
-                                cached_data = st.session_state.user_cache[user_key]
                                 st.session_state.raw_matches = cached_data['raw_matches']
                                 st.session_state.solo_matches = cached_data['solo_matches']
                                 st.session_state.flex_matches = cached_data['flex_matches']
@@ -160,6 +164,7 @@ if fetch_button and riot_id and tag_line:
                                 
                                 # Clear chat history for new session
                                 st.session_state.chat_history = []
+                                reset_session_coach()
                                 st.session_state.context_provided = False
                                 st.session_state.current_filtered_context = None
                                 
@@ -241,12 +246,6 @@ if fetch_button and riot_id and tag_line:
 
                             st.session_state.full_match_details = []
                             
-                            #Before saving, check if max cache limit is not reached
-                            if len(st.session_state.user_cache) >= MAX_CACHED_USERS and user_key not in st.session_state.user_cache:
-                                oldest_key = next(iter(st.session_state.user_cache))
-                                del st.session_state.user_cache[oldest_key]
-
-
                             #Saving to cache
                             st.session_state.current_user_id = user_key
 
@@ -261,7 +260,8 @@ if fetch_button and riot_id and tag_line:
                                 if show_key in st.session_state:
                                     summary_cache[show_key] = st.session_state[show_key]
 
-                            st.session_state.user_cache[user_key] = {
+                            # Least recently used players are evicted once the cache passes its memory budget
+                            get_user_cache().set(user_key, {
                                 'raw_matches': st.session_state.raw_matches,
                                 'solo_matches': st.session_state.solo_matches,
                                 'flex_matches': st.session_state.flex_matches,
@@ -274,7 +274,7 @@ if fetch_button and riot_id and tag_line:
                                 'total_games': st.session_state.total_games,
                                 'playstyle_cache': None,
                                 'summary_cache': summary_cache,
-                            }
+                            })
 
                         except Exception as e:
                             st.session_state.raw_matches = all_matches
@@ -326,46 +326,58 @@ if "raw_matches" in st.session_state and st.session_state.raw_matches:
         st.info("Try selecting a different game mode filter or play some matches in this queue.")
         st.stop()
     
-    # Unpack data package for easy access
-    df = data_package['df']
-    metrics = data_package['metrics']
-    early_late_stats = data_package['early_late_stats']
-    champ_insights = data_package['champ_insights']
-    dominance_score = data_package['dominance_score']
-    filtered_matches = data_package['filtered_matches']
+    # Only the counts are read up front; everything else is pulled lazily by the tab that renders it
     filtered_game_count = data_package['filtered_count']
     solo_count = data_package['solo_count']
     flex_count = data_package['flex_count']
     total_count = data_package['total_count']
-    jungle_advanced = data_package['jungle_advanced']
-    support_advanced = data_package['support_advanced']
-    support_early_stats = data_package['support_early_stats']
-    support_dominance_score = data_package['support_dominance_score']
-    jungle_early_stats = data_package['jungle_early_stats']
-    jungle_dominance_score = data_package['jungle_dominance_score']
-    playstyle_tags = data_package['playstyle_tags']
-    objective_score = data_package['objective_score']
-    persistence_score = data_package['persistence_score']
-    laner_advanced = data_package['laner_advanced']
 
     current_user_id = st.session_state.get('current_user_id', 'unknown')
+
+    # Optionally generate the playstyle and every page summary concurrently in the background,
+    # so they are ready (in the response cache) by the time the user opens a page
+    if AI_PREFETCH_ENABLED:
+        prefetch_context = sync_filtered_context(data_package)
+        if prefetch_context and data_package['champ_insights'] is not None:
+            # Page metrics must match what each page passes to its summary button (same cache key)
+            prefetch_pages = {'champion_insights': None, 'matchup_analysis': None}
+            if filtered_game_count >= 10:
+                from ui.advanced_stats_component import build_advanced_stats_metrics
+                from ui.performance_trends import build_performance_metrics
+
+                prefetch_pages['advanced_stats'] = build_advanced_stats_metrics(
+                    data_package['metrics'],
+                    data_package['role_info'].get('primary_role', 'UNKNOWN'),
+                    data_package['dominance_score'],
+                    data_package['objective_score'],
+                    data_package['persistence_score'],
+                    data_package['laner_advanced'],
+                    data_package['jungle_advanced'],
+                    data_package['support_advanced'],
+                )
+                prefetch_pages['early_late'] = None
+                prefetch_pages['performance_trends'] = build_performance_metrics(data_package['metrics'])
+            start_session_prefetch(
+                (current_user_id, queue_type, filtered_game_count),
+                prefetch_context,
+                data_package['champ_insights'],
+                prefetch_pages,
+            )
     
     
-    if fetch_button and user_key in st.session_state.user_cache and st.session_state.user_cache[user_key]['playstyle_cache'] == None:
+    cached_user = get_user_cache().peek(user_key) if fetch_button else None
+    if cached_user is not None and cached_user['playstyle_cache'] is None:
         st.session_state.playstyle = None
 
-        if st.session_state.current_filtered_context and champ_insights is not None:
-            from agents.context_manager import set_context
-            set_context(st.session_state.current_filtered_context, champ_insights)
-            if st.session_state.playstyle is None:
-                with st.spinner(" :material/pending:   Analyzing your performance"):
-                    playstyle_tuple = generate_playstyle_description()
-                    st.session_state.playstyle = playstyle_tuple
-                    if user_key in st.session_state.user_cache:
-                        st.session_state.user_cache[user_key]['playstyle_cache'] = playstyle_tuple
+        filtered_context = sync_filtered_context(data_package)
+        champ_insights = data_package['champ_insights']
+        if filtered_context and champ_insights is not None:
+            # Generated in the background (reusing the prefetch job if there is one); the overview
+            # shows the local playstyle and polls until this lands in the user's playstyle_cache
+            start_playstyle_job(user_key, filtered_context, champ_insights)
 
     # Get role consistency for conditional displays
-    role_info = st.session_state.current_filtered_context.get('role_consistency', {}) if st.session_state.current_filtered_context else {}
+    role_info = data_package['role_info']
     primary_role = role_info.get('primary_role', 'UNKNOWN')
     secondary_role = role_info.get('secondary_role', 'NONE')
     
@@ -387,7 +399,7 @@ if "raw_matches" in st.session_state and st.session_state.raw_matches:
         
         # Display playstyle tags
         if filtered_game_count >= 10:
-            tags_html = display_playstyle_tags(playstyle_tags)
+            tags_html = display_playstyle_tags(data_package['playstyle_tags'])
             if tags_html:
                 st.markdown(tags_html, unsafe_allow_html=True)
 
@@ -429,6 +441,10 @@ if "raw_matches" in st.session_state and st.session_state.raw_matches:
     selected_tab = tab_names.index(selected_tab_name)
     st.session_state.selected_tab_index = selected_tab
 
+    # Every tab except Match History has AI summaries/coaching that read the filtered context
+    if selected_tab != 1:
+        sync_filtered_context(data_package)
+
     # ===== TAB 0: OVERVIEW =====
     if selected_tab == 0:
         render_overview_tab(data_package, queue_type)
@@ -437,7 +453,7 @@ if "raw_matches" in st.session_state and st.session_state.raw_matches:
 
         # Update session state temporarily for match history rendering
         original_matches = st.session_state.get('raw_matches')
-        st.session_state.raw_matches = filtered_matches
+        st.session_state.raw_matches = data_package['filtered_matches']
         render_match_history()
         st.session_state.raw_matches = original_matches  # Restore
 
@@ -445,7 +461,7 @@ if "raw_matches" in st.session_state and st.session_state.raw_matches:
     elif selected_tab == 2:
         from ui.champion_insights_component import render_champion_insights
 
-        render_champion_insights(champ_insights, metrics) 
+        render_champion_insights(data_package['champ_insights'], data_package['metrics']) 
         
 
     # ===== TAB 3: AI COACHING =====
@@ -461,17 +477,17 @@ if "raw_matches" in st.session_state and st.session_state.raw_matches:
         render_advanced_stats(
             filtered_game_count,
             selected_queue_display, 
-            metrics,
+            data_package['metrics'],
             primary_role,
-            dominance_score,
-            jungle_advanced,
-            support_advanced,
+            data_package['dominance_score'],
+            data_package['jungle_advanced'],
+            data_package['support_advanced'],
             is_laner,
             is_jungler,
             is_support,
-            objective_score,
-            persistence_score,
-            laner_advanced,
+            data_package['objective_score'],
+            data_package['persistence_score'],
+            data_package['laner_advanced'],
         )
         
     # ===== TAB 5: EARLY VS LATE GAME =====
@@ -482,14 +498,14 @@ if "raw_matches" in st.session_state and st.session_state.raw_matches:
             filtered_game_count,
             selected_queue_display,
             is_laner,
-            early_late_stats,
+            data_package['early_late_stats'],
             is_jungler,
             is_support,
-            jungle_early_stats,
-            support_early_stats,
-            dominance_score,
-            jungle_dominance_score,
-            support_dominance_score,
+            data_package['jungle_early_stats'],
+            data_package['support_early_stats'],
+            data_package['dominance_score'],
+            data_package['jungle_dominance_score'],
+            data_package['support_dominance_score'],
         )
 
     # ===== TAB 6: MATCHUP ANALYSIS =====
@@ -502,7 +518,13 @@ if "raw_matches" in st.session_state and st.session_state.raw_matches:
     elif selected_tab == 7:
         from ui.performance_trends import render_performance_trends
 
-        render_performance_trends(filtered_game_count, selected_queue_display, df, metrics)
+        render_performance_trends(
+            filtered_game_count,
+            selected_queue_display,
+            data_package['df'],
+            data_package['metrics'],
+            data_package['trend_series'],
+        )
 
 #welcome page for when user first loads onto page
 if 'raw_matches' not in st.session_state or st.session_state.raw_matches is None or len(st.session_state.raw_matches) == 0:
@@ -0,0 +1,17 @@
+from .players import (
+    ServiceError,
+    sync_player,
+    compute_data_package,
+    generate_summary,
+    generate_playstyle,
+)
+from .app import app
+
+__all__ = [
+    'app',
+    'ServiceError',
+    'sync_player',
+    'compute_data_package',
+    'generate_summary',
+    'generate_playstyle',
+]
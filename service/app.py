@@ -0,0 +1,162 @@
+#Headless analytics API over the same engine and caches as the Streamlit app:
+#
+#    uvicorn service.app:app --host 0.0.0.0 --port 8000 --workers 4
+#
+#POST /players/{region}/{game_name}/{tag_line}/sync                  fetch (or refresh) a player
+#GET  /players/{region}/{game_name}/{tag_line}                       synced player summary
+#GET  /players/{region}/{game_name}/{tag_line}/data?queue=&nodes=    data package (metrics, insights...)
+#POST /players/{region}/{game_name}/{tag_line}/summaries/{page}      AI page summary
+#POST /players/{region}/{game_name}/{tag_line}/playstyle             AI playstyle
+
+import asyncio
+import contextlib
+import datetime
+from collections.abc import Mapping
+
+import orjson
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from agents.telemetry import configure_telemetry
+from service.players import (
+    PUBLIC_NODES,
+    SUMMARY_PAGES,
+    ServiceError,
+    compute_data_package,
+    generate_playstyle,
+    generate_summary,
+    get_player,
+    player_key,
+    player_summary,
+    sync_player,
+)
+
+
+def _json_default(obj):
+    # pandas / numpy values the metric engine returns
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient='records')
+    if isinstance(obj, pd.Series):
+        return obj.to_dict()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    if isinstance(obj, (datetime.date, pd.Timestamp)):
+        return obj.isoformat()
+    if hasattr(obj, 'item'):
+        return obj.item()
+    return str(obj)
+
+
+class ORJSONResponse(JSONResponse):
+    #JSON response that understands DataFrames and numpy values (NaN becomes null)
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
+
+def _player(request: Request) -> str:
+    params = request.path_params
+    return player_key(params['game_name'], params['tag_line'], params['region'])
+
+
+async def _body(request: Request) -> dict:
+    # Optional JSON object body
+    raw = await request.body()
+    if not raw:
+        return {}
+    try:
+        body = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        raise ServiceError(400, "Request body must be JSON")
+    if not isinstance(body, dict):
+        raise ServiceError(400, "Request body must be a JSON object")
+    return body
+
+
+def _latency_budget(request: Request):
+    # ?budget=seconds settles on the local answer when the model is slower; default waits for the model
+    budget = request.query_params.get('budget')
+    if budget is None:
+        return None
+    try:
+        return float(budget)
+    except ValueError:
+        raise ServiceError(400, "budget must be a number of seconds")
+
+
+async def health(request: Request):
+    return ORJSONResponse({'status': 'ok'})
+
+
+async def sync(request: Request):
+    body = await _body(request)
+    params = request.path_params
+    refresh = bool(body.get('refresh')) or request.query_params.get('refresh') == 'true'
+    return ORJSONResponse(await sync_player(params['game_name'], params['tag_line'], params['region'], refresh))
+
+
+async def player(request: Request):
+    user_key = _player(request)
+    return ORJSONResponse(player_summary(user_key, get_player(user_key), 'cache'))
+
+
+async def data(request: Request):
+    queue_type = request.query_params.get('queue', 'all')
+    nodes = [name for name in request.query_params.get('nodes', '').split(',') if name]
+    package = await asyncio.to_thread(compute_data_package, _player(request), queue_type, nodes)
+    return ORJSONResponse(package)
+
+
+async def summary(request: Request):
+    body = await _body(request)
+    queue_type = request.query_params.get('queue', 'all')
+    text = await asyncio.to_thread(
+        generate_summary, _player(request), queue_type, request.path_params['page'],
+        body.get('page_metrics'), _latency_budget(request),
+    )
+    return ORJSONResponse({'page': request.path_params['page'], 'queue': queue_type, 'summary': text})
+
+
+async def playstyle(request: Request):
+    queue_type = request.query_params.get('queue', 'all')
+    style, description = await asyncio.to_thread(
+        generate_playstyle, _player(request), queue_type, _latency_budget(request)
+    )
+    return ORJSONResponse({'queue': queue_type, 'style': style, 'description': description})
+
+
+async def nodes(request: Request):
+    return ORJSONResponse({'nodes': list(PUBLIC_NODES), 'summary_pages': list(SUMMARY_PAGES)})
+
+
+async def service_error(request: Request, exc: ServiceError):
+    headers = {'Retry-After': str(int(exc.retry_after))} if exc.retry_after else None
+    return ORJSONResponse({'error': str(exc)}, status_code=exc.status_code, headers=headers)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    configure_telemetry()
+    yield
+
+
+PLAYER = "/players/{region}/{game_name}/{tag_line}"
+
+routes = [
+    Route("/health", health),
+    Route("/nodes", nodes),
+    Route(PLAYER, player),
+    Route(PLAYER + "/sync", sync, methods=["POST"]),
+    Route(PLAYER + "/data", data),
+    Route(PLAYER + "/summaries/{page}", summary, methods=["POST"]),
+    Route(PLAYER + "/playstyle", playstyle, methods=["POST"]),
+]
+
+app = Starlette(routes=routes, exception_handlers={ServiceError: service_error}, lifespan=lifespan)
@@ -0,0 +1,232 @@
+import asyncio
+import os
+import threading
+
+import httpx
+from cachetools import LRUCache
+from dotenv import load_dotenv
+
+from agents.context_manager import player_context
+from agents.playstyle_agent import generate_playstyle_description
+from agents.summary_agent import PAGE_SUMMARY_TOOLS, generate_page_summary
+from data.lazy_context import LazyContext
+from api.riot_api import (
+    fetch_match_history_async,
+    get_account_puuid_by_riot_id_async,
+    get_league_entries_by_puuid,
+    get_match_ids_by_puuid_async,
+    get_profile_icon_url,
+    get_summonerInfo_by_puuid,
+)
+from utils.helpers import filter_matches_by_queue
+from utils.metric_engine import INTERNAL_NODES, METRIC_NODES, build_data_package, split_matches_by_queue
+from utils.user_cache import get_user_cache
+
+load_dotenv()
+
+# Recent ranked matches fetched per player (the UI fetches 100 too)
+SERVICE_MAX_MATCHES = int(os.getenv("SERVICE_MAX_MATCHES", 100))
+
+# Players whose computed metric graphs stay in memory; the least recently requested is dropped first
+SERVICE_GRAPH_PLAYERS = 64
+
+# Data package nodes the API can return (typed records and population sketches stay internal)
+PUBLIC_NODES = tuple(name for name in METRIC_NODES if name not in INTERNAL_NODES)
+
+SUMMARY_PAGES = tuple(PAGE_SUMMARY_TOOLS)
+
+
+class ServiceError(Exception):
+    #Request failure with the HTTP status (and optional Retry-After seconds) the API answers with
+
+    def __init__(self, status_code: int, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def player_key(game_name: str, tag_line: str, region: str) -> str:
+    #Same key the Streamlit app uses, so both share user cache entries when run in one process
+    return f"{game_name}#{tag_line}#{region.upper()}"
+
+
+def player_summary(user_key: str, entry: dict, source: str) -> dict:
+    raw_matches = entry['raw_matches']
+    return {
+        'player': user_key,
+        'riot_id': entry['riot_id'],
+        'tag_line': entry['tag_line'],
+        'puuid': entry['puuid'],
+        'profile_icon_url': get_profile_icon_url(entry['iconId']),
+        'rank': entry['rank_data'],
+        'total_games': entry['total_games'],
+        'solo_games': len(entry['solo_matches']),
+        'flex_games': len(entry['flex_matches']),
+        'latest_match_id': raw_matches[0].get('matchId') if raw_matches else None,
+        'source': source,
+    }
+
+
+def _raise_for_riot_error(result: dict, what: str):
+    if 'retry_after' in result:
+        raise ServiceError(503, f"Riot API rate limit hit while fetching {what}", result['retry_after'])
+    if 'error' in result:
+        status = 404 if result['error'] == "HTTP Error 404" else 502
+        raise ServiceError(status, f"Failed to fetch {what}: {result['error']}")
+
+
+async def _is_fresh(entry: dict, region: str, client: httpx.AsyncClient) -> bool:
+    # Cached data is fresh while the player's latest ranked match is still the newest one cached
+    latest = await get_match_ids_by_puuid_async(region, entry['puuid'], 1, client)
+    if not isinstance(latest, list) or not latest or not entry['raw_matches']:
+        return False
+    return latest[0] == entry['raw_matches'][0].get('matchId')
+
+
+async def sync_player(game_name: str, tag_line: str, region: str, refresh: bool = False) -> dict:
+    #Fetch a player's account, rank and recent matches into the shared caches (unless already fresh)
+    user_key = player_key(game_name, tag_line, region)
+    cache = get_user_cache()
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        cached = cache.get(user_key)
+        if cached is not None and not refresh and await _is_fresh(cached, region, client):
+            return player_summary(user_key, cached, 'cache')
+
+        account = await get_account_puuid_by_riot_id_async(game_name, tag_line, client)
+        _raise_for_riot_error(account, f"account {game_name}#{tag_line}")
+        puuid = account['puuid']
+
+        summoner, rank_data, matches = await asyncio.gather(
+            asyncio.to_thread(get_summonerInfo_by_puuid, region, puuid),
+            asyncio.to_thread(get_league_entries_by_puuid, region, puuid),
+            fetch_match_history_async(region, puuid, SERVICE_MAX_MATCHES, client),
+            return_exceptions=True,
+        )
+
+    if isinstance(matches, Exception):
+        raise ServiceError(502, str(matches))
+    if isinstance(summoner, Exception) or 'error' in summoner:
+        raise ServiceError(502, f"Found account but couldn't fetch summoner info: {summoner}")
+    if not matches:
+        raise ServiceError(404, f"{game_name}#{tag_line} has no recent ranked match history")
+    if isinstance(rank_data, Exception) or 'error' in rank_data:
+        rank_data = {'solo': None, 'flex': None}
+
+    # Same entry shape the Streamlit app caches
+    entry = {
+        'raw_matches': matches,
+        'solo_matches': filter_matches_by_queue(matches, 'solo'),
+        'flex_matches': filter_matches_by_queue(matches, 'flex'),
+        'rich_context': None,
+        'puuid': puuid,
+        'riot_id': game_name,
+        'tag_line': tag_line,
+        'iconId': summoner['profileIconId'],
+        'rank_data': rank_data,
+        'total_games': len(matches),
+        'playstyle_cache': None,
+        'summary_cache': {},
+    }
+    # Sizing the entry walks every match, so keep it off the event loop
+    await asyncio.to_thread(cache.set, user_key, entry)
+    return player_summary(user_key, entry, 'riot')
+
+
+def get_player(user_key: str) -> dict:
+    entry = get_user_cache().get(user_key)
+    if entry is None:
+        raise ServiceError(404, f"Player {user_key} has not been synced (POST .../sync first)")
+    return entry
+
+
+_player_graphs = LRUCache(maxsize=SERVICE_GRAPH_PLAYERS)
+_player_graphs_lock = threading.Lock()
+
+
+def _graph_state(user_key: str, entry: dict) -> dict:
+    # Per player: one lazy graph per queue filter plus the typed records they share, rebuilt
+    # whenever a sync brings new matches
+    version = (entry['total_games'], entry['raw_matches'][0].get('matchId'))
+    with _player_graphs_lock:
+        state = _player_graphs.get(user_key)
+        if state is None or state['version'] != version:
+            state = {
+                'version': version,
+                'matches_by_queue': split_matches_by_queue(
+                    entry['raw_matches'], entry['solo_matches'], entry['flex_matches']
+                ),
+                'record_cache': {},
+                'graphs': {},
+            }
+            _player_graphs[user_key] = state
+    return state
+
+
+def _player_graph(user_key: str, queue_type: str):
+    # Graphs are thread-safe, so concurrent requests for a player share one (building it is lazy and cheap)
+    state = _graph_state(user_key, get_player(user_key))
+    with _player_graphs_lock:
+        graph = state['graphs'].get(queue_type)
+        if graph is None:
+            try:
+                graph = build_data_package(queue_type, state['matches_by_queue'], state['record_cache'])
+            except ValueError as e:
+                raise ServiceError(400, str(e))
+            state['graphs'][queue_type] = graph
+    return graph
+
+
+def _materialize(value):
+    # The lazy rich context is serialized with every section built
+    if isinstance(value, LazyContext):
+        return value.to_dict()
+    return value
+
+
+def compute_data_package(user_key: str, queue_type: str = 'all', nodes=None) -> dict:
+    #Blocking (run it in a worker thread): the requested data package nodes of a synced player
+    nodes = list(nodes or PUBLIC_NODES)
+    unknown = [name for name in nodes if name not in PUBLIC_NODES]
+    if unknown:
+        raise ServiceError(400, f"Unknown data nodes: {', '.join(unknown)}")
+
+    graph = _player_graph(user_key, queue_type)
+    package = {
+        name: graph[name]
+        for name in ('has_data', 'filtered_count', 'solo_count', 'flex_count', 'total_count')
+    }
+    if graph['has_data']:
+        package.update({name: _materialize(graph[name]) for name in nodes})
+    return package
+
+
+def _ai_context(user_key: str, queue_type: str):
+    # Rich context + champion insights the agents' tools read for this player and filter
+    graph = _player_graph(user_key, queue_type)
+    if not graph['has_data']:
+        raise ServiceError(404, f"No {queue_type} games for {user_key}")
+    return graph.pull('rich_context', 'champ_insights')
+
+
+def generate_summary(user_key: str, queue_type: str, page_name: str, page_metrics: dict = None,
+                     latency_budget: float = None) -> str:
+    #Blocking: AI summary of one page (served from the shared response cache when unchanged)
+    if page_name not in SUMMARY_PAGES:
+        raise ServiceError(404, f"Unknown summary page: {page_name} (expected one of {', '.join(SUMMARY_PAGES)})")
+    rich_context, champ_insights = _ai_context(user_key, queue_type)
+    with player_context(rich_context, champ_insights):
+        return generate_page_summary(page_name, page_metrics, latency_budget=latency_budget)
+
+
+def generate_playstyle(user_key: str, queue_type: str = 'all', latency_budget: float = None) -> tuple:
+    #Blocking: (style, description) for a player; the all-games one is kept with the player like in the UI
+    if queue_type == 'all':
+        cached = get_player(user_key)['playstyle_cache']
+        if cached:
+            return tuple(cached)
+    rich_context, champ_insights = _ai_context(user_key, queue_type)
+    with player_context(rich_context, champ_insights):
+        playstyle = generate_playstyle_description(latency_budget=latency_budget)
+    if queue_type == 'all':
+        get_user_cache().update(user_key, playstyle_cache=playstyle)
+    return playstyle
@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from utils.cache_backends import CacheNamespace, MemoryBackend, RespBackend, RespError, RespServer
+
+
+@pytest.fixture
+def resp_backend():
+    # Stand-in Redis-protocol server on a free port
+    server = RespServer(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    try:
+        yield RespBackend(f"redis://{host}:{port}/0", timeout=2)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_get_set_and_mget(resp_backend):
+    assert resp_backend.get("missing") is None
+    resp_backend.set("a", b"1")
+    resp_backend.set_many({"b": b"2", "c": b"3"})
+    assert resp_backend.get("a") == b"1"
+    assert resp_backend.get_many(["a", "b", "missing", "c"]) == {"a": b"1", "b": b"2", "c": b"3"}
+    assert resp_backend.get_many([]) == {}
+
+
+def test_ttl_expires(resp_backend):
+    resp_backend.set("short", b"x", ttl=0.05)
+    resp_backend.set("long", b"y", ttl=60)
+    assert resp_backend.get("short") == b"x"
+    time.sleep(0.1)
+    assert resp_backend.get("short") is None
+    assert resp_backend.get("long") == b"y"
+
+
+def test_clear_prefix(resp_backend):
+    resp_backend.set_many({"llm:a": b"1", "llm:b": b"2", "match:a": b"3"})
+    resp_backend.clear("llm:")
+    assert resp_backend.get_many(["llm:a", "llm:b", "match:a"]) == {"match:a": b"3"}
+    assert resp_backend.stats()['entries'] == 1
+
+
+def test_error_mid_pipeline_keeps_connection_in_step(resp_backend):
+    resp_backend.set_many({"a": b"value-a", "b": b"value-b"})
+    with pytest.raises(RespError):
+        resp_backend.execute(("BOGUS",), ("GET", "a"))
+    # The next command must get its own reply, not the leftover one for GET a
+    assert resp_backend.get("b") == b"value-b"
+    assert resp_backend.get("a") == b"value-a"
+
+
+def test_namespace_round_trip_and_misses(resp_backend):
+    answers = CacheNamespace("llm", ttl_seconds=60, backend=resp_backend, raw=True)
+    matches = CacheNamespace("match", backend=resp_backend)
+    answers.set("q1", "Ward more.")
+    matches.set_many({"NA1_1": {"kills": 3}, "NA1_2": {"kills": 5}})
+    assert answers.get("q1") == "Ward more."
+    assert matches.get_many(["NA1_1", "NA1_2", "NA1_3"]) == {"NA1_1": {"kills": 3}, "NA1_2": {"kills": 5}}
+
+    # A value that isn't ours (e.g. written by another client) is a miss, not an error
+    resp_backend.set("match:NA1_4", b"not compressed")
+    assert matches.get("NA1_4") is None
+
+
+def test_unreachable_server_is_a_miss():
+    backend = RespBackend("redis://127.0.0.1:1/0", timeout=0.2)
+    namespace = CacheNamespace("llm", backend=backend, raw=True)
+    assert namespace.get("q1") is None
+    namespace.set("q1", "ignored")
+
+
+def test_non_bytes_value_is_a_miss(monkeypatch):
+    # e.g. a status reply ('OK') handed back in place of a value
+    backend = MemoryBackend()
+    monkeypatch.setattr(backend, "get_many", lambda keys: {key: "OK" for key in keys})
+    assert CacheNamespace("match", backend=backend).get("NA1_1") is None
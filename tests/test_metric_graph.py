@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from data.lazy_context import LazyContext
+from data.metric_graph import MetricGraph
+
+
+def _counting_nodes(calls: Counter, delay: float = 0.01):
+    # A slow shared intermediate ('_base') read by every section, like _detailed_matches in the rich context
+    def node(name, fn):
+        def compute(*args):
+            calls[name] += 1
+            time.sleep(delay)
+            return fn(*args)
+        return compute
+
+    return {
+        '_base': (('games',), node('_base', lambda games: list(range(games)))),
+        'total': (('_base',), node('total', sum)),
+        'count': (('_base',), node('count', len)),
+        'average': (('total', 'count'), node('average', lambda total, count: total / count)),
+        'maximum': (('_base',), node('maximum', max)),
+    }
+
+
+@pytest.mark.parametrize('graph_class', [MetricGraph, LazyContext])
+def test_concurrent_reads_compute_each_node_once(graph_class):
+    calls = Counter()
+    graph = graph_class(_counting_nodes(calls), {'games': 100})
+    names = ['average', 'total', 'count', 'maximum'] * 4
+    start = threading.Barrier(len(names))
+
+    def read(name):
+        start.wait()
+        return name, graph[name]
+
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        results = list(pool.map(read, names))
+
+    expected = {'total': 4950, 'count': 100, 'average': 49.5, 'maximum': 99}
+    assert all(value == expected[name] for name, value in results)
+    assert all(count == 1 for count in calls.values())
+    assert set(calls) == {'_base', 'total', 'count', 'average', 'maximum'}
+
+
+def test_concurrent_materialize_and_assign():
+    calls = Counter()
+    context = LazyContext(_counting_nodes(calls), {'games': 10})
+
+    def assign():
+        context['population_percentiles'] = {'kda': 50}
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        dumps = [pool.submit(context.to_dict) for _ in range(3)]
+        pool.submit(assign).result()
+        for dump in dumps:
+            assert dump.result()['average'] == 4.5
+
+    assert context.to_dict()['population_percentiles'] == {'kda': 50}
+
+
+def test_cycle_is_still_detected():
+    graph = MetricGraph({'a': (('b',), lambda b: b), 'b': (('a',), lambda a: a)})
+    with pytest.raises(ValueError, match="cycle"):
+        graph['a']
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agents.streaming import AgentBusyError, agent_turn_lock, stream_agent
+
+
+class SlowAgent:
+    # Minimal stand-in for a strands Agent: streams a few chunks, then the result
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.messages = []
+
+    async def stream_async(self, prompt):
+        self.messages.append(prompt)
+        for word in ("keep", "warding"):
+            await asyncio.sleep(self.delay)
+            yield {'data': word + " "}
+        yield {'result': f"answer to {prompt}"}
+
+
+def test_exclusive_turn_rejects_a_second_turn_while_running():
+    agent = SlowAgent()
+    first = stream_agent(agent, "q1", exclusive=True)
+    assert next(first)['type'] == 'text'
+
+    with pytest.raises(AgentBusyError):
+        list(stream_agent(agent, "q2", exclusive=True))
+
+    assert list(first)[-1] == {'type': 'done', 'text': "answer to q1"}
+    assert list(stream_agent(agent, "q3", exclusive=True))[-1]['text'] == "answer to q3"
+    assert agent.messages == ["q1", "q3"]
+
+
+def test_turn_lock_is_released_when_the_reader_stops_early():
+    agent = SlowAgent()
+    events = stream_agent(agent, "q1", exclusive=True)
+    next(events)
+    events.close()
+    # The abandoned turn keeps running on its worker thread and releases the lock when it ends
+    deadline = time.monotonic() + 2
+    while agent_turn_lock(agent).locked() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not agent_turn_lock(agent).locked()
+
+
+def test_non_exclusive_streams_run_concurrently():
+    agent = SlowAgent()
+    results = []
+    threads = [
+        threading.Thread(target=lambda p=p: results.append(list(stream_agent(agent, p))[-1]['text']))
+        for p in ("a", "b")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == ["answer to a", "answer to b"]
@@ -361,35 +361,44 @@ def render_advanced_stats(
 
         st.markdown("---")
         # Prepare page-specific metrics for AI
-        advanced_stats_metrics = {
-            'kda_std_dev': metrics['kda_consistency'],
-            'aggression_score': metrics['aggression_score'],
-            'objective_score': objective_score,
-            'performance_volatility': metrics['performance_volatility'],
-            'safety_score': metrics['safety_score'],
-            'persistence_score': persistence_score,
-            'diversity_ratio': metrics['champion_diversity_ratio'],
-            'win_loss_kda_gap': abs(metrics.get('win_avg_kda', 0) - metrics.get('loss_avg_kda', 0)),
-            'early_game_dominance': dominance_score,
-            'unique_champions': metrics['unique_champions'],
-        }
-
-        if primary_role in ['TOP', 'MIDDLE', 'BOTTOM'] and laner_advanced['has_lane_data']:
-            print(laner_advanced)
-            advanced_stats_metrics['avg_cs_per_min'] = laner_advanced['avg_cs_per_min']
-            advanced_stats_metrics['gold_to_combat_efficiency_score'] = laner_advanced['combat_efficiency_score']
-        elif primary_role == 'JUNGLE' and jungle_advanced['has_jungle_data']:
-            advanced_stats_metrics['jungle_objective_control'] = jungle_advanced['jungle_objective_control']
-            advanced_stats_metrics['jungle_pressure_score'] = jungle_advanced['jungle_pressure_score']
-            advanced_stats_metrics['counter_jungle_score'] = jungle_advanced['counter_jungle_score']
-        elif primary_role == 'UTILITY' and support_advanced['has_support_data']:
-            advanced_stats_metrics['vision_dominance_score'] = support_advanced['vision_dominance_score']
-            advanced_stats_metrics['utility_output_score'] = support_advanced['utility_output_score']
-            advanced_stats_metrics['frontline_score'] = support_advanced['frontline_score']
-        
+        advanced_stats_metrics = build_advanced_stats_metrics(
+            metrics, primary_role, dominance_score, objective_score, persistence_score,
+            laner_advanced, jungle_advanced, support_advanced,
+        )
         display_ai_summary_button('advanced_stats', "✨ Get AI Performance Summary", advanced_stats_metrics)
 
 
+def build_advanced_stats_metrics(metrics, primary_role, dominance_score, objective_score, persistence_score,
+                                 laner_advanced, jungle_advanced, support_advanced):
+    #Page-specific metrics sent with the advanced stats AI summary (also used to prefetch it)
+    advanced_stats_metrics = {
+        'kda_std_dev': metrics['kda_consistency'],
+        'aggression_score': metrics['aggression_score'],
+        'objective_score': objective_score,
+        'performance_volatility': metrics['performance_volatility'],
+        'safety_score': metrics['safety_score'],
+        'persistence_score': persistence_score,
+        'diversity_ratio': metrics['champion_diversity_ratio'],
+        'win_loss_kda_gap': abs(metrics.get('win_avg_kda', 0) - metrics.get('loss_avg_kda', 0)),
+        'early_game_dominance': dominance_score,
+        'unique_champions': metrics['unique_champions'],
+    }
+
+    if primary_role in ['TOP', 'MIDDLE', 'BOTTOM'] and laner_advanced['has_lane_data']:
+        advanced_stats_metrics['avg_cs_per_min'] = laner_advanced['avg_cs_per_min']
+        advanced_stats_metrics['gold_to_combat_efficiency_score'] = laner_advanced['combat_efficiency_score']
+    elif primary_role == 'JUNGLE' and jungle_advanced['has_jungle_data']:
+        advanced_stats_metrics['jungle_objective_control'] = jungle_advanced['jungle_objective_control']
+        advanced_stats_metrics['jungle_pressure_score'] = jungle_advanced['jungle_pressure_score']
+        advanced_stats_metrics['counter_jungle_score'] = jungle_advanced['counter_jungle_score']
+    elif primary_role == 'UTILITY' and support_advanced['has_support_data']:
+        advanced_stats_metrics['vision_dominance_score'] = support_advanced['vision_dominance_score']
+        advanced_stats_metrics['utility_output_score'] = support_advanced['utility_output_score']
+        advanced_stats_metrics['frontline_score'] = support_advanced['frontline_score']
+    
+    return advanced_stats_metrics
+
+
 def display_role_metric(metric_type: str, data: dict):
     #role-specific metrics
     if metric_type == 'jungle_objective':
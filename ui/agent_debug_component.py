@@ -0,0 +1,104 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from agents.telemetry import (
+    AGENT_TELEMETRY_EXPORTER,
+    cache_lookup_stats,
+    clear_telemetry,
+    recent_invocations,
+    telemetry_enabled,
+)
+from utils.cache_backends import get_cache_backend
+from utils.user_cache import get_user_cache
+
+
+def _invocation_rows(invocations):
+    #One row per agent call, newest first
+    rows = []
+    for record in reversed(invocations):
+        tools = record['tools']
+        rows.append({
+            'Time': time.strftime('%H:%M:%S', time.localtime(record['started_at'])),
+            'Agent': record['agent'],
+            'Total (ms)': round(record['duration_ms']),
+            'Model calls': record['model_calls'],
+            'Model (ms)': round(record['model_ms']),
+            'Queued (ms)': round(record['queue_wait_ms']),
+            'Input tokens': record['input_tokens'],
+            'Output tokens': record['output_tokens'],
+            'Tools': len(tools),
+            'Tools (ms)': round(sum(t['duration_ms'] for t in tools)),
+            'Error': record['error'],
+        })
+    return pd.DataFrame(rows)
+
+
+def _tool_rows(invocations):
+    #Per-tool aggregates across all recorded calls, slowest first
+    calls = pd.DataFrame([tool for record in invocations for tool in record['tools']])
+    if calls.empty:
+        return calls
+    grouped = calls.groupby('name')
+    table = pd.DataFrame({
+        'Calls': grouped.size(),
+        'p50 (ms)': grouped['duration_ms'].median().round(1),
+        'Max (ms)': grouped['duration_ms'].max().round(1),
+        'Avg payload (chars)': grouped['payload_chars'].mean().round(0).astype(int),
+        'Cache hit %': (grouped['cache_hit'].mean() * 100).round(0),
+    })
+    return table.sort_values('p50 (ms)', ascending=False)
+
+
+def display_agent_debug_panel():
+    #Sidebar panel summarizing recent agent calls (only when AGENT_TELEMETRY_EXPORTER is on)
+    if not telemetry_enabled():
+        return
+
+    with st.sidebar.expander(" :material/monitoring:    Agent Telemetry", expanded=False):
+        st.caption(f"Exporter: **{AGENT_TELEMETRY_EXPORTER}**")
+        invocations = recent_invocations()
+        if not invocations:
+            st.caption("No agent calls recorded yet.")
+        else:
+            input_tokens = sum(r['input_tokens'] for r in invocations)
+            output_tokens = sum(r['output_tokens'] for r in invocations)
+            p50 = pd.Series([r['duration_ms'] for r in invocations]).median()
+            col1, col2 = st.columns(2)
+            col1.metric("Agent calls", len(invocations))
+            col2.metric("p50 latency", f"{p50 / 1000:.1f}s")
+            st.caption(f"Tokens: {input_tokens:,} in / {output_tokens:,} out")
+
+            st.markdown("**Recent calls**")
+            st.dataframe(_invocation_rows(invocations), hide_index=True, use_container_width=True)
+
+            tool_table = _tool_rows(invocations)
+            if not tool_table.empty:
+                st.markdown("**Tools**")
+                st.dataframe(tool_table, use_container_width=True)
+
+        caches = cache_lookup_stats()
+        if caches:
+            st.markdown("**Cache lookups**")
+            for name, counts in caches.items():
+                total = counts['hits'] + counts['misses']
+                st.caption(f"{name}: {counts['hits']}/{total} hits ({counts['hits'] / total:.0%})")
+
+        users = get_user_cache().stats()
+        st.markdown("**Player cache**")
+        st.caption(
+            f"{users['entries']} players, {users['bytes'] / 2**20:.0f}/{users['max_bytes'] / 2**20:.0f} MB "
+            f"({users['policy'].upper()}), {users['hits']}/{users['hits'] + users['misses']} hits, "
+            f"{users['evictions']} evicted"
+        )
+
+        try:
+            shared = get_cache_backend().stats()
+            st.caption(f"Shared cache ({shared['backend']}): {shared['entries']} entries")
+        except Exception as e:
+            st.caption(f"Shared cache unavailable: {e}")
+
+        if st.button("Clear", key="agent_telemetry_clear"):
+            clear_telemetry()
+            st.rerun()
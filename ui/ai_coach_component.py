@@ -1,6 +1,9 @@
 import streamlit as st
 from agents.context_manager import set_context
-from agents.agents import initialize_chat_coach
+from agents.answer_cache import cached_coach_stream, coach_answer_scope
+from agents.streaming import AgentBusyError
+from ui.ai_session import get_session_coach, reset_session_coach
+from ui.stream_renderer import render_agent_stream
 
 def render_ai_coach(filtered_game_count, selected_queue_display):
     #st.markdown("## :material/robot_2:    AI Coaching Session")
@@ -61,13 +64,24 @@ def render_ai_coach(filtered_game_count, selected_queue_display):
                     message_placeholder = st.empty()
                     
                     try:
-                        with st.spinner("Coach is analyzing your stats..."):
-                            coach = initialize_chat_coach()
-                            coach_response = coach(prompt)
-                            full_response = str(coach_response)
+                        # Tokens and tool calls are rendered as they stream in
+                        message_placeholder.markdown("*Coach is analyzing your stats...*")
+                        # Pooled per session: reuses the model client and remembers earlier turns
+                        coach = get_session_coach()
+                        # Common questions are answered from earlier answers for this player; only the
+                        # first question of a conversation is cached, since follow-ups depend on history
+                        full_response = render_agent_stream(
+                            message_placeholder,
+                            cached_coach_stream(
+                                coach, prompt, coach_answer_scope(st.session_state.get('current_user_id', '')),
+                                store=len(st.session_state.chat_history) == 1,
+                            ),
+                        )
                         
+                    except AgentBusyError:
+                        # The previous answer is still streaming on its worker thread
+                        full_response = "I'm still working on your previous question. Ask again once it's answered."
                         message_placeholder.markdown(full_response)
-                        
                     except Exception as e:
                         error_msg = f"Sorry, I'm having trouble connecting right now. Error: {str(e)}"
                         message_placeholder.markdown(error_msg)
@@ -81,4 +95,5 @@ def render_ai_coach(filtered_game_count, selected_queue_display):
             with col2:
                 if st.button(" :material/delete:    Clear Chat"):
                     st.session_state.chat_history = []
+                    reset_session_coach()
                     st.rerun()
\ No newline at end of file
@@ -0,0 +1,79 @@
+import logging
+import uuid
+
+import streamlit as st
+
+from agents.agent_pool import get_coach_pool
+from agents.prefetch import PLAYSTYLE_JOB, submit_ai_prefetch, submit_playstyle_job
+
+logger = logging.getLogger(__name__)
+
+# Per-session state for the AI features: the coach conversation and the background prefetch jobs.
+# The agents package itself is Streamlit-free (the headless API uses it too).
+
+
+def coach_conversation_key() -> str:
+    #Conversation key for this browser session and the player being viewed
+    session_id = st.session_state.setdefault('coach_session_id', uuid.uuid4().hex)
+    return f"{session_id}:{st.session_state.get('current_user_id', '')}"
+
+
+def get_session_coach():
+    #This session's coach agent (keeps the conversation between turns)
+    return get_coach_pool().get(coach_conversation_key())
+
+
+def reset_session_coach():
+    #Start the coach conversation over for this session
+    get_coach_pool().discard(coach_conversation_key())
+
+
+def start_session_prefetch(prefetch_key, rich_context, champ_insights, page_metrics_by_page: dict):
+    #Prefetch once per player + filter for this session (reruns with the same key do nothing)
+    current = st.session_state.get('ai_prefetch')
+    if current is not None and current['key'] == prefetch_key:
+        return
+    st.session_state.ai_prefetch = {
+        'key': prefetch_key,
+        'jobs': submit_ai_prefetch(rich_context, champ_insights, page_metrics_by_page),
+    }
+    logger.info("Started AI prefetch for %s", prefetch_key)
+
+
+def get_prefetch_job(job_name: str):
+    #This session's prefetch future for a job, or None if it was never started or failed
+    current = st.session_state.get('ai_prefetch')
+    if current is None:
+        return None
+    job = current['jobs'].get(job_name)
+    if job is None or job.cancelled() or (job.done() and job.exception() is not None):
+        return None
+    return job
+
+
+def start_playstyle_job(user_key, rich_context, champ_insights):
+    #Generate the playstyle in the background for this session (the overview polls for it)
+    job = get_prefetch_job(PLAYSTYLE_JOB)
+    if job is None:
+        job = submit_playstyle_job(rich_context, champ_insights)
+    st.session_state.playstyle_job = {'user_key': user_key, 'job': job}
+
+
+def playstyle_job_pending(user_key) -> bool:
+    #Whether this player's background playstyle is still being generated
+    current = st.session_state.get('playstyle_job')
+    return current is not None and current['user_key'] == user_key and not current['job'].done()
+
+
+def take_playstyle_result(user_key):
+    #The finished background playstyle for this player, or None while it is still running
+    #(or if none was started). The job is forgotten once its result has been taken.
+    current = st.session_state.get('playstyle_job')
+    if current is None or current['user_key'] != user_key or not current['job'].done():
+        return None
+    del st.session_state['playstyle_job']
+    try:
+        return current['job'].result()
+    except Exception as e:
+        logger.warning("Background playstyle failed: %s", e)
+        return None
@@ -1,6 +1,14 @@
 import streamlit as st
 import base64
 
+from agents.context_manager import player_context
+from agents.local_summary import local_playstyle
+from ui.ai_session import playstyle_job_pending, take_playstyle_result
+from utils.user_cache import get_user_cache
+
+# Seconds between checks for a playstyle that is still being generated in the background
+PLAYSTYLE_POLL_SECONDS = 1.5
+
 def display_performance_overview(metrics):
     # Row 1
     col1, col2, col3 = st.columns([1, 1, 1.5])
@@ -148,6 +156,51 @@ def display_playstyle_tags(tags: dict):
     
     return badges_html
 
+def _local_playstyle():
+    #Rule-based playstyle from the filtered player data, shown until (or instead of) the AI one
+    with player_context(st.session_state.get('current_filtered_context'), st.session_state.get('champ_insights')):
+        return local_playstyle()
+
+
+def _collect_playstyle(user_key):
+    #Move a finished background playstyle into the session and the user's cache; True once it landed
+    playstyle_tuple = take_playstyle_result(user_key)
+    if playstyle_tuple is None:
+        return False
+    st.session_state.playstyle = playstyle_tuple
+    get_user_cache().update(user_key, playstyle_cache=playstyle_tuple)
+    return True
+
+
+def _render_playstyle(playstyle_tuple, pending=False):
+    playstyle, playstyle_desc = playstyle_tuple
+    st.info(f"**{playstyle}**\n\n{playstyle_desc}")
+    if pending:
+        st.caption(" :material/pending:    *Quick read from your stats while the AI analysis is being written...*")
+    else:
+        st.caption(" :material/lightbulb:    *This analysis is based on your performance patterns across all games.*")
+
+
+def _poll_playstyle(user_key):
+    #Fragment body: reruns on its own every few seconds until the background playstyle lands
+    if _collect_playstyle(user_key):
+        # A full rerun renders the result and stops the polling
+        st.rerun()
+    _render_playstyle(_local_playstyle(), pending=True)
+
+
+def display_playstyle_section(user_key):
+    #AI playstyle if ready; otherwise the local one, refreshed in place once the AI one finishes
+    _collect_playstyle(user_key)
+    if st.session_state.get('playstyle') is not None:
+        _render_playstyle(st.session_state.playstyle)
+    elif playstyle_job_pending(user_key):
+        st.fragment(_poll_playstyle, run_every=PLAYSTYLE_POLL_SECONDS)(user_key)
+    else:
+        # No AI playstyle for this player (never started or it failed)
+        _render_playstyle(_local_playstyle())
+
+
 def render_overview_tab(data_package, queue_type):
     
     metrics = data_package['metrics']
@@ -177,11 +230,7 @@ def render_overview_tab(data_package, queue_type):
     current_user_id = st.session_state.get('current_user_id', 'unknown')
     #playstyle_key = f"playstyle_{current_user_id}" #_{queue_type}_{filtered_game_count}
     if filtered_game_count >= 10:
-        
-        playstyle, playstyle_desc = st.session_state.playstyle
-
-        st.info(f"**{playstyle}**\n\n{playstyle_desc}")
-        st.caption(" :material/lightbulb:    *This analysis is based on your performance patterns across all games.*")
+        display_playstyle_section(current_user_id)
         st.markdown("---")
     else:
         st.info("Play 10 or more games in ranked to get your AI powered Playstyle Analysis")
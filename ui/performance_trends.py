@@ -5,7 +5,7 @@ import numpy as np
 
 from ui.summary_component import display_ai_summary_button
 
-def render_performance_trends(filtered_game_count, selected_queue_display, df, metrics):
+def render_performance_trends(filtered_game_count, selected_queue_display, df, metrics, trend_series=None):
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         st.markdown("## Performance Trends")
@@ -28,6 +28,85 @@ def render_performance_trends(filtered_game_count, selected_queue_display, df, m
         st.caption(f"Average KDA: {df['KDA'].mean():.2f}")
         
         st.markdown("---")
+
+        # Rolling form over the full history
+        if trend_series and trend_series.get('games', 0) > 0:
+            window = trend_series['window']
+            trend_summary = metrics.get('trend_summary', {})
+
+            st.markdown("### :material/timeline:    Rolling Form")
+            st.caption(f"{window}-game rolling averages (KDA uses an exponentially weighted average) across all {trend_series['games']} games, oldest → newest")
+
+            trend_tabs = st.tabs(["Win Rate", "KDA", "CS/min", "Deaths", "Vision"])
+            trend_views = [
+                ('rolling_win_rate', 'Win Rate %', '#2ecc71', '{:.0f}%'),
+                ('ewma_kda', 'KDA (EWMA)', '#3498db', '{:.2f}'),
+                ('rolling_cs_per_min', 'CS/min', '#DBC442', '{:.1f}'),
+                ('rolling_deaths', 'Deaths', '#e74c3c', '{:.1f}'),
+                ('rolling_vision', 'Vision Score', '#9b59b6', '{:.1f}'),
+            ]
+            for tab, (key, label, color, fmt) in zip(trend_tabs, trend_views):
+                with tab:
+                    trend_df = pd.DataFrame({
+                        'Match Number': trend_series['match_number'],
+                        label: trend_series[key],
+                    }).set_index('Match Number')
+                    st.line_chart(trend_df, color=color)
+
+                    change = trend_summary.get(key, {})
+                    if change:
+                        st.caption(
+                            f"Now: {fmt.format(change['current'])} • "
+                            f"{window} games ago: {fmt.format(change['previous'])} • "
+                            f"Best: {fmt.format(change['best'])}"
+                        )
+
+            st.markdown("---")
+
+        # Play sessions (games queued back to back)
+        session_summary = metrics.get('session_summary', {})
+        if session_summary.get('has_session_data', False):
+            st.markdown("### :material/schedule:    Play Sessions")
+            st.caption(f"Games less than {session_summary['gap_minutes']} minutes apart count as one session")
+
+            s_col1, s_col2, s_col3, s_col4 = st.columns(4)
+            s_col1.metric("Sessions", session_summary['total_sessions'])
+            s_col2.metric("Avg Games / Session", f"{session_summary['avg_games_per_session']:.1f}")
+            s_col3.metric(
+                "WR After a Loss",
+                f"{session_summary['after_loss']['win_rate']:.0f}%",
+                delta=f"{session_summary['after_loss']['win_rate'] - session_summary['overall_win_rate']:.0f}% vs overall",
+            )
+            s_col4.metric("Tilt Risk", session_summary['tilt_risk'].title())
+
+            by_game = pd.DataFrame(session_summary['win_rate_by_game_number'])
+            if len(by_game) > 0:
+                session_chart = (
+                    alt.Chart(by_game)
+                    .mark_bar(size=40)
+                    .encode(
+                        x=alt.X('game_number:N', title='Game # in Session', sort=None),
+                        y=alt.Y('win_rate:Q', title='Win Rate %', scale=alt.Scale(domain=[0, 100])),
+                        color=alt.condition(alt.datum.win_rate >= 50, alt.value('#2ecc71'), alt.value('#e74c3c')),
+                        tooltip=[
+                            alt.Tooltip('game_number:N', title='Game #'),
+                            alt.Tooltip('games:Q', title='Games'),
+                            alt.Tooltip('win_rate:Q', title='Win Rate %', format='.1f'),
+                            alt.Tooltip('avg_kda:Q', title='Avg KDA', format='.2f'),
+                        ]
+                    )
+                    .properties(height=300)
+                )
+                st.altair_chart(session_chart, use_container_width=True)
+
+            st.caption(
+                f"KDA after a win: {session_summary['after_win']['avg_kda']:.2f} • "
+                f"after a loss: {session_summary['after_loss']['avg_kda']:.2f} • "
+                f"after two losses: {session_summary['after_two_losses']['win_rate']:.0f}% WR "
+                f"({session_summary['after_two_losses']['games']} games)"
+            )
+
+            st.markdown("---")
         
         # Win/Loss and K/D/A side by side
         col1, col2 = st.columns([1.75, 1])
@@ -373,16 +452,23 @@ def render_performance_trends(filtered_game_count, selected_queue_display, df, m
         # AI Summary Button
         st.markdown("---")
             # Prepare page-specific metrics
-        performance_metrics = {
-            'win_avg_kda': metrics.get('win_avg_kda', 0),
-            'loss_avg_kda': metrics.get('loss_avg_kda', 0),
-            'win_avg_kills': metrics.get('win_avg_kills', 0),
-            'loss_avg_kills': metrics.get('loss_avg_kills', 0),
-            'win_avg_deaths': metrics.get('win_avg_deaths', 0),
-            'loss_avg_deaths': metrics.get('loss_avg_deaths', 0),
-            'deaths_per_loss': metrics.get('deaths_per_loss', 0),
-            'deaths_per_win': metrics.get('deaths_per_win', 0),
-            'death_gap': metrics.get('deaths_per_loss', 0) - metrics.get('deaths_per_win', 0),
-        }
+        performance_metrics = build_performance_metrics(metrics)
         
-        display_ai_summary_button('performance_trends', "✨ Get AI Performance Summary", performance_metrics)
\ No newline at end of file
+        display_ai_summary_button('performance_trends', "✨ Get AI Performance Summary", performance_metrics)
+
+
+def build_performance_metrics(metrics):
+    #Page-specific metrics sent with the performance trends AI summary (also used to prefetch it)
+    performance_metrics = {
+        'win_avg_kda': metrics.get('win_avg_kda', 0),
+        'loss_avg_kda': metrics.get('loss_avg_kda', 0),
+        'win_avg_kills': metrics.get('win_avg_kills', 0),
+        'loss_avg_kills': metrics.get('loss_avg_kills', 0),
+        'win_avg_deaths': metrics.get('win_avg_deaths', 0),
+        'loss_avg_deaths': metrics.get('loss_avg_deaths', 0),
+        'deaths_per_loss': metrics.get('deaths_per_loss', 0),
+        'deaths_per_win': metrics.get('deaths_per_win', 0),
+        'death_gap': metrics.get('deaths_per_loss', 0) - metrics.get('deaths_per_win', 0),
+    }
+    
+    return performance_metrics
@@ -0,0 +1,36 @@
+# Shown after the partial answer while tokens are still arriving
+STREAM_CURSOR = "▌"
+
+
+def tool_progress_label(tool_name):
+    #get_matchup_analysis_summary -> "matchup analysis summary"
+    name = tool_name[4:] if tool_name.startswith('get_') else tool_name
+    return name.replace('_', ' ')
+
+
+def render_agent_stream(placeholder, events, wrap=None):
+    #Render agent events into a placeholder as they arrive: text tokens are appended and each
+    #tool call shows an inline progress line. A fallback answer (see agents.streaming.race_with_fallback)
+    #is shown until the model's text starts arriving. Returns the final answer text.
+    #wrap(markdown) lets callers draw the text inside their own element (e.g. st.info)
+    draw = wrap or placeholder.markdown
+    text = ''
+    fallback_text = ''
+    tools_line = ''
+    final_text = None
+
+    for event in events:
+        if event['type'] == 'fallback':
+            fallback_text = event['text']
+        elif event['type'] == 'text':
+            text += event['data']
+        elif event['type'] == 'tool':
+            tools_line += f"\n\n*:material/build: Checking {tool_progress_label(event['name'])}...*"
+        elif event['type'] == 'done':
+            final_text = event['text']
+            continue
+        draw((text or fallback_text) + tools_line + STREAM_CURSOR)
+
+    final_text = final_text if final_text is not None else text
+    draw(final_text)
+    return final_text
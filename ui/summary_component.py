@@ -1,6 +1,10 @@
 import streamlit as st
 from agents.context_manager import set_context
-from agents.summary_agent import generate_page_summary
+from agents.summary_agent import stream_page_summary
+from agents.prefetch import wait_for_prefetch
+from agents.local_summary import local_page_summary
+from ui.ai_session import get_prefetch_job
+from ui.stream_renderer import render_agent_stream
 
 
 def display_ai_summary_button(
@@ -37,19 +41,37 @@ def display_ai_summary_button(
                 st.session_state[show_summary_key] = False
             else:
                 # Generate new summary if not cached
-                if st.session_state[summary_key] is None:
+                prefetched_summary = get_prefetch_job(page_name)
+                if st.session_state[summary_key] is None and prefetched_summary is not None:
+                    # Generated in the background already (or still running); don't call Bedrock twice.
+                    # The context is only needed for the local summary if the job misses the budget
+                    set_context(st.session_state.current_filtered_context, st.session_state.champ_insights)
                     with st.spinner("🤖 AI is analyzing your stats..."):
-                        # Ensure context is set
-                        if st.session_state.get('current_filtered_context') and st.session_state.get('champ_insights') is not None:
-                            set_context(
-                                st.session_state.current_filtered_context, 
-                                st.session_state.champ_insights
+                        st.session_state[summary_key] = wait_for_prefetch(
+                            prefetched_summary, lambda: local_page_summary(page_name, page_metrics)
+                        )
+                elif st.session_state[summary_key] is None:
+                    # Ensure context is set
+                    if st.session_state.get('current_filtered_context') and st.session_state.get('champ_insights') is not None:
+                        set_context(
+                            st.session_state.current_filtered_context, 
+                            st.session_state.champ_insights
+                        )
+                        
+                        # Stream the summary into the page while it is generated
+                        stream_placeholder = st.empty()
+                        stream_placeholder.info("🤖 AI is analyzing your stats...")
+                        try:
+                            summary = render_agent_stream(
+                                stream_placeholder,
+                                stream_page_summary(page_name, page_metrics),
+                                wrap=lambda text: stream_placeholder.info(f"**🤖 AI Analysis:**\n\n{text}"),
                             )
-                            
-                            summary = generate_page_summary(page_name, page_metrics)
-                            st.session_state[summary_key] = summary
-                        else:
-                            st.session_state[summary_key] = "Error: Player data not loaded"
+                        except Exception as e:
+                            summary = f"Unable to generate summary: {str(e)}"
+                        st.session_state[summary_key] = summary
+                    else:
+                        st.session_state[summary_key] = "Error: Player data not loaded"
                 
                 # Show the summary
                 st.session_state[show_summary_key] = True
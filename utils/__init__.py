@@ -1,12 +1,12 @@
 from .helpers import extract_json_from_response, get_champion_icon_url, filter_matches_by_queue
-from .queue_filters import (
-    prepare_all_filtered_data,
-    display_queue_filter_badge,
-)
+from .population_store import get_population_stats, ingest_population
+from .user_cache import UserCache, get_user_cache
 
 __all__= ['extract_json_from_response',
  'get_champion_icon_url', 
  'filter_matches_by_queue',
- 'prepare_all_filtered_data',
- 'display_queue_filter_badge'
+ 'get_population_stats',
+ 'ingest_population',
+ 'UserCache',
+ 'get_user_cache',
 ]
\ No newline at end of file
@@ -0,0 +1,603 @@
+import argparse
+import functools
+import logging
+import os
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+from fnmatch import fnmatchcase
+from urllib.parse import unquote, urlparse
+
+import orjson
+import zstandard
+from cachetools import LRUCache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Where shared caches (LLM answers, match details, lookups) live: "memory" (this process only),
+# "sqlite" (default; a file every process on the host or shared volume can open) or "redis"
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite").lower()
+
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", os.path.join(".cache", "shared_cache.sqlite3"))
+
+# Redis-protocol server for the "redis" backend (any RESP server: Redis, Valkey, ElastiCache, or
+# the stand-in started with `python -m utils.cache_backends --serve`)
+CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+
+# Bytes the memory and sqlite backends keep before evicting least recently used entries
+# (a Redis server enforces its own maxmemory policy)
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Seconds to wait for the Redis-protocol server before treating the cache as unavailable
+CACHE_TIMEOUT_SECONDS = float(os.getenv("CACHE_TIMEOUT_SECONDS", 2))
+
+# After the Redis-protocol server fails to answer, lookups skip it (count as misses) for this long
+CACHE_RETRY_SECONDS = 10
+
+
+class CacheBackend:
+    #Byte-valued key/value store with optional per-key TTL, shared by the app's caches.
+    #Implementations only need get/set/delete/clear/stats; get_many/set_many can be
+    #overridden when the store supports batching
+
+    name = "base"
+
+    def get(self, key: str):
+        #Value bytes, or None if missing or expired
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float = None):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def clear(self, prefix: str = ""):
+        #Remove every key starting with prefix (all keys if empty)
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+    def get_many(self, keys) -> dict:
+        #key -> value bytes for the keys that are present
+        values = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def set_many(self, items: dict, ttl: float = None):
+        for key, value in items.items():
+            self.set(key, value, ttl)
+
+
+class MemoryBackend(CacheBackend):
+    #Process-local backend: an LRU cache bounded by value bytes
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        # Values are (bytes, expires_at or None)
+        self._entries = LRUCache(maxsize=max_bytes, getsizeof=lambda value: len(value[0]))
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            if value[1] is not None and value[1] <= time.time():
+                del self._entries[key]
+                return None
+            return value[0]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            try:
+                self._entries[key] = (bytes(value), expires_at)
+            except ValueError:
+                # Larger than the whole budget
+                self._entries.pop(key, None)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def keys(self, pattern: str = "*") -> list:
+        now = time.time()
+        with self._lock:
+            return [
+                key for key, (_, expires_at) in list(self._entries.items())
+                if (expires_at is None or expires_at > now) and fnmatchcase(key, pattern)
+            ]
+
+    def clear(self, prefix=""):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': self.name, 'entries': len(self._entries),
+                'bytes': self._entries.currsize, 'max_bytes': self._entries.maxsize,
+            }
+
+
+class SQLiteBackend(CacheBackend):
+    #SQLite-file backend with TTLs and size-bounded LRU eviction.
+    #Every process that opens the same file shares the cache (WAL mode allows concurrent readers),
+    #e.g. several workers on one host or replicas mounting the same volume
+
+    name = "sqlite"
+
+    def __init__(self, path: str = CACHE_SQLITE_PATH, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_entries_accessed ON cache_entries (accessed_at)")
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return value
+
+    def get_many(self, keys):
+        keys = list(keys)
+        values = {}
+        now = time.time()
+        with self._lock:
+            # SQLite allows up to 999 bound parameters per statement
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for key, value, expires_at in self._conn.execute(
+                    f"SELECT key, value, expires_at FROM cache_entries WHERE key IN ({placeholders})", chunk
+                ):
+                    if expires_at is None or expires_at > now:
+                        values[key] = value
+                if values:
+                    self._conn.executemany(
+                        "UPDATE cache_entries SET accessed_at = ? WHERE key = ?",
+                        [(now, key) for key in chunk if key in values],
+                    )
+        return values
+
+    def set(self, key, value, ttl=None):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items, ttl=None):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(key, bytes(value), len(value), expires_at, now) for key, value in items.items()],
+                )
+                self._evict(now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until back under budget
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM cache_entries ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            total -= size
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self, prefix=""):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            )
+
+    def stats(self):
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()
+        return {'backend': self.name, 'entries': entries, 'bytes': total, 'max_bytes': self.max_bytes}
+
+
+class RespError(Exception):
+    #Error reply from a Redis-protocol server
+    pass
+
+
+def _encode_command(*args) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        elif isinstance(arg, (int, float)):
+            arg = str(arg).encode("ascii")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+def _read_reply(stream):
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Connection closed by the cache server")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode("utf-8")
+    if kind == b"-":
+        # Returned, not raised, so the caller can still read the replies after it
+        return RespError(payload.decode("utf-8"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = stream.read(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        count = int(payload)
+        if count < 0:
+            return None
+        return [_read_reply(stream) for _ in range(count)]
+    raise RespError(f"Unexpected reply from the cache server: {line!r}")
+
+
+class RespBackend(CacheBackend):
+    #Backend for any Redis-protocol (RESP2) server, over a minimal built-in client.
+    #One connection per thread, opened lazily and reopened once after a network error
+
+    name = "redis"
+
+    def __init__(self, url: str = CACHE_URL, timeout: float = CACHE_TIMEOUT_SECONDS):
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported CACHE_URL scheme: {parsed.scheme!r} (expected 'redis')")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.timeout = timeout
+        self._local = threading.local()
+        self._down_until = 0.0
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        stream = sock.makefile("rb")
+        self._local.conn = (sock, stream)
+        if self.password:
+            auth = ("AUTH", self.username, self.password) if self.username else ("AUTH", self.password)
+            self._send([auth])
+        if self.db:
+            self._send([("SELECT", self.db)])
+        return self._local.conn
+
+    def _close(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn[0].close()
+            except OSError:
+                pass
+
+    def _send(self, commands):
+        # Pipelined: all commands go out in one write, then every reply is read
+        sock, stream = self._local.conn
+        sock.sendall(b"".join(_encode_command(*command) for command in commands))
+        replies = [_read_reply(stream) for _ in commands]
+        # Every reply is read before raising, so the connection stays in step for the next pipeline
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def execute(self, *commands):
+        #Replies to one or more commands (each a tuple of arguments), sent as one pipeline
+        if time.time() < self._down_until:
+            raise ConnectionError("Cache server unavailable, retrying shortly")
+        for attempt in range(2):
+            try:
+                if getattr(self._local, "conn", None) is None:
+                    self._connect()
+                return self._send(commands)
+            except RespError:
+                # Never reuse a connection whose replies may be out of step (e.g. after a malformed reply)
+                self._close()
+                raise
+            except (ConnectionError, OSError):
+                self._close()
+                if attempt:
+                    self._down_until = time.time() + CACHE_RETRY_SECONDS
+                    raise
+
+    def get(self, key):
+        return self.execute(("GET", key))[0]
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.execute(("MGET", *keys))[0]
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def set(self, key, value, ttl=None):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items, ttl=None):
+        if not items:
+            return
+        expiry = ("PX", int(ttl * 1000)) if ttl else ()
+        self.execute(*[("SET", key, value, *expiry) for key, value in items.items()])
+
+    def delete(self, key):
+        self.execute(("DEL", key))
+
+    def clear(self, prefix=""):
+        cursor = b"0"
+        while True:
+            cursor, keys = self.execute(("SCAN", cursor, "MATCH", f"{prefix}*", "COUNT", 500))[0]
+            if keys:
+                self.execute(("DEL", *keys))
+            if cursor in (b"0", 0, "0"):
+                break
+
+    def stats(self):
+        return {'backend': self.name, 'entries': self.execute(("DBSIZE",))[0], 'url': f"redis://{self.host}:{self.port}/{self.db}"}
+
+
+@functools.lru_cache(maxsize=None)
+def get_cache_backend(backend: str = None) -> CacheBackend:
+    #Process-wide backend configured by CACHE_BACKEND (every namespace shares one connection / file)
+    backend = (backend or CACHE_BACKEND).lower()
+    if backend == "memory":
+        return MemoryBackend()
+    if backend == "sqlite":
+        return SQLiteBackend()
+    if backend == "redis":
+        return RespBackend()
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend!r} (expected 'memory', 'sqlite' or 'redis')")
+
+
+class CacheNamespace:
+    #One cache (e.g. LLM answers or match details) on the shared backend.
+    #Keys are prefixed with the namespace; values are stored as zstd-compressed JSON (or
+    #compressed text with raw=True). A failing backend never breaks the caller: errors are
+    #logged and treated as misses
+
+    def __init__(self, prefix: str, ttl_seconds: float = None, backend: CacheBackend = None, raw: bool = False):
+        self.prefix = f"{prefix}:"
+        self.ttl_seconds = ttl_seconds
+        self.raw = raw
+        self._backend = backend
+        self._compressor = threading.local()
+        self._decompressor = zstandard.ZstdDecompressor()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self) -> CacheBackend:
+        if self._backend is None:
+            self._backend = get_cache_backend()
+        return self._backend
+
+    def _encode(self, value) -> bytes:
+        # ZstdCompressor objects are not thread-safe, so each thread gets its own
+        compressor = getattr(self._compressor, "value", None)
+        if compressor is None:
+            compressor = self._compressor.value = zstandard.ZstdCompressor(level=6)
+        return compressor.compress(value.encode("utf-8") if self.raw else orjson.dumps(value))
+
+    def _decode(self, data: bytes):
+        data = self._decompressor.decompress(data)
+        return data.decode("utf-8") if self.raw else orjson.loads(data)
+
+    def get(self, key: str):
+        #Cached value, or None on a miss
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys) -> dict:
+        #key -> cached value for the keys that are present
+        keys = list(keys)
+        try:
+            found = self.backend.get_many([self.prefix + key for key in keys])
+        except Exception as e:
+            logger.warning("Cache read from %s failed: %s", self.prefix.rstrip(":"), e)
+            found = {}
+        values = {}
+        for key in keys:
+            data = found.get(self.prefix + key)
+            if data is not None:
+                try:
+                    values[key] = self._decode(data)
+                except (zstandard.ZstdError, orjson.JSONDecodeError, UnicodeDecodeError, TypeError):
+                    continue
+        self.hits += len(values)
+        self.misses += len(keys) - len(values)
+        return values
+
+    def set(self, key: str, value):
+        self.set_many({key: value})
+
+    def set_many(self, items: dict):
+        if not items:
+            return
+        try:
+            self.backend.set_many(
+                {self.prefix + key: self._encode(value) for key, value in items.items()}, self.ttl_seconds
+            )
+        except Exception as e:
+            logger.warning("Cache write to %s failed: %s", self.prefix.rstrip(":"), e)
+
+    def delete(self, key: str):
+        try:
+            self.backend.delete(self.prefix + key)
+        except Exception as e:
+            logger.warning("Cache delete in %s failed: %s", self.prefix.rstrip(":"), e)
+
+    def clear(self):
+        self.backend.clear(self.prefix)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'namespace': self.prefix.rstrip(":"),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'backend': self.backend.stats(),
+        }
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    # One client connection of the stand-in server; commands run against server.store
+
+    def handle(self):
+        while True:
+            try:
+                command = _read_reply(self.rfile)
+            except (ConnectionError, RespError, ValueError):
+                return
+            if not isinstance(command, list) or not command:
+                return
+            name = command[0].decode("utf-8").upper()
+            args = command[1:]
+            try:
+                reply = self.server.run(name, args)
+            except Exception as e:
+                reply = RespError(f"ERR {e}")
+            self.wfile.write(_encode_reply(reply))
+            if name == "QUIT":
+                return
+
+
+def _encode_reply(reply) -> bytes:
+    if isinstance(reply, RespError):
+        return b"-%s\r\n" % str(reply).encode("utf-8")
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, bool):
+        return b"+OK\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(_encode_reply(item) for item in reply)
+    if isinstance(reply, str):
+        reply = reply.encode("utf-8")
+    return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    #Stand-in Redis-protocol server backed by a MemoryBackend, for local development and tests.
+    #Speaks the subset of RESP2 that RespBackend uses: PING, GET, SET [EX|PX], MGET, DEL,
+    #SCAN, DBSIZE, FLUSHDB, SELECT, AUTH and QUIT
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, max_bytes: int = CACHE_MAX_BYTES):
+        super().__init__((host, port), _RespHandler)
+        self.store = MemoryBackend(max_bytes)
+
+    def run(self, name: str, args: list):
+        def text(arg):
+            return arg.decode("utf-8")
+
+        if name == "PING":
+            return "PONG"
+        if name in ("SELECT", "AUTH", "QUIT"):
+            return True
+        if name == "GET":
+            return self.store.get(text(args[0]))
+        if name == "MGET":
+            return [self.store.get(text(key)) for key in args]
+        if name == "SET":
+            ttl = None
+            options = [text(arg).upper() for arg in args[2:]]
+            if "EX" in options:
+                ttl = float(options[options.index("EX") + 1])
+            elif "PX" in options:
+                ttl = float(options[options.index("PX") + 1]) / 1000
+            self.store.set(text(args[0]), args[1], ttl)
+            return True
+        if name == "DEL":
+            deleted = 0
+            for key in map(text, args):
+                if self.store.get(key) is not None:
+                    deleted += 1
+                self.store.delete(key)
+            return deleted
+        if name == "SCAN":
+            # Single pass: every match is returned with cursor 0
+            options = [text(arg) for arg in args[1:]]
+            pattern = options[options.index("MATCH") + 1] if "MATCH" in options else "*"
+            return ["0", self.store.keys(pattern)]
+        if name == "DBSIZE":
+            return len(self.store.keys())
+        if name == "FLUSHDB":
+            self.store.clear()
+            return True
+        return RespError(f"ERR unknown command '{name}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in Redis-protocol cache server for local development")
+    parser.add_argument("--serve", type=int, default=6379, metavar="PORT", help="port to listen on")
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    with RespServer(args.host, args.serve) as server:
+        logger.info("Stand-in cache server listening on %s:%d", args.host, args.serve)
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
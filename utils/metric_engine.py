@@ -0,0 +1,212 @@
+#Streamlit-free analytics engine: the metric graph behind every tab, the AI context and the API.
+#Nothing here reads session state; callers pass in the matches (and optional per-player caches).
+
+import pandas as pd
+from data.metrics import (
+    calculate_advanced_metrics,
+    get_champion_insights,
+    calculate_early_late_game_stats,
+    calculate_jungle_advanced_metrics,
+    calculate_support_advanced_metrics,
+    calculate_support_early_game_stats,
+    calculate_support_early_dominance,
+    calculate_jungle_early_game_stats,
+    calculate_jungle_early_dominance,
+    calculate_playstyle_tags,
+    calculate_objective_score,
+    calculate_persistence_score,
+    calculate_laner_additional_metrics,
+)
+from data.context_builder import build_rich_player_context, calculate_role_consistency
+from data.metric_graph import MetricGraph
+from data.match_model import build_match_records
+from data.trends import calculate_trend_series, summarize_trends
+from data.sessions import tag_sessions, calculate_session_stats
+from data.population import population_baseline, calculate_population_percentiles
+from utils.helpers import filter_matches_by_queue
+from utils.population_store import ingest_population
+
+QUEUE_TYPES = ('all', 'solo', 'flex')
+
+
+def prepare_match_dataframe(filtered_matches):
+    #convert raw match data into a clean DataFrame with calculated KDA
+    #rows are ordered oldest -> newest so tail()/rolling windows mean "most recent"
+    matches = []
+    for m in filtered_matches:
+        matches.append({
+            "Champion": m.get("championName", "Unknown"),
+            "Result": "Win" if m.get("win", False) else "Loss",
+            "Kills": m.get("kills", 0),
+            "Deaths": max(m.get("deaths", 1), 1),  # Avoid division by zero
+            "Assists": m.get("assists", 0),
+            "CS": m.get("totalMinionsKilled", 0) + m.get("neutralMinionsKilled", 0),
+            "Minutes": m.get("challenges", {}).get("gameLength", 0) / 60,
+            "Vision": m.get("visionScore", 0),
+            "GameStart": m.get("gameStartTimestamp", 0),
+            "GameEnd": m.get("gameEndTimestamp", 0),
+        })
+
+    df = pd.DataFrame(matches)
+    df["Result"] = df["Result"].astype(str).str.lower()
+    df["Win"] = df["Result"].apply(lambda x: 1 if "win" in x else 0)
+    df["KDA"] = (df["Kills"] + df["Assists"]) / df["Deaths"]
+    df = df.dropna(subset=["KDA"])
+
+    # Riot returns match ids newest first; older cached matches have no timestamp, so reverse those
+    if (df["GameStart"] > 0).all():
+        df = df.sort_values("GameStart", kind="stable")
+    else:
+        df = df.iloc[::-1]
+    df = df.reset_index(drop=True)
+
+    # Tag every game with its play session and position in that session
+    tag_sessions(df)
+    return df
+
+
+def calculate_dominance_score(records, population=None):
+    #game dominance score (advantages over opponent)
+    #CS diff@10, gold diff, and early kills
+
+    if not records:
+        return 0.0
+
+    wins = [m for m in records if m.win]
+    if not wins:
+        return 0.0
+
+    cs_diff_at_10_total = 0
+    for match in wins:
+        # lane opponent is resolved once when the match record is built
+        if not match.opponent:
+            continue
+
+        #getting cs diff at 10
+        cs_diff_at_10 = match.lane_minions_first_10_minutes - match.opponent.lane_minions_first_10_minutes
+        cs_diff_at_10_total += cs_diff_at_10
+
+    avg_cs_advantage = cs_diff_at_10_total / len(wins)
+
+    # gold differential (approximate from gold per minute)
+    # baseline is the population median gpm for each game's role (350 until enough games are sketched)
+    avg_gpm = sum(m.gold_per_minute for m in wins) / len(wins)
+    role_baselines = {
+        role: population_baseline(population, 'gold_per_min', 350, role=role)
+        for role in {m.team_position for m in wins}
+    }
+    baseline_gpm = sum(role_baselines[m.team_position] for m in wins) / len(wins)
+    gold_advantage_estimate = (avg_gpm - baseline_gpm) * 10  # difference * 10min
+
+    avg_early_kills = sum(m.takedowns_first_x_minutes for m in wins) / len(wins)
+
+    # Scoring based on ADVANTAGES
+    # CS advantage: +20 = excellent, +10 = good, 0 = neutral, -10 = poor
+    cs_score = min(10, max(0, (avg_cs_advantage + 10) / 3))
+
+    # Gold advantage: +500g = excellent, +250g = good
+    gold_score = min(10, max(0, (gold_advantage_estimate + 250) / 75))
+
+    # Early kills: 2+ = excellent
+    kill_score = min(10, avg_early_kills * 3)
+
+    dominance_score = (cs_score + gold_score + kill_score) / 3
+    return dominance_score
+
+
+def _metrics_with_summaries(df, trend_series):
+    metrics = calculate_advanced_metrics(df)
+    # Rolling/EWMA trends over the full history (summary goes into metrics for the AI tools)
+    metrics['trend_summary'] = summarize_trends(trend_series)
+    # Play-session aggregates (win rate by game number, results after wins/losses)
+    metrics['session_summary'] = calculate_session_stats(df)
+    return metrics
+
+
+def _population(all_matches, filtered_matches):
+    # Feed every participant of every fetched match into the shared population sketches
+    return ingest_population(all_matches or filtered_matches)
+
+
+def _population_percentiles(filtered_matches, population, role_info):
+    # Percentiles against everyone else in the player's main role
+    return calculate_population_percentiles(filtered_matches, population, role_info.get('primary_role'))
+
+
+def add_population_percentiles(rich_context, population_percentiles):
+    #Attach the population percentiles section to a rich context (other nodes' values are never changed)
+    if rich_context:
+        rich_context['population_percentiles'] = population_percentiles
+    return rich_context
+
+
+def _rich_context(records, metrics, champ_insights, population_percentiles):
+    rich_context = build_rich_player_context(records, metrics, champ_insights) if records else None
+    return add_population_percentiles(rich_context, population_percentiles)
+
+
+# name -> (dependencies, function). Nodes are only computed when something reads them.
+METRIC_NODES = {
+    'df': (('filtered_matches',), prepare_match_dataframe),
+    'records': (('filtered_matches', 'record_cache'), build_match_records),
+    'trend_series': (('df',), calculate_trend_series),
+    'metrics': (('df', 'trend_series'), _metrics_with_summaries),
+    'early_late_stats': (('df', 'records'), calculate_early_late_game_stats),
+    'champ_insights': (('df',), get_champion_insights),
+    'support_early_stats': (('records',), calculate_support_early_game_stats),
+    'jungle_early_stats': (('records',), calculate_jungle_early_game_stats),
+    'jungle_advanced': (('records',), calculate_jungle_advanced_metrics),
+    'support_advanced': (('records',), calculate_support_advanced_metrics),
+    'population': (('all_matches', 'filtered_matches'), _population),
+    'dominance_score': (('records', 'population'), calculate_dominance_score),
+    'support_dominance_score': (('records',), calculate_support_early_dominance),
+    'jungle_dominance_score': (('records', 'population'), calculate_jungle_early_dominance),
+    'objective_score': (('records',), calculate_objective_score),
+    'persistence_score': (('records',), calculate_persistence_score),
+    'laner_advanced': (('records',), calculate_laner_additional_metrics),
+    'role_info': (('records',), calculate_role_consistency),
+    'population_percentiles': (('filtered_matches', 'population', 'role_info'), _population_percentiles),
+    'rich_context': (('records', 'metrics', 'champ_insights', 'population_percentiles'), _rich_context),
+    'playstyle_tags': (
+        ('metrics', 'records', 'role_info', 'jungle_advanced', 'support_advanced'),
+        calculate_playstyle_tags,
+    ),
+}
+
+# Intermediate nodes (typed records, population sketches) that are not part of a player's results
+INTERNAL_NODES = ('records', 'population')
+
+
+def split_matches_by_queue(all_matches, solo_matches=None, flex_matches=None) -> dict:
+    #Matches per queue filter ('all', 'solo', 'flex'), splitting all_matches when not given
+    if solo_matches is None:
+        solo_matches = filter_matches_by_queue(all_matches, 'solo')
+    if flex_matches is None:
+        flex_matches = filter_matches_by_queue(all_matches, 'flex')
+    return {'all': all_matches, 'solo': solo_matches, 'flex': flex_matches}
+
+
+def build_data_package(queue_type, matches_by_queue: dict, record_cache: dict = None, nodes: dict = METRIC_NODES):
+    #Lazy metric graph for one queue filter (or a has_data=False dict when it has no games).
+    #matches_by_queue comes from split_matches_by_queue; record_cache (matchId -> record) lets every filter
+    #of a player share its typed records; nodes lets a caller swap in its own caching nodes.
+    if queue_type not in QUEUE_TYPES:
+        raise ValueError(f"Unknown queue type: {queue_type!r} (expected 'all', 'solo' or 'flex')")
+    filtered_matches = matches_by_queue[queue_type] or []
+    counts = {
+        'filtered_count': len(filtered_matches),
+        'solo_count': len(matches_by_queue['solo'] or []),
+        'flex_count': len(matches_by_queue['flex'] or []),
+        'total_count': len(matches_by_queue['all'] or []),
+    }
+    if not filtered_matches:
+        return {'has_data': False, **counts}
+
+    return MetricGraph(nodes, {
+        'has_data': True,
+        'queue_type': queue_type,
+        'filtered_matches': filtered_matches,
+        'all_matches': matches_by_queue['all'],
+        'record_cache': record_cache,
+        **counts,
+    })
@@ -0,0 +1,17 @@
+import functools
+
+from data.population import PopulationStats
+
+
+@functools.lru_cache(maxsize=None)
+def get_population_stats():
+    #One set of population sketches per server process, shared by every session
+    return PopulationStats()
+
+
+def ingest_population(matches):
+    #Add any matches not seen yet to the shared sketches and return them
+    population = get_population_stats()
+    if matches:
+        population.ingest_matches(matches)
+    return population
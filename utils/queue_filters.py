@@ -1,116 +1,31 @@
 import streamlit as st
-import pandas as pd
-from data.metrics import (
-    calculate_advanced_metrics,
-    get_champion_insights,
-    calculate_early_late_game_stats,
-    calculate_jungle_advanced_metrics,
-    calculate_support_advanced_metrics,
-    calculate_support_early_game_stats,
-    calculate_support_early_dominance,
-    calculate_jungle_early_game_stats,     
-    calculate_jungle_early_dominance,
-    calculate_playstyle_tags,
-    calculate_objective_score,
-    calculate_persistence_score,
-    calculate_laner_additional_metrics,     
-)
+from utils.user_cache import get_user_cache
+from data.metrics import get_champion_insights
 from data.context_builder import build_rich_player_context
+from utils.metric_engine import METRIC_NODES, add_population_percentiles, build_data_package
 
 
-def get_filtered_matches_and_counts(queue_type):
-    #get filtered matches based on queue type and return match lists + counts for each queue type
-    solo_matches = st.session_state.get('solo_matches', [])
-    flex_matches = st.session_state.get('flex_matches', [])
-    all_matches = st.session_state.get('raw_matches', [])
-    
-    solo_count = len(solo_matches)
-    flex_count = len(flex_matches)
-    total_count = len(all_matches)
-    
-    if queue_type == "solo":
-        return solo_matches, solo_count, solo_count, flex_count, total_count
-    elif queue_type == "flex":
-        return flex_matches, flex_count, solo_count, flex_count, total_count
-    else:  # "all"
-        return all_matches, total_count, solo_count, flex_count, total_count
-
-
-def prepare_match_dataframe(filtered_matches):  
-    #convert raw match data into a clean DataFrame with calculated KDA
-    matches = []
-    for m in filtered_matches:
-        matches.append({
-            "Champion": m.get("championName", "Unknown"),
-            "Result": "Win" if m.get("win", False) else "Loss",
-            "Kills": m.get("kills", 0),
-            "Deaths": max(m.get("deaths", 1), 1),  # Avoid division by zero
-            "Assists": m.get("assists", 0),
-        })
-    
-    df = pd.DataFrame(matches)
-    df["Result"] = df["Result"].astype(str).str.lower()
-    df["Win"] = df["Result"].apply(lambda x: 1 if "win" in x else 0)
-    df["KDA"] = (df["Kills"] + df["Assists"]) / df["Deaths"]
-    df = df.dropna(subset=["KDA"]).reset_index(drop=True)
-    return df
+def get_session_matches_by_queue():
+    #this session's fetched matches for each queue filter ('all', 'solo', 'flex')
+    return {
+        'all': st.session_state.get('raw_matches', []),
+        'solo': st.session_state.get('solo_matches', []),
+        'flex': st.session_state.get('flex_matches', []),
+    }
 
 
-def calculate_dominance_score(filtered_matches):
-    #game dominance score (advantages over opponent)
-    #CS diff@10, gold diff, and early kills
-    
-    if not filtered_matches:
-        return 0.0
-    
-    wins = [m for m in filtered_matches if m.get('win')]
-    if not wins:
-        return 0.0
-    
-    cs_diff_at_10_total = 0
-    for match in wins:
-        #getting opp
-        my_position = match.get('teamPosition', 'UNKNOWN')
-        my_team_id = match.get('teamId')
-        participants = match.get('participants', []) 
-        opponent = None
-        for p in participants:
-            if p.get('teamPosition') == my_position and p.get('teamId') != my_team_id:
-                opponent = p
-                break
-        if not opponent:
-            continue
-        
-        #getting cs diff at 10
-        cs_diff_at_10 = (
-            match.get('challenges', {}).get('laneMinionsFirst10Minutes', 0) -
-            opponent.get('challenges', {}).get('laneMinionsFirst10Minutes', 0)
-        )
-        cs_diff_at_10_total += cs_diff_at_10
-    
-    avg_cs_advantage = cs_diff_at_10_total / len(wins)
-    
-    # gold differential (approximate from gold per minute)
-    avg_gpm = sum(m.get('challenges', {}).get('goldPerMinute', 0) for m in wins) / len(wins)
-    gold_advantage_estimate = (avg_gpm - 350) * 10  # 350 is baseline, difference * 10min
-    
-    avg_early_kills = sum(m.get('challenges', {}).get('takedownsFirstXMinutes', 0) for m in wins) / len(wins)
-    
-    # Scoring based on ADVANTAGES
-    # CS advantage: +20 = excellent, +10 = good, 0 = neutral, -10 = poor
-    cs_score = min(10, max(0, (avg_cs_advantage + 10) / 3))
-    
-    # Gold advantage: +500g = excellent, +250g = good
-    gold_score = min(10, max(0, (gold_advantage_estimate + 250) / 75))
-    
-    # Early kills: 2+ = excellent
-    kill_score = min(10, avg_early_kills * 3)
-    
-    dominance_score = (cs_score + gold_score + kill_score) / 3
-    return dominance_score
+def _session_record_cache():
+    # Typed records are built once per match and shared by every queue filter of this user
+    current_user = st.session_state.get('current_user_id', '')
+    record_caches = st.session_state.setdefault('match_records', {})
+    if current_user not in record_caches:
+        # Only the current user's records are kept
+        record_caches.clear()
+        record_caches[current_user] = {}
+    return record_caches[current_user]
 
 
-def build_filtered_context(filtered_matches, metrics, champ_insights, queue_type):
+def build_filtered_context(records, metrics, champ_insights, queue_type):
     #Build rich context for filtered data, with caching for 'all' games.
     
     # Check if we need to rebuild context
@@ -131,9 +46,9 @@ def build_filtered_context(filtered_matches, metrics, champ_insights, queue_type
         st.session_state.current_filtered_context is None
     )
     
-    if should_rebuild and filtered_matches:
+    if should_rebuild and records:
         filtered_rich_context = build_rich_player_context(
-            filtered_matches,
+            records,
             metrics,
             champ_insights
         )
@@ -143,8 +58,7 @@ def build_filtered_context(filtered_matches, metrics, champ_insights, queue_type
             st.session_state.rich_context = filtered_rich_context
             
             # Also update user cache
-            if current_user in st.session_state.user_cache:
-                st.session_state.user_cache[current_user]['rich_context'] = filtered_rich_context
+            get_user_cache().update(current_user, rich_context=filtered_rich_context)
         
         # Always store current filtered context for AI coach
         st.session_state.current_filtered_context = filtered_rich_context
@@ -154,84 +68,69 @@ def build_filtered_context(filtered_matches, metrics, champ_insights, queue_type
         return st.session_state.get('rich_context') or st.session_state.get('current_filtered_context')
 
 
-def prepare_all_filtered_data(queue_type):
-    #Main function: Get filtered matches and calculate all necessary metrics.
-    
-    # Get filtered matches and counts
-    filtered_matches, filtered_count, solo_count, flex_count, total_count = \
-        get_filtered_matches_and_counts(queue_type)
-    
-    # Check if we have data
-    if filtered_count == 0:
-        return {
-            'has_data': False,
-            'filtered_count': 0,
-            'solo_count': solo_count,
-            'flex_count': flex_count,
-            'total_count': total_count,
-        }
-    
-    # Prepare DataFrame
-    df = prepare_match_dataframe(filtered_matches)
-    
-    # Calculate all metrics
-    metrics = calculate_advanced_metrics(df)
-    early_late_stats = calculate_early_late_game_stats(df, filtered_matches)
-    support_early_stats = calculate_support_early_game_stats(filtered_matches)
-    jungle_early_stats = calculate_jungle_early_game_stats(filtered_matches)
-    jungle_advanced = calculate_jungle_advanced_metrics(filtered_matches)
-    support_advanced = calculate_support_advanced_metrics(filtered_matches)
+def _champion_insights(df):
     champ_insights = get_champion_insights(df)
-    dominance_score = calculate_dominance_score(filtered_matches)
-    support_dominance_score = calculate_support_early_dominance(filtered_matches)
-    jungle_dominance_score = calculate_jungle_early_dominance(filtered_matches)
+    # Store champion insights in session state (needed for AI coach)
+    st.session_state.champ_insights = champ_insights
+    return champ_insights
 
-    objective_score = calculate_objective_score(filtered_matches)
-    persistence_score = calculate_persistence_score(filtered_matches)
-    laner_advanced = calculate_laner_additional_metrics(filtered_matches)
 
+def _rich_context(records, metrics, champ_insights, queue_type, population_percentiles):
     # Build rich context (with caching)
-    rich_context = build_filtered_context(filtered_matches, metrics, champ_insights, queue_type)
+    rich_context = build_filtered_context(records, metrics, champ_insights, queue_type)
+    return add_population_percentiles(rich_context, population_percentiles)
 
-    # Calculate role info for tags
-    role_info = rich_context.get('role_consistency', {}) if rich_context else {}
-    
-    # Calculate playstyle tags
-    playstyle_tags = calculate_playstyle_tags(
-        metrics, 
-        filtered_matches, 
-        role_info,
-        jungle_advanced,
-        support_advanced
-    )
-    
-    # Store champion insights in session state (needed for AI coach)
-    st.session_state.champ_insights = champ_insights
+
+# The engine's nodes, with the session-aware champion insights and rich context caching
+SESSION_METRIC_NODES = {
+    **METRIC_NODES,
+    'champ_insights': (('df',), _champion_insights),
+    'rich_context': (
+        ('records', 'metrics', 'champ_insights', 'queue_type', 'population_percentiles'),
+        _rich_context,
+    ),
+}
+
+# Graphs kept per session (one per queue filter is enough to switch back and forth for free)
+MAX_CACHED_GRAPHS = 3
+
+
+def prepare_all_filtered_data(queue_type):
+    #Main function: Get filtered matches and return a lazy metric graph for them.
+    #Tabs read only the nodes they render; results are memoized per (user, queue, matches)
+    #in session state, so reruns and tab switches reuse everything already computed.
     
-    return {
-        'has_data': True,
-        'df': df,
-        'metrics': metrics,
-        'early_late_stats': early_late_stats,
-        'champ_insights': champ_insights,
-        'dominance_score': dominance_score,
-        'filtered_matches': filtered_matches,
-        'rich_context': rich_context,
-        'filtered_count': filtered_count,
-        'solo_count': solo_count,
-        'flex_count': flex_count,
-        'total_count': total_count,
-        'jungle_advanced': jungle_advanced,
-        'support_advanced': support_advanced,
-        'support_early_stats': support_early_stats,
-        'support_dominance_score': support_dominance_score,
-        'jungle_early_stats': jungle_early_stats,
-        'jungle_dominance_score': jungle_dominance_score,
-        'playstyle_tags': playstyle_tags,
-        'objective_score' : objective_score,
-        'persistence_score': persistence_score,
-        'laner_advanced' : laner_advanced,
-    }   
+    matches_by_queue = get_session_matches_by_queue()
+    filtered_matches = matches_by_queue[queue_type] or []
+
+    # Check if we have data
+    if not filtered_matches:
+        return build_data_package(queue_type, matches_by_queue)
+
+    current_user = st.session_state.get('current_user_id', '')
+    total_count = len(matches_by_queue['all'] or [])
+    graph_key = (current_user, queue_type, len(filtered_matches), total_count, filtered_matches[0].get('matchId'))
+
+    graphs = st.session_state.setdefault('metric_graphs', {})
+    graph = graphs.get(graph_key)
+    if graph is None:
+        graph = build_data_package(queue_type, matches_by_queue, _session_record_cache(), SESSION_METRIC_NODES)
+        # Drop graphs for other users and keep only the most recent few
+        for key in [k for k in graphs if k[0] != current_user]:
+            del graphs[key]
+        while len(graphs) >= MAX_CACHED_GRAPHS:
+            del graphs[next(iter(graphs))]
+        graphs[graph_key] = graph
+
+    return graph
+
+
+def sync_filtered_context(data_package):
+    #Point the AI coach / summary context at this filter's rich context and champion insights
+    rich_context = data_package['rich_context']
+    st.session_state.current_filtered_context = rich_context
+    st.session_state.champ_insights = data_package['champ_insights']
+    return rich_context
 
 
 def display_queue_filter_badge(queue_type, filtered_count, solo_count, flex_count):
@@ -0,0 +1,186 @@
+import functools
+import logging
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+from cachetools import Cache, LFUCache, LRUCache
+from dotenv import load_dotenv
+
+from data.metric_graph import MetricGraph
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Estimated memory all cached players may take together, across every session of the process
+USER_CACHE_MAX_BYTES = int(os.getenv("USER_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+# Which player is dropped when the budget is exceeded: "lru" (least recently viewed) or "lfu" (least often viewed)
+USER_CACHE_POLICY = os.getenv("USER_CACHE_POLICY", "lru").lower()
+
+
+def estimate_size(obj, exclude=()) -> int:
+    #Approximate bytes held by obj and everything it references (shared objects counted once).
+    #Objects whose id is in exclude are treated as already counted.
+    seen = set(exclude)
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, (pd.DataFrame, pd.Series)):
+            total += int(np.sum(item.memory_usage(deep=True)))
+            continue
+        if isinstance(item, np.ndarray):
+            total += item.nbytes
+            continue
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, MetricGraph):
+            # Lazy graphs (e.g. the rich context) hold their inputs and every node built so far
+            stack.extend(item.memoized_values())
+        elif hasattr(type(item), '__slots__'):
+            # Slotted records (MatchRecord) keep their values outside getsizeof
+            stack.extend(getattr(item, slot) for slot in type(item).__slots__ if hasattr(item, slot))
+    return total
+
+
+def _counting_cache(base):
+    #cachetools cache class that counts the entries it evicts to stay within budget
+    class CountingCache(base):
+        evictions = 0
+
+        def popitem(self):
+            key, value = super().popitem()
+            self.evictions += 1
+            logger.info("User cache evicted %s (%d bytes)", key, value[1])
+            return key, value
+
+    return CountingCache
+
+
+class UserCache:
+    #Process-wide cache of fetched players (matches, context, AI answers), shared by all sessions.
+    #Entries are weighed by estimated size; the least recently (or frequently) used players are
+    #dropped once the total passes max_bytes, so memory stays bounded however many sessions are open.
+
+    def __init__(self, max_bytes: int = USER_CACHE_MAX_BYTES, policy: str = USER_CACHE_POLICY):
+        if policy not in ('lru', 'lfu'):
+            raise ValueError(f"Unknown USER_CACHE_POLICY: {policy!r} (expected 'lru' or 'lfu')")
+        base = LRUCache if policy == 'lru' else LFUCache
+        # Values are (entry, estimated bytes); the size is computed once per write
+        self._entries = _counting_cache(base)(maxsize=max_bytes, getsizeof=lambda value: value[1])
+        self.policy = policy
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, user_key):
+        with self._lock:
+            return user_key in self._entries
+
+    def get(self, user_key):
+        #Cached entry dict for a player (counts as a use), or None
+        with self._lock:
+            value = self._entries.get(user_key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return value[0]
+
+    def peek(self, user_key):
+        #Cached entry dict without counting a use (for checks that aren't a player being viewed)
+        with self._lock:
+            # The base Cache lookup leaves the LRU order / LFU counts untouched
+            value = Cache.__getitem__(self._entries, user_key) if user_key in self._entries else None
+        return value[0] if value is not None else None
+
+    def set(self, user_key, entry: dict, size: int = None):
+        #Cache a player's entry; one larger than the whole budget is not cached
+        if size is None:
+            size = estimate_size(entry)
+        with self._lock:
+            self._store(user_key, entry, size)
+        # Lazy graphs keep growing as sections are built, so their new nodes are weighed as they appear
+        for field, value in entry.items():
+            if isinstance(value, MetricGraph):
+                value.watch((id(self), user_key), functools.partial(self._grow, user_key, field, value))
+
+    def _store(self, user_key, entry: dict, size: int):
+        # Caller holds the lock
+        entries = self._entries
+        if user_key in entries and entries.currsize + size > entries.maxsize:
+            # cachetools makes room for the whole new size on top of the old one (evicting this player
+            # too when it is the least recent); dropping the old value first only makes room for the growth
+            del entries[user_key]
+        try:
+            entries[user_key] = (entry, size)
+        except ValueError:
+            entries.pop(user_key, None)
+            logger.warning("User cache entry for %s (%d bytes) exceeds the cache budget", user_key, size)
+
+    def _grow(self, user_key, field, graph, name, value):
+        # A cached lazy graph computed another node: add its size (ignored once the entry dropped the graph).
+        # Nodes often reuse the items of values already held (e.g. wins/losses split the match list),
+        # so those are not counted again.
+        held = set()
+        for other in graph.memoized_values():
+            if other is value:
+                continue
+            held.add(id(other))
+            if isinstance(other, (list, tuple)):
+                held.update(id(item) for item in other)
+            elif isinstance(other, dict):
+                held.update(id(item) for item in other.values())
+        nbytes = estimate_size(value, held)
+        with self._lock:
+            # Counts as a use: the player's context is being read right now
+            cached = self._entries.get(user_key)
+            if cached is None or cached[0].get(field) is not graph:
+                return
+            self._store(user_key, cached[0], cached[1] + nbytes)
+
+    def update(self, user_key, **fields):
+        #Change fields of a cached player and re-weigh it (no-op if the player was evicted)
+        with self._lock:
+            value = self._entries.get(user_key)
+        if value is None:
+            return
+        entry, size = value
+        # Only the replaced fields are re-measured; matches dominate the size and rarely change
+        size += sum(estimate_size(v) for v in fields.values()) - sum(estimate_size(entry.get(k)) for k in fields)
+        self.set(user_key, {**entry, **fields}, size)
+
+    def discard(self, user_key):
+        with self._lock:
+            self._entries.pop(user_key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._entries.currsize,
+                'max_bytes': self._entries.maxsize,
+                'policy': self.policy,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self._entries.evictions,
+            }
+
+
+@functools.lru_cache(maxsize=None)
+def get_user_cache() -> UserCache:
+    #One user cache per server process, shared by every session
+    return UserCache()